@@ -0,0 +1,221 @@
+#include <chrono>
+#include <math.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <vector>
+
+#define AEDI_EXPECT(CODE) if (!(CODE)) { puts(#CODE); exit(1); }
+
+// Xorshift generator, synthetic inputs are identical on every run and machine
+struct AediRandom
+{
+    uint32_t state = 0x12345678;
+
+    uint32_t operator()()
+    {
+        state ^= state << 13;
+        state ^= state >> 17;
+        state ^= state << 5;
+        return state;
+    }
+};
+
+// Text made of pseudo-random words, it compresses like source code or configuration files do
+inline std::vector<unsigned char> AediText(size_t size)
+{
+    static const char* const syllables[] =
+    {
+        "ab", "ca", "de", "fi", "go", "hu", "in", "ja", "ke", "lo", "mu", "ne", "or", "pi", "qu", "re",
+        "sa", "te", "ul", "va", "we", "xi", "yo", "ze", " ", " ", " ", ", ", ".\n", "(", ")", " = ",
+    };
+    constexpr size_t SYLLABLE_COUNT = sizeof syllables / sizeof syllables[0];
+
+    std::vector<unsigned char> result;
+    result.reserve(size + 4);
+
+    AediRandom random;
+
+    while (result.size() < size)
+    {
+        for (const char* syllable = syllables[random() % SYLLABLE_COUNT]; *syllable != '\0'; ++syllable)
+        {
+            result.push_back(*syllable);
+        }
+    }
+
+    result.resize(size);
+    return result;
+}
+
+// Interleaved 16-bit audio, sum of slowly changing tones and quiet noise
+inline std::vector<int16_t> AediAudio(size_t frames, int channels, int rate)
+{
+    std::vector<int16_t> result(frames * channels);
+    AediRandom random;
+
+    for (size_t i = 0; i < frames; ++i)
+    {
+        const double time = double(i) / rate;
+        const double tone = 220.0 * (1.0 + 0.5 * sin(time * 0.7));
+
+        for (int channel = 0; channel < channels; ++channel)
+        {
+            const double value = 0.4 * sin(2.0 * M_PI * tone * (channel + 1) * time)
+                + 0.2 * sin(2.0 * M_PI * 3.01 * tone * time)
+                + 0.02 * (int(random() % 2001) - 1000) / 1000.0;
+            result[i * channels + channel] = int16_t(value * 32767.0);
+        }
+    }
+
+    return result;
+}
+
+// RGBA image with gradients, stripes and noise, somewhere between photo and game texture
+inline std::vector<unsigned char> AediImage(int width, int height)
+{
+    std::vector<unsigned char> result(size_t(width) * height * 4);
+    AediRandom random;
+
+    for (int y = 0; y < height; ++y)
+    {
+        for (int x = 0; x < width; ++x)
+        {
+            unsigned char* const pixel = &result[(size_t(y) * width + x) * 4];
+            const int noise = random() % 16;
+
+            pixel[0] = (x * 255 / width + noise) & 0xFF;
+            pixel[1] = (y * 255 / height + noise) & 0xFF;
+            pixel[2] = ((x / 16 + y / 16) % 2 == 0 ? 64 : 192) + noise;
+            pixel[3] = 255;
+        }
+    }
+
+    return result;
+}
+
+// Runs function repeatedly, and prints JSON line with throughput of every sample,
+// amount is a number of units processed by one call, e.g. megabytes or millions of samples
+template <typename Function>
+void AediBenchmark(const char* name, const char* unit, double amount, Function function)
+{
+    using Clock = std::chrono::steady_clock;
+
+    const char* const sampleCountValue = getenv("AEDI_BENCH_SAMPLES");
+    const int sampleCount = sampleCountValue == nullptr ? 5 : atoi(sampleCountValue);
+
+    constexpr double MIN_SAMPLE_SECONDS = 0.1;
+
+    // Find number of iterations that take long enough to be measured reliably, it also warms up caches
+    size_t iterations = 1;
+
+    while (true)
+    {
+        const Clock::time_point start = Clock::now();
+
+        for (size_t i = 0; i < iterations; ++i)
+        {
+            function();
+        }
+
+        if (std::chrono::duration<double>(Clock::now() - start).count() >= MIN_SAMPLE_SECONDS)
+        {
+            break;
+        }
+
+        iterations *= 2;
+    }
+
+    printf("{\"name\": \"%s\", \"unit\": \"%s\", \"iterations\": %zu, \"samples\": [", name, unit, iterations);
+
+    for (int sample = 0; sample < sampleCount; ++sample)
+    {
+        const Clock::time_point start = Clock::now();
+
+        for (size_t i = 0; i < iterations; ++i)
+        {
+            function();
+        }
+
+        const double seconds = std::chrono::duration<double>(Clock::now() - start).count();
+        printf("%s%.4f", sample == 0 ? "" : ", ", amount * iterations / seconds);
+    }
+
+    puts("]}");
+    fflush(stdout);
+}
+
+// Measures latency of initialization, its first call in process is cold, and subsequent ones are warm,
+// every initialization is followed by shutdown that is not measured
+template <typename Initialize, typename Shutdown>
+void AediStartup(const char* name, Initialize initialize, Shutdown shutdown)
+{
+    using Clock = std::chrono::steady_clock;
+
+    // Process launched to measure loading and static initialization of libraries exits before the first call
+    if (getenv("AEDI_STARTUP_LOAD") != nullptr)
+    {
+        exit(0);
+    }
+
+    const char* const warmCountValue = getenv("AEDI_STARTUP_WARM");
+    const int warmCount = warmCountValue == nullptr ? 10 : atoi(warmCountValue);
+
+    const auto measure = [&]()
+    {
+        const Clock::time_point start = Clock::now();
+        initialize();
+        const double seconds = std::chrono::duration<double>(Clock::now() - start).count();
+
+        shutdown();
+        return seconds;
+    };
+
+    printf("{\"name\": \"%s\", \"cold\": %.9f, \"warm\": [", name, measure());
+
+    for (int i = 0; i < warmCount; ++i)
+    {
+        printf("%s%.9f", i == 0 ? "" : ", ", measure());
+    }
+
+    puts("]}");
+    fflush(stdout);
+}
+
+// Exit code of decoding program when decoder rejects its input, any other failure is a bug of decoder or program
+constexpr int AEDI_DECODE_REJECTED = 2;
+
+// Reads file given as the only argument, decodes it, and prints JSON line with decoding time and amount of decoded
+// units, e.g. samples or pixels, function returns negative amount when decoder rejects input
+template <typename Function>
+int AediDecode(int argc, char** argv, Function function)
+{
+    using Clock = std::chrono::steady_clock;
+
+    AEDI_EXPECT(argc == 2);
+
+    FILE* const file = fopen(argv[1], "rb");
+    AEDI_EXPECT(file != nullptr);
+
+    std::vector<unsigned char> data;
+    unsigned char buffer[64 * 1024];
+
+    for (size_t size; (size = fread(buffer, 1, sizeof buffer, file)) > 0; )
+    {
+        data.insert(data.end(), buffer, buffer + size);
+    }
+
+    fclose(file);
+
+    const Clock::time_point start = Clock::now();
+    const long long decoded = function(data);
+    const double seconds = std::chrono::duration<double>(Clock::now() - start).count();
+
+    printf("{\"seconds\": %.9f, \"decoded\": %lld}\n", seconds, decoded);
+    fflush(stdout);
+
+    return decoded < 0 ? AEDI_DECODE_REJECTED : 0;
+}
+
+// Songs of tracker modules and game music can loop forever, so their rendering stops after ten minutes of audio
+constexpr long long AEDI_DECODE_MAX_FRAMES = 44100LL * 600;
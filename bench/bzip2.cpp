@@ -0,0 +1,31 @@
+#include <bzlib.h>
+
+int main()
+{
+    constexpr unsigned int SIZE = 4 * 1024 * 1024;
+    std::vector<unsigned char> input = AediText(SIZE);
+
+    std::vector<char> compressed(SIZE + SIZE / 100 + 600);
+    unsigned int compressedSize = 0;
+
+    AediBenchmark("compress", "MB/s", SIZE / 1e6, [&]()
+    {
+        compressedSize = compressed.size();
+        AEDI_EXPECT(BZ2_bzBuffToBuffCompress(compressed.data(), &compressedSize,
+            reinterpret_cast<char*>(input.data()), SIZE, 9, 0, 0) == BZ_OK);
+    });
+
+    std::vector<unsigned char> decompressed(SIZE);
+
+    AediBenchmark("decompress", "MB/s", SIZE / 1e6, [&]()
+    {
+        unsigned int decompressedSize = SIZE;
+        AEDI_EXPECT(BZ2_bzBuffToBuffDecompress(reinterpret_cast<char*>(decompressed.data()), &decompressedSize,
+            compressed.data(), compressedSize, 0, 0) == BZ_OK);
+        AEDI_EXPECT(decompressedSize == SIZE);
+    });
+
+    AEDI_EXPECT(decompressed == input);
+
+    return 0;
+}
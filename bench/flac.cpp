@@ -0,0 +1,97 @@
+#include <FLAC/stream_decoder.h>
+#include <FLAC/stream_encoder.h>
+#include <string.h>
+
+struct Memory
+{
+    std::vector<FLAC__byte> data;
+    size_t position = 0;
+    size_t decodedFrames = 0;
+};
+
+static FLAC__StreamEncoderWriteStatus Write(const FLAC__StreamEncoder*, const FLAC__byte buffer[], size_t bytes,
+    uint32_t, uint32_t, void* clientData)
+{
+    Memory* const memory = static_cast<Memory*>(clientData);
+    memory->data.insert(memory->data.end(), buffer, buffer + bytes);
+    return FLAC__STREAM_ENCODER_WRITE_STATUS_OK;
+}
+
+static FLAC__StreamDecoderReadStatus Read(const FLAC__StreamDecoder*, FLAC__byte buffer[], size_t* bytes,
+    void* clientData)
+{
+    Memory* const memory = static_cast<Memory*>(clientData);
+    const size_t available = memory->data.size() - memory->position;
+
+    if (available == 0)
+    {
+        *bytes = 0;
+        return FLAC__STREAM_DECODER_READ_STATUS_END_OF_STREAM;
+    }
+
+    *bytes = *bytes < available ? *bytes : available;
+    memcpy(buffer, &memory->data[memory->position], *bytes);
+    memory->position += *bytes;
+
+    return FLAC__STREAM_DECODER_READ_STATUS_CONTINUE;
+}
+
+static FLAC__StreamDecoderWriteStatus Decoded(const FLAC__StreamDecoder*, const FLAC__Frame* frame,
+    const FLAC__int32* const[], void* clientData)
+{
+    static_cast<Memory*>(clientData)->decodedFrames += frame->header.blocksize;
+    return FLAC__STREAM_DECODER_WRITE_STATUS_CONTINUE;
+}
+
+static void Error(const FLAC__StreamDecoder*, FLAC__StreamDecoderErrorStatus status, void*)
+{
+    printf("Decoder error: %s\n", FLAC__StreamDecoderErrorStatusString[status]);
+    exit(1);
+}
+
+int main()
+{
+    constexpr int CHANNELS = 2;
+    constexpr int RATE = 44100;
+    constexpr size_t FRAMES = RATE * 10;
+
+    const std::vector<int16_t> audio = AediAudio(FRAMES, CHANNELS, RATE);
+    const std::vector<FLAC__int32> samples(audio.begin(), audio.end());
+
+    Memory memory;
+
+    AediBenchmark("encode", "Msamples/s", FRAMES / 1e6, [&]()
+    {
+        memory.data.clear();
+
+        FLAC__StreamEncoder* const encoder = FLAC__stream_encoder_new();
+        AEDI_EXPECT(encoder != nullptr);
+        AEDI_EXPECT(FLAC__stream_encoder_set_channels(encoder, CHANNELS));
+        AEDI_EXPECT(FLAC__stream_encoder_set_bits_per_sample(encoder, 16));
+        AEDI_EXPECT(FLAC__stream_encoder_set_sample_rate(encoder, RATE));
+        AEDI_EXPECT(FLAC__stream_encoder_set_compression_level(encoder, 5));
+        AEDI_EXPECT(FLAC__stream_encoder_init_stream(encoder, Write, nullptr, nullptr, nullptr, &memory)
+            == FLAC__STREAM_ENCODER_INIT_STATUS_OK);
+        AEDI_EXPECT(FLAC__stream_encoder_process_interleaved(encoder, samples.data(), FRAMES));
+        AEDI_EXPECT(FLAC__stream_encoder_finish(encoder));
+        FLAC__stream_encoder_delete(encoder);
+    });
+
+    AediBenchmark("decode", "Msamples/s", FRAMES / 1e6, [&]()
+    {
+        memory.position = 0;
+        memory.decodedFrames = 0;
+
+        FLAC__StreamDecoder* const decoder = FLAC__stream_decoder_new();
+        AEDI_EXPECT(decoder != nullptr);
+        AEDI_EXPECT(FLAC__stream_decoder_init_stream(decoder, Read, nullptr, nullptr, nullptr, nullptr,
+            Decoded, nullptr, Error, &memory) == FLAC__STREAM_DECODER_INIT_STATUS_OK);
+        AEDI_EXPECT(FLAC__stream_decoder_process_until_end_of_stream(decoder));
+        AEDI_EXPECT(FLAC__stream_decoder_finish(decoder));
+        FLAC__stream_decoder_delete(decoder);
+
+        AEDI_EXPECT(memory.decodedFrames == FRAMES);
+    });
+
+    return 0;
+}
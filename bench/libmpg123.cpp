@@ -0,0 +1,57 @@
+// Libraries: mp3lame
+
+#include <mpg123.h>
+
+#include "mp3.h"
+
+int main()
+{
+    constexpr int CHANNELS = 2;
+    constexpr int RATE = 44100;
+    constexpr size_t FRAMES = RATE * 10;
+
+    const std::vector<unsigned char> encoded = AediEncodeMp3(AediAudio(FRAMES, CHANNELS, RATE), CHANNELS, RATE);
+
+    AEDI_EXPECT(mpg123_init() == MPG123_OK);
+
+    int error = MPG123_OK;
+    mpg123_handle* const handle = mpg123_new(nullptr, &error);
+    AEDI_EXPECT(handle != nullptr);
+    AEDI_EXPECT(mpg123_param(handle, MPG123_ADD_FLAGS, MPG123_QUIET, 0.0) == MPG123_OK);
+
+    std::vector<unsigned char> output(64 * 1024);
+    size_t decodedFrames = 0;
+
+    AediBenchmark("decode", "Msamples/s", FRAMES / 1e6, [&]()
+    {
+        AEDI_EXPECT(mpg123_open_feed(handle) == MPG123_OK);
+        AEDI_EXPECT(mpg123_feed(handle, encoded.data(), encoded.size()) == MPG123_OK);
+
+        size_t bytes = 0;
+
+        while (true)
+        {
+            size_t done = 0;
+            const int result = mpg123_read(handle, output.data(), output.size(), &done);
+            bytes += done;
+
+            if (result == MPG123_NEED_MORE || result == MPG123_DONE)
+            {
+                break;
+            }
+
+            AEDI_EXPECT(result == MPG123_OK || result == MPG123_NEW_FORMAT);
+        }
+
+        AEDI_EXPECT(mpg123_close(handle) == MPG123_OK);
+
+        decodedFrames = bytes / (CHANNELS * sizeof(int16_t));
+    });
+
+    // Encoder delay and padding add up to a few frames of silence
+    AEDI_EXPECT(decodedFrames >= FRAMES);
+
+    mpg123_delete(handle);
+
+    return 0;
+}
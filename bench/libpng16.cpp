@@ -0,0 +1,37 @@
+#include <png.h>
+
+int main()
+{
+    constexpr int WIDTH = 1024;
+    constexpr int HEIGHT = 1024;
+
+    const std::vector<unsigned char> pixels = AediImage(WIDTH, HEIGHT);
+
+    png_image image = {};
+    image.version = PNG_IMAGE_VERSION;
+    image.width = WIDTH;
+    image.height = HEIGHT;
+    image.format = PNG_FORMAT_RGBA;
+
+    png_alloc_size_t encodedSize = 0;
+    AEDI_EXPECT(png_image_write_get_memory_size(image, encodedSize, 0, pixels.data(), 0, nullptr));
+
+    std::vector<unsigned char> encoded(encodedSize);
+    AEDI_EXPECT(png_image_write_to_memory(&image, encoded.data(), &encodedSize, 0, pixels.data(), 0, nullptr));
+
+    std::vector<unsigned char> decoded(pixels.size());
+
+    AediBenchmark("decode", "Mpixels/s", WIDTH * HEIGHT / 1e6, [&]()
+    {
+        png_image input = {};
+        input.version = PNG_IMAGE_VERSION;
+
+        AEDI_EXPECT(png_image_begin_read_from_memory(&input, encoded.data(), encodedSize));
+        input.format = PNG_FORMAT_RGBA;
+        AEDI_EXPECT(png_image_finish_read(&input, nullptr, decoded.data(), 0, nullptr));
+    });
+
+    AEDI_EXPECT(decoded == pixels);
+
+    return 0;
+}
@@ -0,0 +1,26 @@
+#include <webp/decode.h>
+#include <webp/encode.h>
+
+int main()
+{
+    constexpr int WIDTH = 1024;
+    constexpr int HEIGHT = 1024;
+    constexpr int STRIDE = WIDTH * 4;
+
+    const std::vector<unsigned char> pixels = AediImage(WIDTH, HEIGHT);
+
+    uint8_t* encoded = nullptr;
+    const size_t encodedSize = WebPEncodeRGBA(pixels.data(), WIDTH, HEIGHT, STRIDE, 80.0f, &encoded);
+    AEDI_EXPECT(encodedSize > 0);
+
+    std::vector<unsigned char> decoded(pixels.size());
+
+    AediBenchmark("decode", "Mpixels/s", WIDTH * HEIGHT / 1e6, [&]()
+    {
+        AEDI_EXPECT(WebPDecodeRGBAInto(encoded, encodedSize, decoded.data(), decoded.size(), STRIDE) != nullptr);
+    });
+
+    WebPFree(encoded);
+
+    return 0;
+}
@@ -0,0 +1,59 @@
+// Libraries: mp3lame
+
+#include <mad.h>
+
+#include "mp3.h"
+
+int main()
+{
+    constexpr int CHANNELS = 2;
+    constexpr int RATE = 44100;
+    constexpr size_t FRAMES = RATE * 10;
+
+    std::vector<unsigned char> encoded = AediEncodeMp3(AediAudio(FRAMES, CHANNELS, RATE), CHANNELS, RATE);
+    const size_t encodedSize = encoded.size();
+
+    // Decoder reads past the end of the last frame
+    encoded.resize(encodedSize + MAD_BUFFER_GUARD);
+
+    size_t decodedFrames = 0;
+
+    AediBenchmark("decode", "Msamples/s", FRAMES / 1e6, [&]()
+    {
+        mad_stream stream;
+        mad_frame frame;
+        mad_synth synth;
+
+        mad_stream_init(&stream);
+        mad_frame_init(&frame);
+        mad_synth_init(&synth);
+
+        mad_stream_buffer(&stream, encoded.data(), encoded.size());
+        decodedFrames = 0;
+
+        while (true)
+        {
+            if (mad_frame_decode(&frame, &stream) != 0)
+            {
+                if (stream.error == MAD_ERROR_BUFLEN)
+                {
+                    break;
+                }
+
+                AEDI_EXPECT(MAD_RECOVERABLE(stream.error));
+                continue;
+            }
+
+            mad_synth_frame(&synth, &frame);
+            decodedFrames += synth.pcm.length;
+        }
+
+        mad_synth_finish(&synth);
+        mad_frame_finish(&frame);
+        mad_stream_finish(&stream);
+    });
+
+    AEDI_EXPECT(decodedFrames >= FRAMES);
+
+    return 0;
+}
@@ -0,0 +1,31 @@
+// Encoder for MP3 decoding benchmarks, input is synthetic like in all other benchmarks
+
+#include <lame/lame.h>
+
+inline std::vector<unsigned char> AediEncodeMp3(const std::vector<int16_t>& audio, int channels, int rate)
+{
+    lame_global_flags* const flags = lame_init();
+    AEDI_EXPECT(flags != nullptr);
+
+    lame_set_num_channels(flags, channels);
+    lame_set_in_samplerate(flags, rate);
+    lame_set_brate(flags, 192);
+    lame_set_quality(flags, 5);
+    lame_set_bWriteVbrTag(flags, 0);
+    AEDI_EXPECT(lame_init_params(flags) == 0);
+
+    const int frames = int(audio.size() / channels);
+    std::vector<unsigned char> result(frames + frames / 4 + 7200);
+
+    const int encoded = lame_encode_buffer_interleaved(flags, const_cast<short*>(audio.data()), frames,
+        result.data(), int(result.size()));
+    AEDI_EXPECT(encoded >= 0);
+
+    const int flushed = lame_encode_flush(flags, result.data() + encoded, int(result.size()) - encoded);
+    AEDI_EXPECT(flushed >= 0);
+
+    lame_close(flags);
+
+    result.resize(encoded + flushed);
+    return result;
+}
@@ -0,0 +1,48 @@
+#include <opus.h>
+
+int main()
+{
+    constexpr int CHANNELS = 2;
+    constexpr int RATE = 48000;
+    constexpr int FRAME_SIZE = 960;
+    constexpr size_t FRAMES = RATE * 10;
+
+    const std::vector<int16_t> audio = AediAudio(FRAMES, CHANNELS, RATE);
+
+    int error = OPUS_OK;
+    OpusEncoder* const encoder = opus_encoder_create(RATE, CHANNELS, OPUS_APPLICATION_AUDIO, &error);
+    AEDI_EXPECT(error == OPUS_OK);
+    AEDI_EXPECT(opus_encoder_ctl(encoder, OPUS_SET_BITRATE(128000)) == OPUS_OK);
+
+    std::vector<std::vector<unsigned char>> packets;
+    unsigned char packet[4000];
+
+    for (size_t offset = 0; offset + FRAME_SIZE <= FRAMES; offset += FRAME_SIZE)
+    {
+        const opus_int32 size = opus_encode(encoder, &audio[offset * CHANNELS], FRAME_SIZE, packet, sizeof packet);
+        AEDI_EXPECT(size > 0);
+        packets.emplace_back(packet, packet + size);
+    }
+
+    opus_encoder_destroy(encoder);
+
+    OpusDecoder* const decoder = opus_decoder_create(RATE, CHANNELS, &error);
+    AEDI_EXPECT(error == OPUS_OK);
+
+    std::vector<opus_int16> output(FRAME_SIZE * CHANNELS);
+
+    AediBenchmark("decode", "Msamples/s", packets.size() * FRAME_SIZE / 1e6, [&]()
+    {
+        AEDI_EXPECT(opus_decoder_ctl(decoder, OPUS_RESET_STATE) == OPUS_OK);
+
+        for (const std::vector<unsigned char>& data : packets)
+        {
+            AEDI_EXPECT(opus_decode(decoder, data.data(), opus_int32(data.size()), output.data(), FRAME_SIZE, 0)
+                == FRAME_SIZE);
+        }
+    });
+
+    opus_decoder_destroy(decoder);
+
+    return 0;
+}
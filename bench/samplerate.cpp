@@ -0,0 +1,47 @@
+#include <samplerate.h>
+
+int main()
+{
+    constexpr int CHANNELS = 2;
+    constexpr int RATE = 44100;
+    constexpr size_t FRAMES = RATE * 10;
+    constexpr double RATIO = 48000.0 / RATE;
+
+    const std::vector<int16_t> audio = AediAudio(FRAMES, CHANNELS, RATE);
+
+    std::vector<float> input(audio.size());
+    src_short_to_float_array(audio.data(), input.data(), int(audio.size()));
+
+    std::vector<float> output(size_t(FRAMES * RATIO + 1) * CHANNELS);
+
+    const struct
+    {
+        const char* name;
+        int type;
+    }
+    converters[] =
+    {
+        { "sinc-best", SRC_SINC_BEST_QUALITY },
+        { "sinc-medium", SRC_SINC_MEDIUM_QUALITY },
+        { "sinc-fastest", SRC_SINC_FASTEST },
+        { "linear", SRC_LINEAR },
+    };
+
+    for (const auto& converter : converters)
+    {
+        AediBenchmark(converter.name, "Msamples/s", FRAMES / 1e6, [&]()
+        {
+            SRC_DATA data = {};
+            data.data_in = input.data();
+            data.data_out = output.data();
+            data.input_frames = FRAMES;
+            data.output_frames = FRAMES * RATIO + 1;
+            data.src_ratio = RATIO;
+
+            AEDI_EXPECT(src_simple(&data, converter.type, CHANNELS) == 0);
+            AEDI_EXPECT(data.input_frames_used == FRAMES);
+        });
+    }
+
+    return 0;
+}
@@ -0,0 +1,222 @@
+#include <fluidsynth.h>
+#include <string.h>
+#include <unistd.h>
+
+struct Writer
+{
+    std::vector<unsigned char> data;
+
+    void Put16(uint16_t value)
+    {
+        data.push_back(value & 0xFF);
+        data.push_back(value >> 8);
+    }
+
+    void Put32(uint32_t value)
+    {
+        Put16(value & 0xFFFF);
+        Put16(value >> 16);
+    }
+
+    void PutName(const char* name, size_t size = 20)
+    {
+        const size_t length = strlen(name);
+
+        for (size_t i = 0; i < size; ++i)
+        {
+            data.push_back(i < length ? name[i] : '\0');
+        }
+    }
+
+    void PutChunk(const char* id, const Writer& chunk)
+    {
+        PutName(id, 4);
+        Put32(uint32_t(chunk.data.size()));
+        data.insert(data.end(), chunk.data.begin(), chunk.data.end());
+
+        if (chunk.data.size() % 2 != 0)
+        {
+            data.push_back('\0');
+        }
+    }
+
+    void PutList(const char* type, const Writer& chunks)
+    {
+        Writer list;
+        list.PutName(type, 4);
+        list.data.insert(list.data.end(), chunks.data.begin(), chunks.data.end());
+        PutChunk("LIST", list);
+    }
+};
+
+// Soundfont with every preset made of instrument with its own sample, samples are synthetic
+static std::vector<unsigned char> MakeSoundFont(uint16_t presetCount, uint32_t sampleFrames)
+{
+    constexpr uint32_t SAMPLE_PADDING = 46;
+    constexpr uint16_t GENERATOR_INSTRUMENT = 41;
+    constexpr uint16_t GENERATOR_SAMPLE_ID = 53;
+
+    Writer info, version, engine, name;
+    version.Put16(2);
+    version.Put16(1);
+    info.PutChunk("ifil", version);
+    engine.PutName("EMU8000", 8);
+    info.PutChunk("isng", engine);
+    name.PutName("Aedi", 6);
+    info.PutChunk("INAM", name);
+
+    const std::vector<int16_t> audio = AediAudio(sampleFrames, 1, 44100);
+    Writer samples, sampleData;
+
+    for (uint16_t i = 0; i < presetCount; ++i)
+    {
+        for (const int16_t value : audio)
+        {
+            samples.Put16(uint16_t(value));
+        }
+
+        for (uint32_t j = 0; j < SAMPLE_PADDING; ++j)
+        {
+            samples.Put16(0);
+        }
+    }
+
+    sampleData.PutChunk("smpl", samples);
+
+    Writer presets, presetBags, presetModulators, presetGenerators;
+    Writer instruments, instrumentBags, instrumentModulators, instrumentGenerators, sampleHeaders;
+
+    for (uint16_t i = 0; i <= presetCount; ++i)
+    {
+        const bool terminal = i == presetCount;
+        char itemName[20];
+
+        snprintf(itemName, sizeof itemName, terminal ? "EOP" : "Preset %u", i);
+        presets.PutName(itemName);
+        presets.Put16(terminal ? 0 : i % 128);
+        presets.Put16(terminal ? 0 : i / 128);
+        presets.Put16(i);
+        presets.Put32(0);
+        presets.Put32(0);
+        presets.Put32(0);
+
+        presetBags.Put16(i);
+        presetBags.Put16(0);
+        presetGenerators.Put16(terminal ? 0 : GENERATOR_INSTRUMENT);
+        presetGenerators.Put16(terminal ? 0 : i);
+
+        snprintf(itemName, sizeof itemName, terminal ? "EOI" : "Instrument %u", i);
+        instruments.PutName(itemName);
+        instruments.Put16(i);
+
+        instrumentBags.Put16(i);
+        instrumentBags.Put16(0);
+        instrumentGenerators.Put16(terminal ? 0 : GENERATOR_SAMPLE_ID);
+        instrumentGenerators.Put16(terminal ? 0 : i);
+
+        const uint32_t start = terminal ? 0 : i * (sampleFrames + SAMPLE_PADDING);
+        const uint32_t end = terminal ? 0 : start + sampleFrames;
+
+        snprintf(itemName, sizeof itemName, terminal ? "EOS" : "Sample %u", i);
+        sampleHeaders.PutName(itemName);
+        sampleHeaders.Put32(start);
+        sampleHeaders.Put32(end);
+        sampleHeaders.Put32(terminal ? 0 : start + 8);
+        sampleHeaders.Put32(terminal ? 0 : end - 8);
+        sampleHeaders.Put32(terminal ? 0 : 44100);
+        sampleHeaders.data.push_back(terminal ? 0 : 60);
+        sampleHeaders.data.push_back(0);
+        sampleHeaders.Put16(0);
+        sampleHeaders.Put16(terminal ? 0 : 1);
+    }
+
+    // Only terminal records of modulators
+    presetModulators.data.resize(10);
+    instrumentModulators.data.resize(10);
+
+    Writer hydra;
+    hydra.PutChunk("phdr", presets);
+    hydra.PutChunk("pbag", presetBags);
+    hydra.PutChunk("pmod", presetModulators);
+    hydra.PutChunk("pgen", presetGenerators);
+    hydra.PutChunk("inst", instruments);
+    hydra.PutChunk("ibag", instrumentBags);
+    hydra.PutChunk("imod", instrumentModulators);
+    hydra.PutChunk("igen", instrumentGenerators);
+    hydra.PutChunk("shdr", sampleHeaders);
+
+    Writer body, result;
+    body.PutName("sfbk", 4);
+    body.PutList("INFO", info);
+    body.PutList("sdta", sampleData);
+    body.PutList("pdta", hydra);
+    result.PutName("RIFF", 4);
+    result.Put32(uint32_t(body.data.size()));
+    result.data.insert(result.data.end(), body.data.begin(), body.data.end());
+
+    return result.data;
+}
+
+int main()
+{
+    fluid_settings_t* settings = nullptr;
+    fluid_synth_t* synth = nullptr;
+
+    AediStartup("new_fluid_synth", [&]()
+    {
+        settings = new_fluid_settings();
+        AEDI_EXPECT(settings != nullptr);
+
+        synth = new_fluid_synth(settings);
+        AEDI_EXPECT(synth != nullptr);
+    },
+    [&]()
+    {
+        delete_fluid_synth(synth);
+        delete_fluid_settings(settings);
+    });
+
+    // Soundfont used by game can be given instead of synthetic one
+    char path[] = "/tmp/aedi-soundfont-XXXXXX.sf2";
+    const char* soundFontPath = getenv("AEDI_SOUNDFONT");
+
+    if (soundFontPath == nullptr)
+    {
+        const int file = mkstemps(path, 4);
+        AEDI_EXPECT(file != -1);
+
+        const std::vector<unsigned char> soundFont = MakeSoundFont(128, 64 * 1024);
+        AEDI_EXPECT(write(file, soundFont.data(), soundFont.size()) == ssize_t(soundFont.size()));
+        close(file);
+
+        soundFontPath = path;
+    }
+
+    settings = new_fluid_settings();
+    AEDI_EXPECT(settings != nullptr);
+
+    synth = new_fluid_synth(settings);
+    AEDI_EXPECT(synth != nullptr);
+
+    int soundFontId = FLUID_FAILED;
+
+    AediStartup("fluid_synth_sfload", [&]()
+    {
+        soundFontId = fluid_synth_sfload(synth, soundFontPath, 1);
+        AEDI_EXPECT(soundFontId != FLUID_FAILED);
+    },
+    [&]()
+    {
+        AEDI_EXPECT(fluid_synth_sfunload(synth, soundFontId, 1) == FLUID_OK);
+    });
+
+    delete_fluid_synth(synth);
+    delete_fluid_settings(settings);
+
+    if (soundFontPath == path)
+    {
+        unlink(path);
+    }
+
+    return 0;
+}
@@ -0,0 +1,36 @@
+#include <glib-object.h>
+
+int main()
+{
+    // Type system itself is initialized by constructor of the library, its cost is a part of loading
+    GObject* object = nullptr;
+
+    AediStartup("g_object_new", [&]()
+    {
+        object = static_cast<GObject*>(g_object_new(G_TYPE_OBJECT, nullptr));
+        AEDI_EXPECT(object != nullptr);
+    },
+    [&]()
+    {
+        g_object_unref(object);
+    });
+
+    // Engines and libraries register their own types on first use
+    int typeIndex = 0;
+
+    AediStartup("g_type_register_static_simple", [&]()
+    {
+        char name[32];
+        snprintf(name, sizeof name, "AediType%d", typeIndex++);
+
+        const GType type = g_type_register_static_simple(G_TYPE_OBJECT, g_intern_string(name), sizeof(GObjectClass),
+            nullptr, sizeof(GObject), nullptr, GTypeFlags(0));
+        AEDI_EXPECT(type != G_TYPE_INVALID);
+        g_type_class_unref(g_type_class_ref(type));
+    },
+    []()
+    {
+    });
+
+    return 0;
+}
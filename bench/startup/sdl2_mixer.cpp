@@ -0,0 +1,35 @@
+#include <SDL.h>
+#include <SDL_mixer.h>
+
+int main()
+{
+    AediStartup("SDL_Init", []()
+    {
+        AEDI_EXPECT(SDL_Init(SDL_INIT_AUDIO) == 0);
+    },
+    []()
+    {
+        SDL_Quit();
+    });
+
+    AediStartup("Mix_Init", []()
+    {
+        Mix_Init(MIX_INIT_FLAC | MIX_INIT_MOD | MIX_INIT_MP3 | MIX_INIT_OGG | MIX_INIT_MID | MIX_INIT_OPUS);
+    },
+    []()
+    {
+        Mix_Quit();
+    });
+
+    AediStartup("Mix_OpenAudio", []()
+    {
+        AEDI_EXPECT(Mix_OpenAudio(48000, AUDIO_S16SYS, 2, 2048) == 0);
+    },
+    []()
+    {
+        Mix_CloseAudio();
+        SDL_Quit();
+    });
+
+    return 0;
+}
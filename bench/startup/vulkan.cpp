@@ -0,0 +1,53 @@
+#include <vulkan/vulkan_core.h>
+
+int main()
+{
+    // Loader reads manifests of layers and drivers, e.g. MoltenVK, when they are enumerated for the first time
+    AediStartup("vkEnumerateInstanceExtensionProperties", []()
+    {
+        uint32_t count;
+        AEDI_EXPECT(vkEnumerateInstanceExtensionProperties(nullptr, &count, nullptr) == VK_SUCCESS);
+    },
+    []()
+    {
+    });
+
+    VkInstance instance = VK_NULL_HANDLE;
+
+    AediStartup("vkCreateInstance", [&]()
+    {
+        const char* const extensions[] = { VK_KHR_PORTABILITY_ENUMERATION_EXTENSION_NAME };
+
+        VkApplicationInfo application = {};
+        application.sType = VK_STRUCTURE_TYPE_APPLICATION_INFO;
+        application.apiVersion = VK_API_VERSION_1_1;
+
+        VkInstanceCreateInfo info = {};
+        info.sType = VK_STRUCTURE_TYPE_INSTANCE_CREATE_INFO;
+        info.flags = VK_INSTANCE_CREATE_ENUMERATE_PORTABILITY_BIT_KHR;
+        info.pApplicationInfo = &application;
+        info.enabledExtensionCount = 1;
+        info.ppEnabledExtensionNames = extensions;
+
+        // Latency of driver discovery is measured even if there is no driver
+        const VkResult result = vkCreateInstance(&info, nullptr, &instance);
+        AEDI_EXPECT(result == VK_SUCCESS || result == VK_ERROR_INCOMPATIBLE_DRIVER
+            || result == VK_ERROR_EXTENSION_NOT_PRESENT);
+
+        if (result == VK_SUCCESS)
+        {
+            uint32_t count;
+            AEDI_EXPECT(vkEnumeratePhysicalDevices(instance, &count, nullptr) == VK_SUCCESS);
+        }
+    },
+    [&]()
+    {
+        if (instance != VK_NULL_HANDLE)
+        {
+            vkDestroyInstance(instance, nullptr);
+            instance = VK_NULL_HANDLE;
+        }
+    });
+
+    return 0;
+}
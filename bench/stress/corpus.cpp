@@ -0,0 +1,246 @@
+// Packages: sndfile libpng16 libwebp
+// Libraries: mp3lame
+
+#include <string.h>
+#include <string>
+#include <sndfile.h>
+#include <png.h>
+#include <webp/encode.h>
+
+static std::string Path(const char* directory, int seed, const char* extension)
+{
+    char name[32];
+    snprintf(name, sizeof name, "/%03d.%s", seed, extension);
+    return directory + std::string(name);
+}
+
+static void WriteFile(const std::string& path, const std::vector<unsigned char>& data)
+{
+    FILE* const file = fopen(path.c_str(), "wb");
+    AEDI_EXPECT(file != nullptr);
+    AEDI_EXPECT(fwrite(data.data(), 1, data.size(), file) == data.size());
+    AEDI_EXPECT(fclose(file) == 0);
+}
+
+static void WriteAudio(const std::string& path, int format, AediRandom& random)
+{
+    static const int rates[] = { 22050, 32000, 44100, 48000 };
+
+    const int channels = 1 + random() % 2;
+    const int rate = rates[random() % (sizeof rates / sizeof rates[0])];
+    const size_t frames = rate / 4 + random() % (rate * 6);
+    const std::vector<int16_t> audio = AediAudio(frames, channels, rate);
+
+    SF_INFO info = { sf_count_t(frames), rate, channels, format, 0, 0 };
+    SNDFILE* const file = sf_open(path.c_str(), SFM_WRITE, &info);
+
+    if (file == nullptr)
+    {
+        printf("%s: %s\n", path.c_str(), sf_strerror(nullptr));
+        exit(1);
+    }
+
+    AEDI_EXPECT(sf_writef_short(file, audio.data(), frames) == sf_count_t(frames));
+    AEDI_EXPECT(sf_close(file) == 0);
+}
+
+static void WriteImages(const std::string& pngPath, const std::string& webpPath, AediRandom& random)
+{
+    const int width = 1 + random() % 1024;
+    const int height = 1 + random() % 1024;
+    const std::vector<unsigned char> pixels = AediImage(width, height);
+
+    png_image image = {};
+    image.version = PNG_IMAGE_VERSION;
+    image.width = width;
+    image.height = height;
+    image.format = random() % 2 == 0 ? PNG_FORMAT_RGBA : PNG_FORMAT_GRAY;
+
+    // Grayscale image takes the first channel of every pixel
+    std::vector<unsigned char> gray;
+
+    if (image.format == PNG_FORMAT_GRAY)
+    {
+        for (size_t i = 0; i < pixels.size(); i += 4)
+        {
+            gray.push_back(pixels[i]);
+        }
+    }
+
+    AEDI_EXPECT(png_image_write_to_file(&image, pngPath.c_str(), 0,
+        gray.empty() ? pixels.data() : gray.data(), 0, nullptr));
+
+    uint8_t* encoded = nullptr;
+    const size_t encodedSize = random() % 4 == 0
+        ? WebPEncodeLosslessRGBA(pixels.data(), width, height, width * 4, &encoded)
+        : WebPEncodeRGBA(pixels.data(), width, height, width * 4, float(10 + random() % 91), &encoded);
+    AEDI_EXPECT(encodedSize > 0);
+
+    WriteFile(webpPath, std::vector<unsigned char>(encoded, encoded + encodedSize));
+    WebPFree(encoded);
+}
+
+// ProTracker module with four channels, random patterns and sampled waveforms
+static std::vector<unsigned char> GenerateModule(AediRandom& random)
+{
+    static const uint16_t periods[] =
+    {
+        856, 808, 762, 720, 678, 640, 604, 570, 538, 508, 480, 453,
+        428, 404, 381, 360, 339, 320, 302, 285, 269, 254, 240, 226,
+        214, 202, 190, 180, 170, 160, 151, 143, 135, 127, 120, 113,
+    };
+    constexpr size_t PERIOD_COUNT = sizeof periods / sizeof periods[0];
+
+    // Effects that keep song playable: arpeggio, portamento, vibrato, volume slide, volume, and speed
+    static const uint8_t effects[] = { 0x0, 0x1, 0x2, 0x4, 0xA, 0xC, 0xF };
+    constexpr size_t EFFECT_COUNT = sizeof effects / sizeof effects[0];
+
+    std::vector<unsigned char> result;
+    const auto put = [&](unsigned value) { result.push_back(value & 0xFF); };
+    const auto put16 = [&](unsigned value) { put(value >> 8); put(value); };
+
+    const char title[20] = "aedi stress";
+    result.insert(result.end(), title, title + sizeof title);
+
+    const int sampleCount = 1 + random() % 8;
+    std::vector<unsigned> lengths;
+
+    for (int i = 0; i < 31; ++i)
+    {
+        result.insert(result.end(), 22, 0);
+
+        const unsigned length = i < sampleCount ? 256 + random() % 4096 : 0;
+        const unsigned loopStart = length > 0 && random() % 2 == 0 ? random() % length : 0;
+        lengths.push_back(length);
+
+        put16(length);
+        put(random() % 16);
+        put(length > 0 ? random() % 65 : 0);
+        put16(loopStart);
+        put16(loopStart > 0 ? length - loopStart : 1);
+    }
+
+    const int songLength = 1 + random() % 16;
+    const int patternCount = 1 + random() % 8;
+    int usedPatterns = 0;
+
+    put(songLength);
+    put(127);
+
+    for (int i = 0; i < 128; ++i)
+    {
+        const int pattern = i < songLength ? random() % patternCount : 0;
+        usedPatterns = pattern + 1 > usedPatterns ? pattern + 1 : usedPatterns;
+        put(pattern);
+    }
+
+    result.insert(result.end(), { 'M', '.', 'K', '.' });
+
+    for (int cell = 0; cell < usedPatterns * 64 * 4; ++cell)
+    {
+        if (random() % 3 == 0)
+        {
+            result.insert(result.end(), 4, 0);
+            continue;
+        }
+
+        const unsigned period = periods[random() % PERIOD_COUNT];
+        const unsigned sample = 1 + random() % sampleCount;
+        const unsigned effect = effects[random() % EFFECT_COUNT];
+        const unsigned parameter = effect == 0xF ? 1 + random() % 31 : effect == 0xC ? random() % 65 : random() % 256;
+
+        put((sample & 0xF0) | (period >> 8));
+        put(period);
+        put(((sample & 0x0F) << 4) | effect);
+        put(parameter);
+    }
+
+    for (unsigned length : lengths)
+    {
+        const double step = 0.05 + (random() % 100) / 200.0;
+
+        for (unsigned i = 0; i < length * 2; ++i)
+        {
+            put(int(100.0 * sin(i * step)) + int(random() % 9) - 4);
+        }
+    }
+
+    return result;
+}
+
+// Video game music file with commands of SN76489 sound chip, random tones, volumes, and waits
+static std::vector<unsigned char> GenerateVgm(AediRandom& random)
+{
+    constexpr size_t HEADER_SIZE = 0x40;
+
+    std::vector<unsigned char> result(HEADER_SIZE, 0);
+    const auto put32 = [&](size_t offset, uint32_t value)
+    {
+        for (int i = 0; i < 4; ++i)
+        {
+            result[offset + i] = (value >> (i * 8)) & 0xFF;
+        }
+    };
+
+    uint32_t totalSamples = 0;
+    const int commandCount = 16 + random() % 2048;
+
+    for (int i = 0; i < commandCount; ++i)
+    {
+        const unsigned channel = random() % 4;
+        const unsigned period = 1 + random() % 1023;
+        const unsigned wait = random() % 4096;
+
+        result.insert(result.end(), { 0x50, uint8_t(0x80 | (channel << 5) | (period & 0x0F)) });
+        result.insert(result.end(), { 0x50, uint8_t(period >> 4 & 0x3F) });
+        result.insert(result.end(), { 0x50, uint8_t(0x90 | (channel << 5) | random() % 16) });
+        result.insert(result.end(), { 0x61, uint8_t(wait), uint8_t(wait >> 8) });
+
+        totalSamples += wait;
+    }
+
+    result.push_back(0x66);
+
+    memcpy(&result[0], "Vgm ", 4);
+    put32(0x04, uint32_t(result.size() - 4));
+    put32(0x08, 0x150);
+    put32(0x0C, 3579545);
+    put32(0x18, totalSamples);
+    put32(0x24, 60);
+    put32(0x28, 0x00100009);
+    put32(0x34, HEADER_SIZE - 0x34);
+
+    return result;
+}
+
+// Seed files of all formats with parameters varied by seed number are written to directory given as the first argument,
+// number of seeds per format is the second argument
+int main(int argc, char** argv)
+{
+    AEDI_EXPECT(argc == 3);
+
+    const char* const directory = argv[1];
+    const int seedCount = atoi(argv[2]);
+
+    static const int wavFormats[] =
+    {
+        SF_FORMAT_PCM_16, SF_FORMAT_PCM_24, SF_FORMAT_FLOAT, SF_FORMAT_ULAW, SF_FORMAT_IMA_ADPCM,
+    };
+
+    for (int seed = 0; seed < seedCount; ++seed)
+    {
+        AediRandom random = { 0x9E3779B9u * (seed + 1) };
+
+        const int wavFormat = wavFormats[seed % (sizeof wavFormats / sizeof wavFormats[0])];
+        WriteAudio(Path(directory, seed, "wav"), SF_FORMAT_WAV | wavFormat, random);
+        WriteAudio(Path(directory, seed, "flac"), SF_FORMAT_FLAC | (seed % 2 ? SF_FORMAT_PCM_24 : SF_FORMAT_PCM_16),
+            random);
+        WriteAudio(Path(directory, seed, "ogg"), SF_FORMAT_OGG | SF_FORMAT_VORBIS, random);
+        WriteAudio(Path(directory, seed, "mp3"), SF_FORMAT_MPEG | SF_FORMAT_MPEG_LAYER_III, random);
+        WriteImages(Path(directory, seed, "png"), Path(directory, seed, "webp"), random);
+        WriteFile(Path(directory, seed, "mod"), GenerateModule(random));
+        WriteFile(Path(directory, seed, "vgm"), GenerateVgm(random));
+    }
+
+    return 0;
+}
@@ -0,0 +1,51 @@
+#include <dumb.h>
+
+int main(int argc, char** argv)
+{
+    return AediDecode(argc, argv, [](const std::vector<unsigned char>& data)
+    {
+        constexpr int CHANNELS = 2;
+        constexpr long BUFFER_FRAMES = 4096;
+
+        DUMBFILE* const file = dumbfile_open_memory(reinterpret_cast<const char*>(data.data()), data.size());
+        AEDI_EXPECT(file != nullptr);
+
+        DUH* const duh = dumb_read_mod(file, 0);
+        dumbfile_close(file);
+
+        if (duh == nullptr)
+        {
+            return -1LL;
+        }
+
+        DUH_SIGRENDERER* const renderer = duh_start_sigrenderer(duh, 0, CHANNELS, 0);
+
+        if (renderer == nullptr)
+        {
+            unload_duh(duh);
+            return -1LL;
+        }
+
+        // Rendering stops at the end of song instead of looping
+        DUMB_IT_SIGRENDERER* const itRenderer = duh_get_it_sigrenderer(renderer);
+        dumb_it_set_loop_callback(itRenderer, dumb_it_callback_terminate, nullptr);
+        dumb_it_set_xm_speed_zero_callback(itRenderer, dumb_it_callback_terminate, nullptr);
+
+        std::vector<int16_t> buffer(BUFFER_FRAMES * CHANNELS);
+        sample_t** samples = nullptr;
+        long samplesSize = 0;
+        long long decoded = 0;
+
+        for (long frames; decoded < AEDI_DECODE_MAX_FRAMES && (frames = duh_render_int(renderer, &samples,
+            &samplesSize, 16, 0, 1.0f, 65536.0f / 44100, BUFFER_FRAMES, buffer.data())) > 0; )
+        {
+            decoded += frames;
+        }
+
+        destroy_sample_buffer(samples);
+        duh_end_sigrenderer(renderer);
+        unload_duh(duh);
+
+        return decoded;
+    });
+}
@@ -0,0 +1,61 @@
+#include <string.h>
+#include <FLAC/stream_decoder.h>
+
+struct Memory
+{
+    const std::vector<unsigned char>& data;
+    size_t position;
+    long long decodedFrames;
+    bool failed;
+};
+
+static FLAC__StreamDecoderReadStatus Read(const FLAC__StreamDecoder*, FLAC__byte buffer[], size_t* bytes,
+    void* clientData)
+{
+    Memory* const memory = static_cast<Memory*>(clientData);
+    const size_t available = memory->data.size() - memory->position;
+
+    if (available == 0)
+    {
+        *bytes = 0;
+        return FLAC__STREAM_DECODER_READ_STATUS_END_OF_STREAM;
+    }
+
+    *bytes = *bytes < available ? *bytes : available;
+    memcpy(buffer, &memory->data[memory->position], *bytes);
+    memory->position += *bytes;
+
+    return FLAC__STREAM_DECODER_READ_STATUS_CONTINUE;
+}
+
+static FLAC__StreamDecoderWriteStatus Decoded(const FLAC__StreamDecoder*, const FLAC__Frame* frame,
+    const FLAC__int32* const[], void* clientData)
+{
+    static_cast<Memory*>(clientData)->decodedFrames += frame->header.blocksize;
+    return FLAC__STREAM_DECODER_WRITE_STATUS_CONTINUE;
+}
+
+// Decoder resynchronizes after errors, so decoding continues to find slow paths of damaged streams
+static void Error(const FLAC__StreamDecoder*, FLAC__StreamDecoderErrorStatus, void* clientData)
+{
+    static_cast<Memory*>(clientData)->failed = true;
+}
+
+int main(int argc, char** argv)
+{
+    return AediDecode(argc, argv, [](const std::vector<unsigned char>& data)
+    {
+        Memory memory = { data, 0, 0, false };
+
+        FLAC__StreamDecoder* const decoder = FLAC__stream_decoder_new();
+        AEDI_EXPECT(decoder != nullptr);
+        AEDI_EXPECT(FLAC__stream_decoder_init_stream(decoder, Read, nullptr, nullptr, nullptr, nullptr,
+            Decoded, nullptr, Error, &memory) == FLAC__STREAM_DECODER_INIT_STATUS_OK);
+
+        const bool decoded = FLAC__stream_decoder_process_until_end_of_stream(decoder);
+        FLAC__stream_decoder_finish(decoder);
+        FLAC__stream_decoder_delete(decoder);
+
+        return decoded && !memory.failed ? memory.decodedFrames : -1LL;
+    });
+}
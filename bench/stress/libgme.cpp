@@ -0,0 +1,30 @@
+#include <gme/gme.h>
+
+int main(int argc, char** argv)
+{
+    return AediDecode(argc, argv, [](const std::vector<unsigned char>& data)
+    {
+        Music_Emu* emu = nullptr;
+
+        if (gme_open_data(data.data(), long(data.size()), &emu, 44100) != nullptr)
+        {
+            return -1LL;
+        }
+
+        constexpr int BUFFER_SAMPLES = 8192;
+        short buffer[BUFFER_SAMPLES];
+        long long decoded = 0;
+        bool failed = gme_start_track(emu, 0) != nullptr;
+
+        // Length of track is taken from file, it is 150 seconds for files without one
+        while (!failed && decoded < AEDI_DECODE_MAX_FRAMES && !gme_track_ended(emu))
+        {
+            failed = gme_play(emu, BUFFER_SAMPLES, buffer) != nullptr;
+            decoded += BUFFER_SAMPLES / 2;
+        }
+
+        gme_delete(emu);
+
+        return failed ? -1LL : decoded;
+    });
+}
@@ -0,0 +1,31 @@
+#include <libmodplug/modplug.h>
+
+int main(int argc, char** argv)
+{
+    return AediDecode(argc, argv, [](const std::vector<unsigned char>& data)
+    {
+        ModPlug_Settings settings;
+        ModPlug_GetSettings(&settings);
+
+        ModPlugFile* const file = ModPlug_Load(data.data(), int(data.size()));
+
+        if (file == nullptr)
+        {
+            return -1LL;
+        }
+
+        const int frameSize = settings.mChannels * settings.mBits / 8;
+        std::vector<unsigned char> buffer(4096 * frameSize);
+        long long decoded = 0;
+
+        for (int bytes; decoded < AEDI_DECODE_MAX_FRAMES
+            && (bytes = ModPlug_Read(file, buffer.data(), int(buffer.size()))) > 0; )
+        {
+            decoded += bytes / frameSize;
+        }
+
+        ModPlug_Unload(file);
+
+        return decoded;
+    });
+}
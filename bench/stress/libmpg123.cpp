@@ -0,0 +1,36 @@
+#include <mpg123.h>
+
+int main(int argc, char** argv)
+{
+    return AediDecode(argc, argv, [](const std::vector<unsigned char>& data)
+    {
+        int error = MPG123_OK;
+        mpg123_handle* const handle = mpg123_new(nullptr, &error);
+        AEDI_EXPECT(handle != nullptr);
+        AEDI_EXPECT(mpg123_param(handle, MPG123_ADD_FLAGS, MPG123_QUIET, 0.0) == MPG123_OK);
+        AEDI_EXPECT(mpg123_open_feed(handle) == MPG123_OK);
+
+        std::vector<unsigned char> output(64 * 1024);
+        long long decoded = 0;
+        bool failed = mpg123_feed(handle, data.data(), data.size()) != MPG123_OK;
+
+        while (!failed)
+        {
+            size_t done = 0;
+            const int result = mpg123_read(handle, output.data(), output.size(), &done);
+            decoded += done / sizeof(int16_t);
+
+            if (result == MPG123_NEED_MORE || result == MPG123_DONE)
+            {
+                break;
+            }
+
+            failed = result != MPG123_OK && result != MPG123_NEW_FORMAT;
+        }
+
+        mpg123_close(handle);
+        mpg123_delete(handle);
+
+        return failed ? -1LL : decoded;
+    });
+}
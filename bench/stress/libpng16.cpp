@@ -0,0 +1,36 @@
+#include <png.h>
+
+int main(int argc, char** argv)
+{
+    return AediDecode(argc, argv, [](const std::vector<unsigned char>& data)
+    {
+        png_image image = {};
+        image.version = PNG_IMAGE_VERSION;
+
+        if (!png_image_begin_read_from_memory(&image, data.data(), data.size()))
+        {
+            return -1LL;
+        }
+
+        image.format = PNG_FORMAT_RGBA;
+
+        // Image dimensions come from file, limit memory like engines do for textures
+        constexpr size_t MAX_SIZE = 256 * 1024 * 1024;
+        const size_t size = PNG_IMAGE_SIZE(image);
+
+        if (size > MAX_SIZE)
+        {
+            png_image_free(&image);
+            return -1LL;
+        }
+
+        std::vector<unsigned char> pixels(size);
+
+        if (!png_image_finish_read(&image, nullptr, pixels.data(), 0, nullptr))
+        {
+            return -1LL;
+        }
+
+        return static_cast<long long>(image.width) * image.height;
+    });
+}
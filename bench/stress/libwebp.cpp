@@ -0,0 +1,26 @@
+#include <webp/decode.h>
+
+int main(int argc, char** argv)
+{
+    return AediDecode(argc, argv, [](const std::vector<unsigned char>& data)
+    {
+        int width = 0;
+        int height = 0;
+
+        if (!WebPGetInfo(data.data(), data.size(), &width, &height))
+        {
+            return -1LL;
+        }
+
+        uint8_t* const pixels = WebPDecodeRGBA(data.data(), data.size(), &width, &height);
+
+        if (pixels == nullptr)
+        {
+            return -1LL;
+        }
+
+        WebPFree(pixels);
+
+        return static_cast<long long>(width) * height;
+    });
+}
@@ -0,0 +1,46 @@
+#include <xmp.h>
+
+int main(int argc, char** argv)
+{
+    return AediDecode(argc, argv, [](const std::vector<unsigned char>& data)
+    {
+        xmp_context context = xmp_create_context();
+        AEDI_EXPECT(context != nullptr);
+
+        if (xmp_load_module_from_memory(context, data.data(), long(data.size())) != 0)
+        {
+            xmp_free_context(context);
+            return -1LL;
+        }
+
+        long long decoded = 0;
+
+        if (xmp_start_player(context, 44100, 0) == 0)
+        {
+            xmp_frame_info info;
+
+            while (decoded < AEDI_DECODE_MAX_FRAMES && xmp_play_frame(context) == 0)
+            {
+                xmp_get_frame_info(context, &info);
+
+                if (info.loop_count > 0)
+                {
+                    break;
+                }
+
+                decoded += info.buffer_size / (2 * sizeof(int16_t));
+            }
+
+            xmp_end_player(context);
+        }
+        else
+        {
+            decoded = -1;
+        }
+
+        xmp_release_module(context);
+        xmp_free_context(context);
+
+        return decoded;
+    });
+}
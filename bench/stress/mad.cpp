@@ -0,0 +1,50 @@
+#include <mad.h>
+
+int main(int argc, char** argv)
+{
+    return AediDecode(argc, argv, [](const std::vector<unsigned char>& data)
+    {
+        mad_stream stream;
+        mad_frame frame;
+        mad_synth synth;
+
+        mad_stream_init(&stream);
+        mad_frame_init(&frame);
+        mad_synth_init(&synth);
+
+        mad_stream_buffer(&stream, data.data(), data.size());
+
+        long long decoded = 0;
+        bool failed = false;
+
+        while (true)
+        {
+            if (mad_frame_decode(&frame, &stream) != 0)
+            {
+                if (stream.error == MAD_ERROR_BUFLEN)
+                {
+                    break;
+                }
+
+                // Decoding continues after recoverable errors, like it does in engines
+                failed = true;
+
+                if (!MAD_RECOVERABLE(stream.error))
+                {
+                    break;
+                }
+
+                continue;
+            }
+
+            mad_synth_frame(&synth, &frame);
+            decoded += synth.pcm.length;
+        }
+
+        mad_synth_finish(&synth);
+        mad_frame_finish(&frame);
+        mad_stream_finish(&stream);
+
+        return failed ? -1LL : decoded;
+    });
+}
@@ -0,0 +1,83 @@
+// Libraries: mp3lame
+
+#include <string.h>
+#include <sndfile.h>
+
+struct Memory
+{
+    const std::vector<unsigned char>& data;
+    sf_count_t position;
+};
+
+static sf_count_t Length(void* userData)
+{
+    return static_cast<Memory*>(userData)->data.size();
+}
+
+static sf_count_t Seek(sf_count_t offset, int whence, void* userData)
+{
+    Memory* const memory = static_cast<Memory*>(userData);
+    const sf_count_t size = memory->data.size();
+    const sf_count_t position = whence == SEEK_SET ? offset : (whence == SEEK_CUR ? memory->position : size) + offset;
+
+    if (position < 0 || position > size)
+    {
+        return -1;
+    }
+
+    memory->position = position;
+    return position;
+}
+
+static sf_count_t Read(void* buffer, sf_count_t count, void* userData)
+{
+    Memory* const memory = static_cast<Memory*>(userData);
+    const sf_count_t available = memory->data.size() - memory->position;
+    const sf_count_t bytes = count < available ? count : available;
+
+    memcpy(buffer, memory->data.data() + memory->position, bytes);
+    memory->position += bytes;
+
+    return bytes;
+}
+
+static sf_count_t Write(const void*, sf_count_t, void*)
+{
+    return 0;
+}
+
+static sf_count_t Tell(void* userData)
+{
+    return static_cast<Memory*>(userData)->position;
+}
+
+int main(int argc, char** argv)
+{
+    return AediDecode(argc, argv, [](const std::vector<unsigned char>& data)
+    {
+        Memory memory = { data, 0 };
+        SF_VIRTUAL_IO io = { Length, Seek, Read, Write, Tell };
+        SF_INFO info = {};
+
+        SNDFILE* const file = sf_open_virtual(&io, SFM_READ, &info, &memory);
+
+        if (file == nullptr)
+        {
+            return -1LL;
+        }
+
+        constexpr sf_count_t BUFFER_FRAMES = 4096;
+        std::vector<float> buffer(BUFFER_FRAMES * info.channels);
+        long long decoded = 0;
+
+        for (sf_count_t frames; (frames = sf_readf_float(file, buffer.data(), BUFFER_FRAMES)) > 0; )
+        {
+            decoded += frames;
+        }
+
+        const int error = sf_error(file);
+        sf_close(file);
+
+        return error == SF_ERR_NO_ERROR ? decoded : -1LL;
+    });
+}
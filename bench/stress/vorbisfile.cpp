@@ -0,0 +1,69 @@
+#include <string.h>
+#include <vorbis/vorbisfile.h>
+
+struct Memory
+{
+    const std::vector<unsigned char>& data;
+    size_t position;
+};
+
+static size_t Read(void* buffer, size_t size, size_t count, void* source)
+{
+    Memory* const memory = static_cast<Memory*>(source);
+    const size_t available = memory->data.size() - memory->position;
+    const size_t bytes = size * count < available ? size * count : available;
+
+    memcpy(buffer, memory->data.data() + memory->position, bytes);
+    memory->position += bytes;
+
+    return size == 0 ? 0 : bytes / size;
+}
+
+int main(int argc, char** argv)
+{
+    return AediDecode(argc, argv, [](const std::vector<unsigned char>& data)
+    {
+        Memory memory = { data, 0 };
+        const ov_callbacks callbacks = { Read, nullptr, nullptr, nullptr };
+        OggVorbis_File file;
+
+        if (ov_open_callbacks(&memory, &file, nullptr, 0, callbacks) != 0)
+        {
+            return -1LL;
+        }
+
+        std::vector<char> output(16 * 1024);
+        long long decoded = 0;
+        bool failed = false;
+        int section = 0;
+
+        while (true)
+        {
+            const long result = ov_read(&file, output.data(), int(output.size()), 0, 2, 1, &section);
+
+            if (result == 0)
+            {
+                break;
+            }
+
+            // Hole in data is reported once, and decoding continues after it
+            if (result < 0)
+            {
+                failed = true;
+
+                if (result != OV_HOLE)
+                {
+                    break;
+                }
+
+                continue;
+            }
+
+            decoded += result / sizeof(int16_t);
+        }
+
+        ov_clear(&file);
+
+        return failed ? -1LL : decoded;
+    });
+}
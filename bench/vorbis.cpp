@@ -0,0 +1,157 @@
+// Packages: vorbisenc vorbisfile
+
+#include <string.h>
+#include <vorbis/vorbisenc.h>
+#include <vorbis/vorbisfile.h>
+
+struct Memory
+{
+    std::vector<unsigned char> data;
+    size_t position = 0;
+};
+
+static void AppendPage(Memory& memory, const ogg_page& page)
+{
+    memory.data.insert(memory.data.end(), page.header, page.header + page.header_len);
+    memory.data.insert(memory.data.end(), page.body, page.body + page.body_len);
+}
+
+static void Encode(Memory& memory, const std::vector<int16_t>& audio, int channels, int rate)
+{
+    vorbis_info info;
+    vorbis_info_init(&info);
+    AEDI_EXPECT(vorbis_encode_init_vbr(&info, channels, rate, 0.4f) == 0);
+
+    vorbis_comment comment;
+    vorbis_comment_init(&comment);
+
+    vorbis_dsp_state dsp;
+    AEDI_EXPECT(vorbis_analysis_init(&dsp, &info) == 0);
+
+    vorbis_block block;
+    AEDI_EXPECT(vorbis_block_init(&dsp, &block) == 0);
+
+    ogg_stream_state stream;
+    AEDI_EXPECT(ogg_stream_init(&stream, 1) == 0);
+
+    ogg_packet header, commentHeader, codeHeader;
+    AEDI_EXPECT(vorbis_analysis_headerout(&dsp, &comment, &header, &commentHeader, &codeHeader) == 0);
+    ogg_stream_packetin(&stream, &header);
+    ogg_stream_packetin(&stream, &commentHeader);
+    ogg_stream_packetin(&stream, &codeHeader);
+
+    ogg_page page;
+
+    while (ogg_stream_flush(&stream, &page) != 0)
+    {
+        AppendPage(memory, page);
+    }
+
+    const size_t frameCount = audio.size() / channels;
+    constexpr size_t CHUNK_FRAMES = 4096;
+
+    for (size_t offset = 0; offset <= frameCount; offset += CHUNK_FRAMES)
+    {
+        const size_t frames = offset + CHUNK_FRAMES < frameCount ? CHUNK_FRAMES : frameCount - offset;
+
+        // Zero frames signal end of stream
+        if (frames > 0)
+        {
+            float** const buffer = vorbis_analysis_buffer(&dsp, frames);
+
+            for (size_t i = 0; i < frames; ++i)
+            {
+                for (int channel = 0; channel < channels; ++channel)
+                {
+                    buffer[channel][i] = audio[(offset + i) * channels + channel] / 32768.0f;
+                }
+            }
+        }
+
+        AEDI_EXPECT(vorbis_analysis_wrote(&dsp, frames) == 0);
+
+        while (vorbis_analysis_blockout(&dsp, &block) == 1)
+        {
+            vorbis_analysis(&block, nullptr);
+            vorbis_bitrate_addblock(&block);
+
+            ogg_packet packet;
+
+            while (vorbis_bitrate_flushpacket(&dsp, &packet) == 1)
+            {
+                ogg_stream_packetin(&stream, &packet);
+
+                while (ogg_stream_pageout(&stream, &page) != 0)
+                {
+                    AppendPage(memory, page);
+                }
+            }
+        }
+    }
+
+    while (ogg_stream_flush(&stream, &page) != 0)
+    {
+        AppendPage(memory, page);
+    }
+
+    ogg_stream_clear(&stream);
+    vorbis_block_clear(&block);
+    vorbis_dsp_clear(&dsp);
+    vorbis_comment_clear(&comment);
+    vorbis_info_clear(&info);
+}
+
+static size_t Read(void* buffer, size_t size, size_t count, void* source)
+{
+    Memory* const memory = static_cast<Memory*>(source);
+    const size_t available = memory->data.size() - memory->position;
+    const size_t bytes = size * count < available ? size * count : available;
+
+    memcpy(buffer, &memory->data[memory->position], bytes);
+    memory->position += bytes;
+
+    return size == 0 ? 0 : bytes / size;
+}
+
+int main()
+{
+    constexpr int CHANNELS = 2;
+    constexpr int RATE = 44100;
+    constexpr size_t FRAMES = RATE * 10;
+
+    Memory memory;
+    Encode(memory, AediAudio(FRAMES, CHANNELS, RATE), CHANNELS, RATE);
+
+    std::vector<char> output(16 * 1024);
+
+    AediBenchmark("decode", "Msamples/s", FRAMES / 1e6, [&]()
+    {
+        memory.position = 0;
+
+        const ov_callbacks callbacks = { Read, nullptr, nullptr, nullptr };
+        OggVorbis_File file;
+        AEDI_EXPECT(ov_open_callbacks(&memory, &file, nullptr, 0, callbacks) == 0);
+
+        size_t bytes = 0;
+        int section = 0;
+
+        while (true)
+        {
+            const long result = ov_read(&file, output.data(), int(output.size()), 0, 2, 1, &section);
+            AEDI_EXPECT(result >= 0);
+
+            if (result == 0)
+            {
+                break;
+            }
+
+            bytes += result;
+        }
+
+        ov_clear(&file);
+
+        AEDI_EXPECT(bytes == FRAMES * CHANNELS * sizeof(int16_t));
+    });
+
+    return 0;
+}
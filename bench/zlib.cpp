@@ -0,0 +1,29 @@
+#include <zlib.h>
+
+int main()
+{
+    constexpr size_t SIZE = 4 * 1024 * 1024;
+    const std::vector<unsigned char> input = AediText(SIZE);
+
+    std::vector<unsigned char> deflated(compressBound(SIZE));
+    uLongf deflatedSize = 0;
+
+    AediBenchmark("deflate", "MB/s", SIZE / 1e6, [&]()
+    {
+        deflatedSize = deflated.size();
+        AEDI_EXPECT(compress2(deflated.data(), &deflatedSize, input.data(), SIZE, Z_DEFAULT_COMPRESSION) == Z_OK);
+    });
+
+    std::vector<unsigned char> inflated(SIZE);
+
+    AediBenchmark("inflate", "MB/s", SIZE / 1e6, [&]()
+    {
+        uLongf inflatedSize = SIZE;
+        AEDI_EXPECT(uncompress(inflated.data(), &inflatedSize, deflated.data(), deflatedSize) == Z_OK);
+        AEDI_EXPECT(inflatedSize == SIZE);
+    });
+
+    AEDI_EXPECT(inflated == input);
+
+    return 0;
+}
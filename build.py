@@ -20,8 +20,9 @@
 
 import os
 import sys
+from pathlib import Path
 
-_min_version = (3, 8, 0, 'final', 0)
+_min_version = (3, 9, 0, 'final', 0)
 
 if sys.version_info < _min_version:
     print(f'This module requires Python {_min_version[0]}.{_min_version[1]}.{_min_version[2]} or newer')
@@ -33,6 +34,15 @@ root_path = os.path.abspath(os.path.dirname(__file__))
 sys.path.append(f'{root_path}{os.sep}core')
 
 import aedi  # noqa: E402
+import support.conflicts  # noqa: E402
+import support.lto  # noqa: E402
+import support.matrix  # noqa: E402
+import support.pgo  # noqa: E402
+import support.prefix  # noqa: E402
+import support.profile  # noqa: E402
+import support.sanitize  # noqa: E402
+import support.slim  # noqa: E402
+import support.universal  # noqa: E402
 import target  # noqa: E402
 
 
@@ -44,7 +54,83 @@ def _main():
     group.add_argument('--static-moltenvk', action='store_true', help='link with static MoltenVK library')
     group.add_argument('--quasi-glib', action='store_true', help='link with QuasiGlib library')
 
-    builder.run(sys.argv[1:])
+    group = builder.argparser.add_argument_group('Optimization')
+    group.add_argument('--profile', choices=support.profile.PROFILES.keys(),
+                       help='apply optimization profile to all targets, dependencies and main targets alike')
+    group.add_argument('--thin-lto-deps', action='store_true',
+                       help='install ThinLTO archives next to regular ones, and link main targets with them')
+    group.add_argument('--slim-deps', action='store_true',
+                       help='remove unused members and debug information from installed static libraries, '
+                            'and make them deterministic')
+    group.add_argument('--pgo-train', metavar='COMMAND',
+                       help='build main target with profile-guided optimization using output of training command, '
+                            '{build_path} and {source} placeholders are substituted, and ~ is expanded')
+    group.add_argument('--pgo-cache-path', metavar='PATH', default=f'{root_path}{os.sep}pgo',
+                       help='path to store profile data per source commit')
+    group.add_argument('--matrix-variant', metavar='NAME',
+                       help='apply variant of build options matrix to target, see deps.py matrix command')
+
+    group = builder.argparser.add_argument_group('Universal')
+    group.add_argument('--concurrent-archs', action='store_true',
+                       help='build main target for each architecture concurrently in separate processes, '
+                            'and merge their outputs')
+    group.add_argument('--merge-tool', metavar='COMMAND', default=support.universal.MERGE_TOOL,
+                       help='command to merge binaries, {output} and {inputs} placeholders are substituted')
+
+    group = builder.argparser.add_argument_group('Checks')
+    group.add_argument('--check-symbol-conflicts', action='store_true',
+                       help='fail when built dependency defines the same strong symbols as other dependencies, '
+                            'or when objects of main target define symbols of dependencies')
+    group.add_argument('--sanitizer', action='append', choices=support.sanitize.SANITIZERS.keys(),
+                       help='build targets instrumented with sanitizer or for coverage, see deps.py sanitize command')
+
+    args = sys.argv[1:]
+    arguments, _ = builder.argparser.parse_known_args(args)
+
+    if arguments.concurrent_archs:
+        _build_concurrently(args, arguments)
+        return
+
+    if arguments.profile:
+        support.profile.install(builder.targets, arguments.profile)
+    if arguments.thin_lto_deps:
+        support.lto.install(builder.targets)
+    if arguments.matrix_variant:
+        support.matrix.install(builder.targets, arguments.target, arguments.matrix_variant)
+    if arguments.slim_deps:
+        support.slim.install(builder.targets)
+    if arguments.pgo_train:
+        support.pgo.install(builder.targets, arguments.pgo_train, Path(arguments.pgo_cache_path))
+    if arguments.check_symbol_conflicts:
+        support.conflicts.install(builder.targets)
+    if arguments.sanitizer:
+        support.sanitize.install(builder.targets, arguments.sanitizer)
+
+    # Prefix directory is brought up to date with dependencies incrementally, only changed links are touched
+    prefix_path = getattr(arguments, 'prefix_path', None) or f'{root_path}{os.sep}prefix'
+    support.prefix.install(builder, Path(f'{root_path}{os.sep}deps'), Path(prefix_path))
+
+    builder.run(args)
+
+
+def _build_concurrently(args, arguments):
+    arch_args = []
+    skip_value = False
+
+    # Remove options of this mode, they must not be passed to per-architecture builds
+    for arg in args:
+        if skip_value:
+            skip_value = False
+        elif arg == '--merge-tool':
+            skip_value = True
+        elif arg != '--concurrent-archs' and not arg.startswith('--merge-tool='):
+            arch_args.append(arg)
+
+    build_path = getattr(arguments, 'build_path', None) or f'{root_path}{os.sep}build'
+    output_path = getattr(arguments, 'output_path', None) or f'{root_path}{os.sep}output'
+    merger = support.universal.Merger(arguments.merge_tool)
+
+    support.universal.build(__file__, arch_args, Path(build_path), Path(output_path), merger)
 
 
 if __name__ == '__main__':
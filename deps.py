@@ -0,0 +1,669 @@
+#!/usr/bin/env python3
+
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import argparse
+import os
+import sys
+import typing
+from pathlib import Path
+
+_min_version = (3, 9, 0, 'final', 0)
+
+if sys.version_info < _min_version:
+    print(f'This module requires Python {_min_version[0]}.{_min_version[1]}.{_min_version[2]} or newer')
+    exit(1)
+
+sys.dont_write_bytecode = True
+
+root_path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(f'{root_path}{os.sep}core')
+
+from support import bench, bundle, conflicts, dedupe, impact, integrity, linkbench, linkline, matrix, pkgconfig, rewrite, sanitize, slim, startup, stress, symbols, tests  # noqa: E402
+import target  # noqa: E402
+
+
+def _pkg_config(arguments, args):
+    try:
+        print(pkgconfig.instance().run(*args), end='')
+    except pkgconfig.PkgConfigError as ex:
+        print(ex, file=sys.stderr)
+        exit(1)
+
+
+def _check_pkg_config(arguments, _):
+    mismatches = pkgconfig.compare(arguments.executable)
+
+    for mismatch in mismatches:
+        print(mismatch)
+
+    if mismatches:
+        exit(1)
+
+
+def _symbols(arguments, _):
+    index = symbols.load()
+    missing = False
+
+    for symbol in arguments.symbol:
+        locations = index.lookup(symbol, arguments.arch)
+
+        for location in locations:
+            print(f'{symbol} {location}')
+
+        if not locations:
+            print(f'{symbol} is not defined', file=sys.stderr)
+            missing = True
+
+    if missing:
+        exit(1)
+
+
+def _conflicts(arguments, _):
+    index = symbols.load()
+
+    if arguments.objects:
+        found = conflicts.find_in_objects(index, [Path(path) for path in arguments.objects], arguments.arch)
+    else:
+        found = conflicts.find(index, arguments.arch, arguments.dependency, arguments.all)
+
+    for conflict in found:
+        print(conflict)
+
+    if found:
+        exit(1)
+
+
+def _link_line(arguments, _):
+    roots = []
+
+    for name in arguments.library:
+        library = linkline.find_library(name)
+
+        if not library:
+            print(f'Library {name} was not found', file=sys.stderr)
+            exit(1)
+
+        roots.append(library)
+
+    line = linkline.resolve(symbols.load(), roots, arguments.arch)
+    print(' '.join(line.flags()))
+
+    for cycle in line.cycles:
+        print(f"Libraries depend on each other: {' '.join(cycle)}", file=sys.stderr)
+
+    if arguments.verbose:
+        for symbol, libraries in sorted(line.external.items()):
+            print(f"{symbol} is assumed to be in libSystem, referenced by {' '.join(sorted(libraries))}",
+                  file=sys.stderr)
+
+
+def _libs_private(arguments, _):
+    index = symbols.load()
+
+    for package in arguments.package:
+        try:
+            print(f'{package}: {linkline.libs_private(index, package, arch=arguments.arch)}')
+        except pkgconfig.PkgConfigError as ex:
+            print(ex, file=sys.stderr)
+            exit(1)
+
+
+def _slim(arguments, _):
+    paths = [Path(path) for path in arguments.library] or sorted(pkgconfig.DEPS_PATH.glob(symbols.ARCHIVE_PATTERN))
+    size_before, size_after = 0, 0
+
+    for path in paths:
+        if path.is_symlink():
+            continue
+
+        result = slim.slim(path)
+        size_before += result.size_before
+        size_after += result.size_after
+        print(result)
+
+    print(f'Total: {size_before} -> {size_after} bytes')
+
+
+def _rewrite(arguments, _):
+    for dependency in target.targets():
+        install_path = pkgconfig.DEPS_PATH / dependency.name
+        rules = getattr(dependency, 'rewrite_rules', None)
+
+        if not rules or not install_path.exists() or (arguments.target and dependency.name not in arguments.target):
+            continue
+
+        for path in rewrite.apply(install_path, rules, arguments.dry_run):
+            if not arguments.dry_run:
+                print(f'Rewritten {path}')
+
+
+def _dedupe(arguments, _):
+    if arguments.restore:
+        for path in dedupe.restore():
+            print(f'Restored {path}')
+    else:
+        for path, original in dedupe.dedupe():
+            print(f'Linked {path} to {original}')
+
+
+def _manifest(arguments, _):
+    count = integrity.update()
+    print(f'Hashed {count} files')
+
+
+def _verify(arguments, _):
+    if not integrity.MANIFEST_PATH.exists():
+        print(f'Manifest {integrity.MANIFEST_PATH} was not found, create it with manifest command', file=sys.stderr)
+        exit(1)
+
+    problems = integrity.verify()
+
+    for problem in problems:
+        print(problem)
+
+    if problems:
+        exit(1)
+
+
+def _bundle(arguments, _):
+    try:
+        results = bundle.pack_dependencies(arguments.dependency, codec_name=arguments.codec)
+    except bundle.BundleError as ex:
+        print(ex, file=sys.stderr)
+        exit(1)
+
+    for name, result in results.items():
+        print(f"{name}: {result['files']} files, {result['size']} -> {result['compressed_size']} bytes")
+
+
+def _restore(arguments, _):
+    try:
+        if arguments.list:
+            for name in arguments.dependency:
+                for path in bundle.Bundle(bundle.bundle_path(name)).names(arguments.include):
+                    print(f'{name}/{path}')
+        else:
+            for name, paths in bundle.restore(arguments.dependency, arguments.include).items():
+                print(f'{name}: {len(paths)} files restored')
+    except (bundle.BundleError, OSError) as ex:
+        print(ex, file=sys.stderr)
+        exit(1)
+
+
+def _change(arguments) -> typing.Optional[impact.Change]:
+    if not arguments.since and not arguments.changed:
+        return None
+
+    change = impact.from_git(arguments.since) if arguments.since else impact.Change(set(), set())
+    change.dependencies.update(arguments.changed)
+
+    return change
+
+
+def _select(arguments, runner, source_path: Path, prelude_path: Path) -> typing.List[str]:
+    names = arguments.name or runner.names()
+    change = _change(arguments)
+
+    if change:
+        names = impact.select(names, source_path, prelude_path, runner.flags, change)
+
+        if not names:
+            print('No programs are affected by changes')
+
+    return names
+
+
+def _test(arguments, _):
+    runner_class = tests.DriverRunner if arguments.single_binary else tests.Runner
+    runner = runner_class(jobs=arguments.jobs, use_cache=not arguments.no_cache)
+    names = _select(arguments, runner, runner.test_path, runner.test_path / tests.PRELUDE)
+    failed = False
+
+    if not names:
+        return
+
+    for result in runner.run(names):
+        print(result)
+
+        if not result.passed:
+            print(result.output)
+            failed = True
+
+    if failed:
+        exit(1)
+
+
+def _bench(arguments, _):
+    runner = bench.Runner(jobs=arguments.jobs, samples=arguments.samples)
+    names = _select(arguments, runner, runner.bench_path, runner.prelude_path)
+
+    if not names:
+        return
+
+    measurements, failures = runner.run(names)
+
+    for measurement in measurements:
+        print(measurement)
+
+    print(f'Results saved to {runner.save(measurements, arguments.output)}')
+
+    for name, output in failures.items():
+        print(f'{name}: FAILED\n{output}', file=sys.stderr)
+
+    if failures:
+        exit(1)
+
+
+def _startup(arguments, _):
+    runner = startup.Runner(jobs=arguments.jobs, processes=arguments.processes, warm=arguments.warm,
+                            purge_command=arguments.purge_command)
+    names = _select(arguments, runner, runner.bench_path, runner.prelude_path)
+
+    if not names:
+        return
+
+    latencies, failures = runner.run(names)
+
+    for latency in latencies:
+        print(latency)
+
+    print(f'Results saved to {runner.save(latencies, arguments.output)}')
+
+    for name, output in failures.items():
+        print(f'{name}: FAILED\n{output}', file=sys.stderr)
+
+    if failures:
+        exit(1)
+
+
+def _stress(arguments, _):
+    runner = stress.Runner(jobs=arguments.jobs, processes=arguments.processes, timeout=arguments.timeout)
+    names = _select(arguments, runner, runner.bench_path, runner.prelude_path)
+
+    if not names:
+        return
+
+    try:
+        files = stress.corpus_files(arguments.corpus) if arguments.corpus \
+            else runner.generate(seeds=arguments.seeds, mutations=arguments.mutations)
+    except bench.BenchmarkError as ex:
+        print(f'Corpus generation failed\n{ex}', file=sys.stderr)
+        exit(1)
+
+    decodes, failures = runner.stress(names, files)
+
+    for summary in stress.summarize(decodes):
+        print(summary)
+
+    print('Slowest inputs:')
+
+    for decode in stress.slowest(decodes, arguments.slowest):
+        print(f'    {decode}')
+
+    print(f'Results saved to {runner.save(decodes, arguments.output)}')
+
+    for name, output in failures.items():
+        print(f'{name}: FAILED\n{output}', file=sys.stderr)
+
+    failed = [decode for decode in decodes if decode.failed]
+
+    for decode in failed:
+        print(f'{decode}\n{decode.output}', file=sys.stderr)
+
+    if failures or failed:
+        exit(1)
+
+
+def _compare(arguments, _):
+    sources = (arguments.baseline, arguments.candidate)
+    runners = []
+    results = {}
+
+    # Every side of comparison is either dependencies directory, or saved results of bench command
+    for label, path in zip(('baseline', 'candidate'), sources):
+        if path.is_file():
+            results[label] = bench.load(path)
+        else:
+            runners.append((label, bench.Runner(output_path=bench.OUTPUT_PATH / label, deps_path=path.resolve(),
+                                                jobs=arguments.jobs, samples=arguments.samples)))
+
+    failures = {}
+
+    if runners:
+        names = arguments.name or runners[0][1].names()
+        measurements, failures = bench.measure_interleaved([runner for _, runner in runners], names, arguments.rounds)
+        results.update(zip((label for label, _ in runners), measurements))
+
+    for name, output in failures.items():
+        print(f'{name}: FAILED\n{output}', file=sys.stderr)
+
+    comparisons = bench.compare(results['baseline'], results['candidate'], arguments.threshold / 100)
+
+    for comparison in comparisons:
+        print(comparison)
+
+    if failures or any(comparison.failed for comparison in comparisons):
+        exit(1)
+
+
+def _matrix(arguments, _):
+    if arguments.list:
+        target_matrix = matrix.matrix(arguments.target)
+
+        for name, variant in target_matrix.variants.items():
+            settings = [f'{key}={value}' for key, value in variant.options.items()]
+            settings += [variant.cflags] if variant.cflags else []
+            print(f"{name}: {' '.join(settings)}".rstrip())
+
+        return
+
+    try:
+        rankings, failures = matrix.explore(arguments.target, arguments.variant, jobs=arguments.jobs,
+                                            rounds=arguments.rounds, samples=arguments.samples)
+    except KeyError as ex:
+        print(ex.args[0], file=sys.stderr)
+        exit(1)
+
+    for name, output in failures.items():
+        print(f'{name}: FAILED\n{output}', file=sys.stderr)
+
+    columns = [f'{measurement.benchmark}/{measurement.name}' for measurement in rankings[0].measurements] \
+        if rankings else []
+    print('  '.join(['rank', f"{'variant':<24}", f"{'score':>6}"] + [f'{column:>16}' for column in columns]))
+
+    for rank, ranking in enumerate(rankings, 1):
+        medians = {f'{measurement.benchmark}/{measurement.name}': measurement.median
+                   for measurement in ranking.measurements}
+        values = [f'{medians[column]:>16.2f}' if column in medians else f"{'-':>16}" for column in columns]
+        print('  '.join([f'{rank:>4}', f'{ranking.variant:<24}', f'{ranking.score:>6.3f}'] + values))
+
+    if failures:
+        exit(1)
+
+
+def _sanitize(arguments, _):
+    sanitizer_names = arguments.sanitizer or sanitize.DEFAULT_SANITIZERS
+
+    if not arguments.no_build:
+        failures = sanitize.build(arguments.dependency, sanitizer_names, jobs=arguments.jobs)
+
+        for name, output in failures.items():
+            print(f'{name}: FAILED\n{output}', file=sys.stderr)
+
+        if failures:
+            exit(1)
+    elif not sanitize.prefix_path(sanitizer_names).exists():
+        print(f'No instrumented dependencies in {sanitize.prefix_path(sanitizer_names)}', file=sys.stderr)
+        exit(1)
+
+    release, instrumented = sanitize.runners(sanitizer_names, jobs=arguments.jobs)
+    names = arguments.test or impact.select(release.names(), tests.TEST_PATH, tests.TEST_PATH / tests.PRELUDE,
+                                            release.flags, impact.Change(set(arguments.dependency), set()))
+
+    if not names:
+        print('No tests link with instrumented dependencies')
+        return
+
+    failed = set()
+
+    # Reports of sanitizers go to output of failed tests
+    for runner in (release, instrumented):
+        for result in runner.run(names):
+            if not result.passed:
+                print(f'{result.name} ({runner.deps_path.name}): FAILED\n{result.output}', file=sys.stderr)
+                failed.add(result.name)
+
+    overheads = sanitize.measure([name for name in names if name not in failed], release, instrumented,
+                                 arguments.repetitions)
+
+    for overhead in overheads:
+        print(overhead)
+
+    if overheads:
+        print(f'Mean overhead: {sanitize.mean_ratio(overheads):.2f}x')
+
+    if failed:
+        exit(1)
+
+
+def _link_bench(arguments, _):
+    harness = linkbench.Harness(arch=arguments.arch, repetitions=arguments.repetitions)
+    history = linkbench.load_history()
+    results = []
+    failed = False
+
+    for target_name in arguments.target or linkbench.targets():
+        try:
+            result = harness.run(target_name)
+        except (KeyError, linkbench.LinkError) as ex:
+            print(f'{target_name}: FAILED\n{ex}', file=sys.stderr)
+            failed = True
+            continue
+
+        results.append(result)
+        print(result)
+
+        last = linkbench.previous(history, result)
+
+        if last:
+            print(f"    since {last['commit']} {last['time']}: {result.seconds - last['seconds']:+.2f} s, "
+                  f"{result.size - last['size']:+,} bytes, {len(result.dylibs) - len(last['dylibs']):+} dylibs")
+
+    if results and not arguments.no_record:
+        linkbench.record(results)
+
+    if failed:
+        exit(1)
+
+
+def _impact(arguments, _):
+    change = _change(arguments)
+
+    if not change:
+        print('Either --since or --changed option is required', file=sys.stderr)
+        exit(1)
+
+    print(f"Changed dependencies: {' '.join(sorted(change.dependencies)) or 'none'}")
+
+    runners = (
+        ('test', tests.Runner(), tests.TEST_PATH, tests.TEST_PATH / tests.PRELUDE),
+        ('bench', bench.Runner(), bench.BENCH_PATH, bench.BENCH_PATH / bench.PRELUDE),
+        ('startup', startup.Runner(), startup.STARTUP_PATH, bench.BENCH_PATH / bench.PRELUDE),
+        ('stress', stress.Runner(), stress.STRESS_PATH, bench.BENCH_PATH / bench.PRELUDE),
+    )
+
+    for command, runner, source_path, prelude_path in runners:
+        names = impact.select(runner.names(), source_path, prelude_path, runner.flags, change)
+        print(f"{command}: {' '.join(names) or 'none'}")
+
+
+def _add_impact_arguments(subparser):
+    subparser.add_argument('--since', metavar='REVISION',
+                           help='select programs affected by changes of targets, patches and dependencies since revision')
+    subparser.add_argument('--changed', action='append', default=[], metavar='DEPENDENCY',
+                           help='select programs that link with changed dependency, e.g. ogg')
+
+
+def _main():
+    parser = argparse.ArgumentParser(description='Maintenance commands for prebuilt dependencies')
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+
+    # Arguments of this command are passed as is, like to pkg-config executable
+    subparser = subparsers.add_parser('pkg-config', help='query dependencies like pkg-config does')
+    subparser.set_defaults(handler=_pkg_config, passthrough=True)
+
+    subparser = subparsers.add_parser('check-pkg-config', help='compare pkg-config resolver with pkg-config command')
+    subparser.add_argument('--executable', default='pkg-config', help='pkg-config command to compare with')
+    subparser.set_defaults(handler=_check_pkg_config)
+
+    subparser = subparsers.add_parser('symbols', help='find static libraries and their object files defining symbols')
+    subparser.add_argument('--arch', help='architecture to search, all by default')
+    subparser.add_argument('symbol', nargs='+', help='symbol name as stored in object files, e.g. _inflate')
+    subparser.set_defaults(handler=_symbols)
+
+    subparser = subparsers.add_parser('conflicts', help='report strong symbols defined in more than one library')
+    subparser.add_argument('--arch', help='architecture to check, all by default')
+    subparser.add_argument('--dependency', help='report only conflicts involving this dependency')
+    subparser.add_argument('--all', action='store_true',
+                           help='report also conflicts between libraries of the same dependency')
+    subparser.add_argument('objects', nargs='*',
+                           help='check object files, archives, or build directories against all dependencies instead')
+    subparser.set_defaults(handler=_conflicts)
+
+    subparser = subparsers.add_parser('link-line', help='compute libraries and frameworks needed to link libraries')
+    subparser.add_argument('--arch', help='architecture to resolve symbols for, all by default')
+    subparser.add_argument('--verbose', action='store_true', help='show symbols assumed to be in libSystem')
+    subparser.add_argument('library', nargs='+', help='library name like FLAC, or path relative to deps directory')
+    subparser.set_defaults(handler=_link_line)
+
+    subparser = subparsers.add_parser('link-bench', help='measure link time, memory and binary size of main targets')
+    subparser.add_argument('--arch', help='architecture to link for, current machine by default')
+    subparser.add_argument('--repetitions', type=int, default=3, help='number of timed links of every target')
+    subparser.add_argument('--no-record', action='store_true', help='do not append results to link-history.jsonl')
+    subparser.add_argument('target', nargs='*', help='main target name, all by default')
+    subparser.set_defaults(handler=_link_bench)
+
+    subparser = subparsers.add_parser('libs-private', help='compute Libs.private lines of pkg-config packages')
+    subparser.add_argument('--arch', help='architecture to resolve symbols for, all by default')
+    subparser.add_argument('package', nargs='+', help='pkg-config package name')
+    subparser.set_defaults(handler=_libs_private)
+
+    subparser = subparsers.add_parser('slim', help='remove unused members and debug information from static libraries')
+    subparser.add_argument('library', nargs='*', help='path to static library, all libraries of dependencies by default')
+    subparser.set_defaults(handler=_slim)
+
+    subparser = subparsers.add_parser('rewrite', help='apply rewrite rules of targets to installed dependencies')
+    subparser.add_argument('--target', action='append', help='name of target, all targets with rules by default')
+    subparser.add_argument('--dry-run', action='store_true', help='print differences instead of writing files')
+    subparser.set_defaults(handler=_rewrite)
+
+    subparser = subparsers.add_parser('dedupe', help='replace identical files of dependencies with hard links')
+    subparser.add_argument('--restore', action='store_true', help='replace hard links with copies of files again')
+    subparser.set_defaults(handler=_dedupe)
+
+    subparser = subparsers.add_parser('manifest', help='record size and hash of dependencies files')
+    subparser.set_defaults(handler=_manifest)
+
+    subparser = subparsers.add_parser('verify', help='check dependencies files against manifest')
+    subparser.set_defaults(handler=_verify)
+
+    subparser = subparsers.add_parser('bundle', help='pack dependencies to compressed bundles with index')
+    subparser.add_argument('--codec', choices=bundle.CODECS.keys(), default=bundle.DEFAULT_CODEC,
+                           help='compression method')
+    subparser.add_argument('dependency', nargs='*', help='dependency to pack, all by default')
+    subparser.set_defaults(handler=_bundle)
+
+    subparser = subparsers.add_parser('restore', help='extract dependencies from bundles')
+    subparser.add_argument('--include', action='append', default=[], metavar='PATTERN',
+                           help='extract only files matching pattern, e.g. include/* or lib/pkgconfig/*.pc')
+    subparser.add_argument('--list', action='store_true', help='list files of bundles instead of extracting them')
+    subparser.add_argument('dependency', nargs='*', help='dependency to extract, all bundled by default')
+    subparser.set_defaults(handler=_restore)
+
+    subparser = subparsers.add_parser('test', help='build and run tests of dependencies concurrently')
+    subparser.add_argument('--jobs', type=int, help='number of tests to build and run at once, number of CPUs by default')
+    subparser.add_argument('--no-cache', action='store_true', help='run tests even if they passed with the same inputs')
+    subparser.add_argument('--single-binary', action='store_true',
+                           help='link all tests into one executable that runs each test in a separate process')
+    subparser.add_argument('name', nargs='*', help='test to run, all by default')
+    _add_impact_arguments(subparser)
+    subparser.set_defaults(handler=_test)
+
+    subparser = subparsers.add_parser('impact', help='list tests and benchmarks affected by changes')
+    _add_impact_arguments(subparser)
+    subparser.set_defaults(handler=_impact)
+
+    subparser = subparsers.add_parser('bench', help='measure throughput of codec and compression libraries')
+    subparser.add_argument('--jobs', type=int, help='number of benchmarks to build at once, number of CPUs by default')
+    subparser.add_argument('--samples', type=int, help='number of measurements of every benchmark, 5 by default')
+    subparser.add_argument('--output', type=Path, help='file to save results to, build/bench/results.json by default')
+    subparser.add_argument('name', nargs='*', help='benchmark to run, all by default')
+    _add_impact_arguments(subparser)
+    subparser.set_defaults(handler=_bench)
+
+    subparser = subparsers.add_parser('startup', help='measure cold and warm initialization latency of libraries')
+    subparser.add_argument('--jobs', type=int, help='number of benchmarks to build at once, number of CPUs by default')
+    subparser.add_argument('--processes', type=int, default=20,
+                           help='number of processes launched per benchmark, each of them measures one cold start')
+    subparser.add_argument('--warm', type=int, default=10, help='number of warm initializations in every process')
+    subparser.add_argument('--purge-command', metavar='COMMAND',
+                           help='command to drop file system caches before every launch, e.g. "sudo purge"')
+    subparser.add_argument('--output', type=Path,
+                           help='file to save results to, build/bench/startup/results.json by default')
+    subparser.add_argument('name', nargs='*', help='benchmark to run, all by default')
+    _add_impact_arguments(subparser)
+    subparser.set_defaults(handler=_startup)
+
+    subparser = subparsers.add_parser('stress', help='decode corpus of generated and mutated files with every decoder')
+    subparser.add_argument('--jobs', type=int, help='number of decoders to build at once, number of CPUs by default')
+    subparser.add_argument('--processes', type=int, help='number of files to decode at once, number of CPUs by default')
+    subparser.add_argument('--timeout', type=float, default=10.0, help='seconds to decode one file before it fails')
+    subparser.add_argument('--seeds', type=int, default=8, help='number of generated files of every format')
+    subparser.add_argument('--mutations', type=int, default=16, help='number of damaged copies of every generated file')
+    subparser.add_argument('--corpus', type=Path, help='directory with files to decode instead of generated ones')
+    subparser.add_argument('--slowest', type=int, default=10, help='number of slowest inputs to report')
+    subparser.add_argument('--output', type=Path,
+                           help='file to save results to, build/bench/stress/results.json by default')
+    subparser.add_argument('name', nargs='*', help='decoder to run, all by default')
+    _add_impact_arguments(subparser)
+    subparser.set_defaults(handler=_stress)
+
+    subparser = subparsers.add_parser('compare', help='compare benchmark results of two dependencies directories')
+    subparser.add_argument('--jobs', type=int, help='number of benchmarks to build at once, number of CPUs by default')
+    subparser.add_argument('--samples', type=int, help='number of measurements of every benchmark run, 5 by default')
+    subparser.add_argument('--rounds', type=int, default=3, help='number of alternating runs of benchmarks')
+    subparser.add_argument('--threshold', type=float, default=5.0,
+                           help='slowdown in percent that fails comparison, 5 by default')
+    subparser.add_argument('baseline', type=Path, help='dependencies directory or results file of bench command')
+    subparser.add_argument('candidate', type=Path, help='dependencies directory or results file of bench command')
+    subparser.add_argument('name', nargs='*', help='benchmark to run, all by default')
+    subparser.set_defaults(handler=_compare)
+
+    subparser = subparsers.add_parser('matrix', help='build target with variants of its options and rank them by throughput')
+    subparser.add_argument('--jobs', type=int, help='number of variants to build at once, all by default')
+    subparser.add_argument('--samples', type=int, help='number of measurements of every benchmark run, 5 by default')
+    subparser.add_argument('--rounds', type=int, default=1, help='number of alternating runs of benchmarks')
+    subparser.add_argument('--variant', action='append', default=[], help='variant to build, all by default')
+    subparser.add_argument('--list', action='store_true', help='list declared variants of target instead')
+    subparser.add_argument('target', help='name of dependency target, e.g. opus')
+    subparser.set_defaults(handler=_matrix)
+
+    subparser = subparsers.add_parser('sanitize', help='build dependencies with sanitizers and report overhead of tests')
+    subparser.add_argument('--sanitizer', action='append', choices=sanitize.SANITIZERS.keys(),
+                           help='sanitizer to instrument dependencies with, address and undefined by default')
+    subparser.add_argument('--jobs', type=int, help='number of dependencies to build at once, all by default')
+    subparser.add_argument('--repetitions', type=int, default=5, help='number of timed runs of every test')
+    subparser.add_argument('--no-build', action='store_true', help='use previously instrumented dependencies')
+    subparser.add_argument('--test', action='append', default=[],
+                           help='test to run, all tests linking with instrumented dependencies by default')
+    subparser.add_argument('dependency', nargs='+', help='name of dependency target, e.g. xmp')
+    subparser.set_defaults(handler=_sanitize)
+
+    arguments, args = parser.parse_known_args()
+
+    if args and not getattr(arguments, 'passthrough', False):
+        parser.error(f"unrecognized arguments: {' '.join(args)}")
+
+    arguments.handler(arguments, args)
+
+
+if __name__ == '__main__':
+    _main()
@@ -0,0 +1,354 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import struct
+import typing
+
+FAT_MAGIC = 0xcafebabe
+FAT_MAGIC_64 = 0xcafebabf
+AR_MAGIC = b'!<arch>\n'
+AR_HEADER_SIZE = 60
+MH_MAGIC_64 = 0xfeedfacf
+# Raw LLVM bitcode, and bitcode wrapper that is written by Apple toolchain
+BITCODE_MAGICS = (b'BC\xc0\xde', b'\xde\xc0\x17\x0b')
+
+CPU_TYPES = {
+    0x00000007: 'i386',
+    0x01000007: 'x86_64',
+    0x0000000c: 'arm',
+    0x0100000c: 'arm64',
+}
+
+LC_SEGMENT_64 = 0x19
+LC_SYMTAB = 0x02
+LC_LINKER_OPTION = 0x2d
+LC_LOAD_DYLIB = 0x0c
+LC_LOAD_WEAK_DYLIB = 0x80000018
+LC_REEXPORT_DYLIB = 0x8000001f
+
+N_STAB = 0xe0
+N_TYPE = 0x0e
+N_EXT = 0x01
+N_UNDF = 0x00
+N_WEAK_DEF = 0x0080
+
+SYMDEF_NAMES = ('__.SYMDEF', '__.SYMDEF SORTED', '__.SYMDEF_64', '__.SYMDEF_64 SORTED')
+
+
+class ArchiveError(Exception):
+    pass
+
+
+class Member:
+    def __init__(self, name: str, offset: int, data: memoryview, date: int, uid: int, gid: int, mode: int):
+        self.name = name
+        # Offset of member header within archive, it is used by symbol table of contents
+        self.offset = offset
+        self.data = data
+        self.date = date
+        self.uid = uid
+        self.gid = gid
+        self.mode = mode
+
+
+class Section:
+    def __init__(self, segment: str, name: str, offset: int, size: int):
+        self.segment = segment
+        self.name = name
+        self.offset = offset
+        self.size = size
+
+
+class Object:
+    def __init__(self):
+        self.defined: typing.List[str] = []
+        self.weak: typing.List[str] = []
+        self.common: typing.List[str] = []
+        self.undefined: typing.List[str] = []
+        self.linker_options: typing.List[typing.List[str]] = []
+        self.sections: typing.List[Section] = []
+        # Install names of dynamic libraries and frameworks, they are present in linked executables only
+        self.dylibs: typing.List[str] = []
+        self.debug_symbols = 0
+
+
+class FatSlice:
+    def __init__(self, cpu_type: int, cpu_subtype: int, align: int, data: memoryview):
+        self.cpu_type = cpu_type
+        self.cpu_subtype = cpu_subtype
+        self.align = align
+        self.data = data
+
+    @property
+    def arch(self) -> str:
+        return CPU_TYPES.get(self.cpu_type, hex(self.cpu_type))
+
+
+def fat_slices(data: typing.Union[bytes, memoryview]) -> typing.Optional[typing.List[FatSlice]]:
+    view = memoryview(data)
+    magic = struct.unpack_from('>I', view)[0] if len(view) >= 4 else 0
+
+    if magic not in (FAT_MAGIC, FAT_MAGIC_64):
+        return None
+
+    count = struct.unpack_from('>I', view, 4)[0]
+    entry_format, entry_size = ('>IIQQI4x', 32) if magic == FAT_MAGIC_64 else ('>IIIII', 20)
+    result = []
+
+    for i in range(count):
+        cpu_type, cpu_subtype, offset, size, align = struct.unpack_from(entry_format, view, 8 + i * entry_size)
+        result.append(FatSlice(cpu_type, cpu_subtype, align, view[offset:offset + size]))
+
+    return result
+
+
+def slices(data: typing.Union[bytes, memoryview]) -> typing.Dict[str, memoryview]:
+    view = memoryview(data)
+    fat = fat_slices(view)
+
+    if fat is not None:
+        return {fat_slice.arch: fat_slice.data for fat_slice in fat}
+
+    # Thin file, architecture is known for object files only
+    if bytes(view[:8]) == AR_MAGIC:
+        arch = ''
+
+        for member in members(view):
+            if not member.name.startswith('__.SYMDEF'):
+                arch = _object_arch(member.data)
+                break
+    else:
+        arch = _object_arch(view)
+
+    return {arch: view}
+
+
+def _object_arch(data: memoryview) -> str:
+    if len(data) < 8 or struct.unpack_from('<I', data)[0] != MH_MAGIC_64:
+        return ''
+
+    cpu_type = struct.unpack_from('<I', data, 4)[0]
+    return CPU_TYPES.get(cpu_type, hex(cpu_type))
+
+
+def members(data: memoryview) -> typing.Iterator[Member]:
+    if bytes(data[:8]) != AR_MAGIC:
+        raise ArchiveError('not an ar archive')
+
+    position = len(AR_MAGIC)
+    end = len(data)
+
+    while position + AR_HEADER_SIZE <= end:
+        header = bytes(data[position:position + AR_HEADER_SIZE])
+
+        if header[58:60] != b'\x60\n':
+            raise ArchiveError(f'malformed member header at offset {position}')
+
+        name = header[:16].decode('ascii').rstrip(' ')
+        size = int(header[48:58])
+        start = position + AR_HEADER_SIZE
+
+        # BSD variant stores long names right after header, their length is included in member size
+        if name.startswith('#1/'):
+            name_length = int(name[3:])
+            name = bytes(data[start:start + name_length]).rstrip(b'\0').decode('utf-8')
+            content = data[start + name_length:start + size]
+        else:
+            content = data[start:start + size]
+            name = name.rstrip('/')
+
+        yield Member(name, position, content, _int(header[16:28]), _int(header[28:34]), _int(header[34:40]),
+                     _int(header[40:48], 8))
+
+        position = start + size + (size & 1)
+
+
+def _int(value: bytes, base: int = 10) -> int:
+    value = value.strip()
+    return int(value, base) if value else 0
+
+
+def table_of_contents(member: Member) -> typing.Dict[str, int]:
+    # Maps symbol to offset of member header that defines it
+    data = member.data
+    is64 = member.name.startswith('__.SYMDEF_64')
+    size_format, entry_format = ('<Q', '<QQ') if is64 else ('<I', '<II')
+    size_length = struct.calcsize(size_format)
+    entry_length = struct.calcsize(entry_format)
+
+    ranlib_size = struct.unpack_from(size_format, data)[0]
+    strings_offset = size_length + ranlib_size + size_length
+    strings_size = struct.unpack_from(size_format, data, size_length + ranlib_size)[0]
+    strings = bytes(data[strings_offset:strings_offset + strings_size])
+    result = {}
+
+    for i in range(ranlib_size // entry_length):
+        string_index, offset = struct.unpack_from(entry_format, data, size_length + i * entry_length)
+        result.setdefault(_string(strings, string_index), offset)
+
+    return result
+
+
+def _string(strings: bytes, index: int) -> str:
+    end = strings.find(b'\0', index)
+    return strings[index:end if end >= 0 else len(strings)].decode('utf-8', 'replace')
+
+
+def is_object(data: memoryview) -> bool:
+    return len(data) >= 32 and struct.unpack_from('<I', data)[0] == MH_MAGIC_64
+
+
+def is_bitcode(data: memoryview) -> bool:
+    return bytes(data[:4]) in BITCODE_MAGICS
+
+
+def parse_object(data: memoryview) -> Object:
+    if not is_object(data):
+        raise ArchiveError('not a 64-bit Mach-O object')
+
+    result = Object()
+    command_count = struct.unpack_from('<I', data, 16)[0]
+    position = 32
+    symtab = None
+
+    for _ in range(command_count):
+        command, command_size = struct.unpack_from('<II', data, position)
+
+        if command == LC_SYMTAB:
+            symtab = struct.unpack_from('<IIII', data, position + 8)
+        elif command == LC_LINKER_OPTION:
+            count = struct.unpack_from('<I', data, position + 8)[0]
+            strings = bytes(data[position + 12:position + command_size]).split(b'\0')
+            result.linker_options.append([s.decode('utf-8') for s in strings[:count]])
+        elif command in (LC_LOAD_DYLIB, LC_LOAD_WEAK_DYLIB, LC_REEXPORT_DYLIB):
+            name_offset = struct.unpack_from('<I', data, position + 8)[0]
+            name = bytes(data[position + name_offset:position + command_size]).split(b'\0', 1)[0]
+            result.dylibs.append(name.decode('utf-8'))
+        elif command == LC_SEGMENT_64:
+            section_count = struct.unpack_from('<I', data, position + 64)[0]
+
+            for i in range(section_count):
+                section_position = position + 72 + i * 80
+                section_name, segment_name = struct.unpack_from('<16s16s', data, section_position)
+                size, offset = struct.unpack_from('<QI', data, section_position + 40)
+                result.sections.append(Section(segment_name.rstrip(b'\0').decode('ascii'),
+                                               section_name.rstrip(b'\0').decode('ascii'), offset, size))
+
+        position += command_size
+
+    if not symtab:
+        return result
+
+    symbol_offset, symbol_count, strings_offset, strings_size = symtab
+    strings = bytes(data[strings_offset:strings_offset + strings_size])
+
+    for i in range(symbol_count):
+        string_index, symbol_type, _, description, value = struct.unpack_from('<IBBHQ', data, symbol_offset + i * 16)
+
+        if symbol_type & N_STAB:
+            result.debug_symbols += 1
+            continue
+        if not symbol_type & N_EXT:
+            continue
+
+        name = _string(strings, string_index)
+
+        if symbol_type & N_TYPE == N_UNDF:
+            (result.common if value else result.undefined).append(name)
+        elif description & N_WEAK_DEF:
+            result.weak.append(name)
+        else:
+            result.defined.append(name)
+
+    return result
+
+
+def write_archive(archive_members: typing.Sequence[typing.Tuple[str, bytes]],
+                  symbols: typing.Sequence[typing.Tuple[str, int]]) -> bytes:
+    # Archive is written like by libtool -D, all dates, user and group ids are zero,
+    # table of contents maps symbols sorted by name to indices of members that define them
+    names = bytearray()
+    entries = []
+
+    for symbol, index in sorted(symbols):
+        entries.append((len(names), index))
+        names += symbol.encode('utf-8') + b'\0'
+
+    names += b'\0' * (-len(names) % 8)
+    toc_size = 4 + len(entries) * 8 + 4 + len(names)
+
+    # Offsets of member headers are known once size of table of contents is known
+    offsets = []
+    position = len(AR_MAGIC) + AR_HEADER_SIZE + _name_size('__.SYMDEF SORTED') + toc_size
+
+    for name, data in archive_members:
+        offsets.append(position)
+        position += AR_HEADER_SIZE + _name_size(name) + len(data) + (-len(data) % 8)
+
+    toc = bytearray(struct.pack('<I', len(entries) * 8))
+
+    for string_index, index in entries:
+        toc += struct.pack('<II', string_index, offsets[index])
+
+    toc += struct.pack('<I', len(names)) + names
+
+    result = bytearray(AR_MAGIC)
+    _write_member(result, '__.SYMDEF SORTED', bytes(toc))
+
+    for name, data in archive_members:
+        _write_member(result, name, data)
+
+    return bytes(result)
+
+
+def _name_size(name: str) -> int:
+    # Long name is padded with zeros, so member data starts at 8 bytes boundary
+    length = len(name.encode('utf-8'))
+    return length + (-length % 8) + 4
+
+
+def _write_member(output: bytearray, name: str, data: bytes):
+    encoded_name = name.encode('utf-8')
+    name_size = _name_size(name)
+    padding = -len(data) % 8
+    size = name_size + len(data) + padding
+
+    header = f'#1/{name_size:<13}{0:<12}{0:<6}{0:<6}{100644:<8}{size:<10}`\n'
+    output += header.encode('ascii')
+    output += encoded_name + b'\0' * (name_size - len(encoded_name))
+    output += data
+    output += b'\0' * padding
+
+
+def write_fat(fat: typing.Sequence[FatSlice]) -> bytes:
+    header = bytearray(struct.pack('>II', FAT_MAGIC, len(fat)))
+    position = 8 + len(fat) * 20
+    body = bytearray()
+
+    for fat_slice in fat:
+        alignment = 1 << fat_slice.align
+        padding = -position % alignment
+        position += padding
+        body += b'\0' * padding
+
+        header += struct.pack('>IIIII', fat_slice.cpu_type, fat_slice.cpu_subtype, position, len(fat_slice.data),
+                              fat_slice.align)
+        body += fat_slice.data
+        position += len(fat_slice.data)
+
+    return bytes(header + body)
@@ -0,0 +1,303 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import os
+import platform
+import random
+import re
+import shlex
+import statistics
+import subprocess
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from . import linkline, pkgconfig, tests
+from .pkgconfig import DEPS_PATH, ROOT_PATH
+
+BENCH_PATH = ROOT_PATH / 'bench'
+OUTPUT_PATH = ROOT_PATH / 'build' / 'bench'
+PRELUDE = 'aedi.h'
+RESULTS_FILENAME = 'results.json'
+COMPILER_FLAGS = (*tests.COMPILER_FLAGS, '-O2')
+SAMPLES_VARIABLE = 'AEDI_BENCH_SAMPLES'
+BOOTSTRAP_RESAMPLES = 2000
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+class Measurement(typing.NamedTuple):
+    benchmark: str
+    name: str
+    unit: str
+    iterations: int
+    samples: typing.List[float]
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    def __str__(self):
+        return f'{self.benchmark}/{self.name}: {self.median:.2f} {self.unit}'
+
+
+class Comparison(typing.NamedTuple):
+    benchmark: str
+    name: str
+    unit: str
+    baseline: float
+    candidate: float
+    # Relative change of median throughput with its confidence interval, negative values are slowdowns
+    change: float
+    low: float
+    high: float
+    regressed: bool
+    # Candidate has no result, e.g. its benchmark failed to build or run
+    missing: bool = False
+
+    @property
+    def failed(self) -> bool:
+        return self.regressed or self.missing
+
+    def __str__(self):
+        if self.missing:
+            return f'{self.benchmark}/{self.name}: {self.baseline:.2f} {self.unit} -> MISSING'
+
+        status = 'REGRESSED' if self.regressed else 'ok'
+        return f'{self.benchmark}/{self.name}: {self.baseline:.2f} -> {self.candidate:.2f} {self.unit}, ' \
+            f'{self.change:+.1%} [{self.low:+.1%}, {self.high:+.1%}] {status}'
+
+
+class Runner:
+    def __init__(self, bench_path: Path = BENCH_PATH, output_path: Path = OUTPUT_PATH, deps_path: Path = DEPS_PATH,
+                 compiler: typing.Optional[str] = None, jobs: typing.Optional[int] = None,
+                 samples: typing.Optional[int] = None, prelude_path: typing.Optional[Path] = None):
+        self.bench_path = bench_path
+        self.prelude_path = prelude_path or bench_path / PRELUDE
+        self.output_path = output_path
+        self.deps_path = deps_path
+        self.compiler = compiler or os.environ.get('CXX', 'clang++')
+        self.jobs = jobs or os.cpu_count()
+        self.samples = samples
+        self.pkg_config = pkgconfig.instance(deps_path)
+
+    def names(self) -> typing.List[str]:
+        # Benchmark name is the name of pkg-config package it measures, like test name
+        return sorted(path.stem for path in self.bench_path.glob('*.cpp'))
+
+    def directives(self, name: str) -> typing.Dict[str, typing.List[str]]:
+        # Leading comments like '// Packages: vorbisenc vorbisfile' list what else benchmark needs to build
+        result = {}
+
+        with open(self.bench_path / f'{name}.cpp') as f:
+            for line in f:
+                match = re.match(r'//\s*(\w+):(.*)', line)
+
+                if match:
+                    result[match.group(1).lower()] = match.group(2).split()
+                elif line.strip():
+                    break
+
+        return result
+
+    def packages(self, name: str) -> typing.List[str]:
+        return [name] + self.directives(name).get('packages', [])
+
+    def flags(self, name: str) -> typing.List[str]:
+        directives = self.directives(name)
+        result = shlex.split(self.pkg_config.run('--cflags', '--libs', '--static', *self.packages(name)))
+
+        # Libraries without pkg-config files are searched in dependencies directly
+        for library in directives.get('libraries', []):
+            path = linkline.find_library(library, self.deps_path)
+
+            if not path:
+                raise BenchmarkError(f'Library {library} required by benchmark {name} was not found')
+
+            dependency_path = self.deps_path / Path(path).parts[0]
+            result += [f'-I{dependency_path / "include"}', f'-L{dependency_path / "lib"}', f'-l{library}']
+
+        return result
+
+    def run(self, names: typing.Sequence[str] = ()) \
+            -> typing.Tuple[typing.List[Measurement], typing.Dict[str, str]]:
+        names = names or self.names()
+        failures = self.build(names)
+        measurements, run_failures = self.measure([name for name in names if name not in failures])
+        failures.update(run_failures)
+
+        return measurements, failures
+
+    def build(self, names: typing.Sequence[str]) -> typing.Dict[str, str]:
+        os.makedirs(self.output_path, exist_ok=True)
+
+        # Benchmarks are built concurrently, but run one by one to not disturb each other
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            built = list(executor.map(self._build, names))
+
+        return {name: output for name, output in built if output}
+
+    def measure(self, names: typing.Sequence[str]) \
+            -> typing.Tuple[typing.List[Measurement], typing.Dict[str, str]]:
+        measurements = []
+        failures = {}
+
+        for name in names:
+            try:
+                measurements += self._run(name)
+            except BenchmarkError as ex:
+                failures[name] = str(ex)
+
+        return measurements, failures
+
+    def save(self, measurements: typing.Sequence[Measurement], path: typing.Optional[Path] = None) -> Path:
+        path = path or self.output_path / RESULTS_FILENAME
+        results = {
+            'compiler': self.compiler,
+            'machine': platform.machine(),
+            'deps': str(self.deps_path),
+            'benchmarks': [measurement._asdict() for measurement in measurements],
+        }
+
+        os.makedirs(path.parent, exist_ok=True)
+
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=4)
+
+        return path
+
+    def _build(self, name: str) -> typing.Tuple[str, str]:
+        try:
+            flags = self.flags(name)
+        except (BenchmarkError, pkgconfig.PkgConfigError) as ex:
+            return name, str(ex)
+
+        args = [self.compiler, *COMPILER_FLAGS, '-include', str(self.prelude_path),
+                str(self.bench_path / f'{name}.cpp'), *flags, '-o', str(self.output_path / name)]
+        process = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+        return name, process.stdout if process.returncode else ''
+
+    def _run(self, name: str) -> typing.List[Measurement]:
+        environment = os.environ.copy()
+
+        if self.samples:
+            environment[SAMPLES_VARIABLE] = str(self.samples)
+
+        process = subprocess.run([str(self.output_path / name)], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                 text=True, env=environment)
+
+        if process.returncode:
+            raise BenchmarkError(process.stdout)
+
+        return parse_output(name, process.stdout)
+
+
+def parse_output(benchmark: str, output: str) -> typing.List[Measurement]:
+    # Every measurement is printed as JSON object on its own line
+    result = []
+
+    for line in output.splitlines():
+        if line.startswith('{'):
+            values = json.loads(line)
+            result.append(Measurement(benchmark, values['name'], values['unit'], values['iterations'],
+                                      values['samples']))
+
+    return result
+
+
+def load(path: Path) -> typing.List[Measurement]:
+    with open(path) as f:
+        return [Measurement(**values) for values in json.load(f)['benchmarks']]
+
+
+def merge(measurements: typing.Sequence[Measurement]) -> typing.List[Measurement]:
+    # Samples of the same measurement from several runs are combined
+    result: typing.Dict[typing.Tuple[str, str], Measurement] = {}
+
+    for measurement in measurements:
+        key = measurement.benchmark, measurement.name
+        existing = result.get(key)
+        result[key] = existing._replace(samples=existing.samples + measurement.samples) if existing else measurement
+
+    return list(result.values())
+
+
+def measure_interleaved(runners: typing.Sequence[Runner], names: typing.Sequence[str], rounds: int) \
+        -> typing.Tuple[typing.List[typing.List[Measurement]], typing.Dict[str, str]]:
+    # Runs alternate between runners, so slow drift of machine state, e.g. thermal throttling, affects them equally
+    failures = {}
+    failed_names = set()
+
+    for runner in runners:
+        build_failures = runner.build(names)
+        failed_names.update(build_failures)
+        failures.update({f'{name} ({runner.deps_path})': output for name, output in build_failures.items()})
+
+    names = [name for name in names if name not in failed_names]
+    results: typing.List[typing.List[Measurement]] = [[] for _ in runners]
+
+    for _ in range(rounds):
+        for runner, result in zip(runners, results):
+            measurements, run_failures = runner.measure(names)
+            result += measurements
+            failures.update({f'{name} ({runner.deps_path})': output for name, output in run_failures.items()})
+
+    return [merge(result) for result in results], failures
+
+
+def compare(baseline: typing.Sequence[Measurement], candidate: typing.Sequence[Measurement],
+            threshold: float = 0.05, confidence: float = 0.95) -> typing.List[Comparison]:
+    candidates = {(measurement.benchmark, measurement.name): measurement for measurement in merge(candidate)}
+    generator = random.Random(0)
+    result = []
+
+    for before in merge(baseline):
+        after = candidates.get((before.benchmark, before.name))
+
+        if not before.samples:
+            continue
+
+        if not after or not after.samples:
+            result.append(Comparison(before.benchmark, before.name, before.unit, before.median, 0.0,
+                                     0.0, 0.0, 0.0, False, missing=True))
+            continue
+
+        change = after.median / before.median - 1.0
+        low, high = _bootstrap_interval(before.samples, after.samples, confidence, generator)
+
+        # Slowdown counts as regression only if it exceeds threshold, and it is not explained by noise
+        regressed = change < -threshold and high < 0.0
+        result.append(Comparison(before.benchmark, before.name, before.unit, before.median, after.median,
+                                 change, low, high, regressed))
+
+    return result
+
+
+def _bootstrap_interval(baseline: typing.Sequence[float], candidate: typing.Sequence[float], confidence: float,
+                        generator: random.Random) -> typing.Tuple[float, float]:
+    # Percentile bootstrap of relative change of medians, it makes no assumptions about distribution of samples
+    changes = sorted(statistics.median(generator.choices(candidate, k=len(candidate)))
+                     / statistics.median(generator.choices(baseline, k=len(baseline))) - 1.0
+                     for _ in range(BOOTSTRAP_RESAMPLES))
+    tail = (1.0 - confidence) / 2.0
+
+    return changes[int(tail * (len(changes) - 1))], changes[int((1.0 - tail) * (len(changes) - 1))]
@@ -0,0 +1,256 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import fnmatch
+import json
+import lzma
+import os
+import struct
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .pkgconfig import DEPS_PATH, ROOT_PATH
+
+BUNDLES_PATH = ROOT_PATH / 'bundles'
+EXTENSION = '.bundle'
+
+# File starts with magic and codec name, then every file is compressed separately,
+# so it can be extracted alone or in parallel with others, index and footer are at the end
+HEADER_MAGIC = b'AEDIBNDL'
+FOOTER_MAGIC = b'AEDIINDX'
+HEADER_FORMAT = '<8s8s'
+FOOTER_FORMAT = '<QQ8s'
+
+
+class BundleError(Exception):
+    pass
+
+
+class Codec(typing.NamedTuple):
+    name: str
+    compress: typing.Callable[[bytes], bytes]
+    decompress: typing.Callable[[bytes], bytes]
+
+
+def _codecs() -> typing.Dict[str, Codec]:
+    result = {'xz': Codec('xz', lambda data: lzma.compress(data, preset=6), lzma.decompress)}
+
+    # Python 3.14 has zstd module, older versions need zstandard package
+    try:
+        from compression import zstd
+        result['zstd'] = Codec('zstd', lambda data: zstd.compress(data, 19), zstd.decompress)
+    except ImportError:
+        try:
+            import zstandard
+            result['zstd'] = Codec('zstd', lambda data: zstandard.ZstdCompressor(level=19).compress(data),
+                                   lambda data: zstandard.ZstdDecompressor().decompress(data))
+        except ImportError:
+            pass
+
+    return result
+
+
+CODECS = _codecs()
+DEFAULT_CODEC = 'zstd' if 'zstd' in CODECS else 'xz'
+
+
+def _codec(name: str) -> Codec:
+    codec = CODECS.get(name)
+
+    if not codec:
+        raise BundleError(f'Compression {name} is not available')
+
+    return codec
+
+
+def pack(source_path: Path, bundle_path: Path, codec_name: str = DEFAULT_CODEC) -> typing.Dict[str, typing.Any]:
+    codec = _codec(codec_name)
+    files = []
+
+    for directory, dirnames, filenames in os.walk(source_path):
+        # Symbolic links to directories are not followed, they are stored as links like the others
+        for filename in filenames + [dirname for dirname in dirnames if os.path.islink(Path(directory) / dirname)]:
+            files.append(Path(directory) / filename)
+
+    files.sort()
+
+    def compress(path: Path) -> typing.Optional[bytes]:
+        return None if path.is_symlink() else codec.compress(path.read_bytes())
+
+    # lzma and zstd release GIL while compressing
+    with ThreadPoolExecutor() as executor:
+        compressed = list(executor.map(compress, files))
+
+    entries = []
+    temp_path = bundle_path.with_suffix('.tmp')
+    os.makedirs(bundle_path.parent, exist_ok=True)
+
+    with open(temp_path, 'wb') as f:
+        f.write(struct.pack(HEADER_FORMAT, HEADER_MAGIC, codec.name.encode('ascii')))
+
+        for path, data in zip(files, compressed):
+            relpath = path.relative_to(source_path).as_posix()
+
+            if data is None:
+                entries.append({'path': relpath, 'link': os.readlink(path)})
+                continue
+
+            path_stat = path.stat()
+            entries.append({'path': relpath, 'offset': f.tell(), 'size': len(data), 'length': path_stat.st_size,
+                            'mode': path_stat.st_mode & 0o777, 'mtime': path_stat.st_mtime_ns})
+            f.write(data)
+
+        index = codec.compress(json.dumps(entries, sort_keys=True).encode('utf-8'))
+        index_offset = f.tell()
+        f.write(index)
+        f.write(struct.pack(FOOTER_FORMAT, index_offset, len(index), FOOTER_MAGIC))
+
+    os.replace(temp_path, bundle_path)
+
+    return {'files': len(entries), 'size': sum(entry.get('length', 0) for entry in entries),
+            'compressed_size': bundle_path.stat().st_size}
+
+
+class Bundle:
+    def __init__(self, path: Path):
+        self.path = path
+
+        with open(path, 'rb') as f:
+            magic, codec_name = struct.unpack(HEADER_FORMAT, f.read(struct.calcsize(HEADER_FORMAT)))
+
+            f.seek(-struct.calcsize(FOOTER_FORMAT), os.SEEK_END)
+            index_offset, index_size, footer_magic = struct.unpack(FOOTER_FORMAT, f.read())
+
+            if magic != HEADER_MAGIC or footer_magic != FOOTER_MAGIC:
+                raise BundleError(f'{path} is not a bundle')
+
+            self.codec = _codec(codec_name.rstrip(b'\0').decode('ascii'))
+
+            f.seek(index_offset)
+            entries = json.loads(self.codec.decompress(f.read(index_size)))
+
+        self.entries: typing.Dict[str, typing.Dict[str, typing.Any]] = {entry['path']: entry for entry in entries}
+
+    def names(self, patterns: typing.Sequence[str] = ()) -> typing.List[str]:
+        names = sorted(self.entries)
+
+        if patterns:
+            names = [name for name in names if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)]
+
+        return names
+
+    def read(self, name: str) -> bytes:
+        entry = self.entries[name]
+
+        with open(self.path, 'rb') as f:
+            f.seek(entry['offset'])
+            data = self.codec.decompress(f.read(entry['size']))
+
+        if len(data) != entry['length']:
+            raise BundleError(f'{name} in {self.path} is corrupted')
+
+        return data
+
+    def extract(self, destination: Path, patterns: typing.Sequence[str] = ()) -> typing.List[str]:
+        names = self.names(patterns)
+        root = destination.resolve()
+
+        # Bundle may come from elsewhere, its files must not be written outside of destination
+        for name in names:
+            if os.path.isabs(name) or '..' in Path(name).parts:
+                raise BundleError(f'{name} in {self.path} has unsafe path')
+
+            link = self.entries[name].get('link')
+
+            if link is not None and (os.path.isabs(link)
+                                     or os.path.normpath(os.path.join(os.path.dirname(name), link)).startswith('..')):
+                raise BundleError(f'{name} in {self.path} links outside of destination')
+
+        def inside(path: Path) -> bool:
+            try:
+                resolved = path.resolve()
+            except RuntimeError:
+                # Loop of symbolic links
+                return False
+
+            return resolved == root or root in resolved.parents
+
+        def prepare(name: str) -> Path:
+            path = destination / name
+
+            # Symbolic links that already exist in destination may lead outside of it
+            if not inside(path.parent):
+                raise BundleError(f'{name} in {self.path} resolves outside of {destination}')
+
+            os.makedirs(path.parent, exist_ok=True)
+
+            if path.is_symlink() or path.is_file():
+                os.unlink(path)
+            elif os.path.lexists(path):
+                raise BundleError(f'{name} in {self.path} conflicts with existing {path}')
+
+            return path
+
+        def extract_file(name: str):
+            entry = self.entries[name]
+            path = prepare(name)
+
+            # File is created anew and never opened through symbolic link
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_NOFOLLOW, 0o600)
+
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self.read(name))
+
+            os.chmod(path, entry['mode'])
+            os.utime(path, ns=(entry['mtime'], entry['mtime']))
+
+        links = [name for name in names if 'link' in self.entries[name]]
+
+        # Regular files are extracted in parallel, then links are created one by one,
+        # so no file is written through a link from bundle
+        with ThreadPoolExecutor() as executor:
+            # Consume results to propagate exceptions
+            list(executor.map(extract_file, [name for name in names if 'link' not in self.entries[name]]))
+
+        for name in links:
+            path = prepare(name)
+            os.symlink(self.entries[name]['link'], path)
+
+            # Link target may pass through other links, e.g. to destination itself, and leave it with ..
+            if not inside(path):
+                os.unlink(path)
+                raise BundleError(f'{name} in {self.path} links outside of destination')
+
+        return names
+
+
+def bundle_path(name: str, bundles_path: Path = BUNDLES_PATH) -> Path:
+    return bundles_path / f'{name}{EXTENSION}'
+
+
+def pack_dependencies(names: typing.Sequence[str] = (), deps_path: Path = DEPS_PATH, bundles_path: Path = BUNDLES_PATH,
+                      codec_name: str = DEFAULT_CODEC) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+    names = names or sorted(path.name for path in deps_path.iterdir() if path.is_dir())
+    return {name: pack(deps_path / name, bundle_path(name, bundles_path), codec_name) for name in names}
+
+
+def restore(names: typing.Sequence[str] = (), patterns: typing.Sequence[str] = (), deps_path: Path = DEPS_PATH,
+            bundles_path: Path = BUNDLES_PATH) -> typing.Dict[str, typing.List[str]]:
+    names = names or sorted(path.name[:-len(EXTENSION)] for path in bundles_path.glob(f'*{EXTENSION}'))
+    return {name: Bundle(bundle_path(name, bundles_path)).extract(deps_path / name, patterns) for name in names}
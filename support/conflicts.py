@@ -0,0 +1,138 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import typing
+from pathlib import Path
+
+import aedi.target.base as base
+from aedi.state import BuildState
+
+from . import archive, hook, symbols
+from .symbols import Location
+
+OBJECT_PATTERNS = ('**/*.o', '**/*.a')
+
+
+class Conflict(typing.NamedTuple):
+    symbol: str
+    locations: typing.List[Location]
+
+    def __str__(self):
+        return f"{self.symbol}: {', '.join(str(location) for location in self.locations)}"
+
+
+def find(index: symbols.Index, arch: typing.Optional[str] = None, dependency: typing.Optional[str] = None,
+         same_dependency: bool = False) -> typing.List[Conflict]:
+    # Strong symbol defined in several libraries either fails the link, or silently resolves to one of them
+    # depending on libraries order, weak definitions are merged by linker and never conflict
+    result = {}
+
+    for current_arch in (arch,) if arch else index.architectures():
+        definitions = {}
+
+        for location, member_symbols in index.members(current_arch):
+            for symbol in member_symbols['defined']:
+                definitions.setdefault(symbol, []).append(location)
+
+        for symbol, locations in definitions.items():
+            if len({location.library for location in locations}) < 2:
+                continue
+
+            dependencies = {location.dependency for location in locations}
+
+            if len(dependencies) < 2 and not same_dependency:
+                continue
+            if dependency and dependency not in dependencies:
+                continue
+
+            _add(result, symbol, locations)
+
+    return [result[symbol] for symbol in sorted(result)]
+
+
+def find_in_objects(index: symbols.Index, paths: typing.Sequence[Path],
+                    arch: typing.Optional[str] = None) -> typing.List[Conflict]:
+    # Objects of main target are linked unconditionally, and they take precedence over archive members
+    # defining the same symbols, so dependency's own implementation may be replaced without any diagnostics
+    result = {}
+
+    for path, relpath in _object_files(paths):
+        try:
+            slices = symbols.parse(path)
+        except (archive.ArchiveError, ValueError):
+            # Not a Mach-O file, e.g. LLVM bitcode
+            continue
+
+        for current_arch, members in slices.items():
+            if arch and current_arch != arch:
+                continue
+
+            definitions = index.definitions(current_arch)
+
+            for member, member_symbols in members.items():
+                for symbol in member_symbols['defined']:
+                    if symbol in definitions:
+                        _add(result, symbol, [Location(relpath, member)] + definitions[symbol])
+
+    return [result[symbol] for symbol in sorted(result)]
+
+
+def _add(conflicts: typing.Dict[str, Conflict], symbol: str, locations: typing.List[Location]):
+    conflict = conflicts.setdefault(symbol, Conflict(symbol, []))
+
+    for location in locations:
+        if location not in conflict.locations:
+            conflict.locations.append(location)
+
+
+def _object_files(paths: typing.Sequence[Path]) -> typing.Iterator[typing.Tuple[Path, str]]:
+    for path in paths:
+        if path.is_dir():
+            for pattern in OBJECT_PATTERNS:
+                for object_path in sorted(path.glob(pattern)):
+                    if object_path.is_file() and not object_path.is_symlink():
+                        yield object_path, object_path.relative_to(path).as_posix()
+        else:
+            yield path, path.name
+
+
+def install(targets: typing.Sequence[base.Target]):
+    for target in targets:
+        if isinstance(target, (base.CMakeMainTarget, base.MakeMainTarget)):
+            hook.around(target, 'post_build', _post_build_main)
+        else:
+            hook.around(target, 'post_build', _post_build_dependency)
+
+
+def _post_build_dependency(target: base.Target, state: BuildState, original):
+    original(state)
+
+    # Only libraries of rebuilt dependency are parsed again, others are taken from index file
+    _check(find(symbols.load(), dependency=state.install_path.name))
+
+
+def _post_build_main(target: base.Target, state: BuildState, original):
+    original(state)
+
+    _check(find_in_objects(symbols.load(), (state.build_path,)))
+
+
+def _check(conflicts: typing.List[Conflict]):
+    if conflicts:
+        lines = '\n'.join(str(conflict) for conflict in conflicts)
+        raise RuntimeError(f'Symbols defined more than once:\n{lines}')
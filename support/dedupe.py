@@ -0,0 +1,122 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import os
+import shutil
+import stat
+import tempfile
+import typing
+from pathlib import Path
+
+from .digest import hash_files
+from .pkgconfig import DEPS_PATH, ROOT_PATH
+
+MANIFEST_PATH = ROOT_PATH / 'dedupe.json'
+
+
+def _files(root: Path) -> typing.List[Path]:
+    result = []
+
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = Path(directory) / filename
+
+            if not path.is_symlink() and path.stat().st_size:
+                result.append(path)
+
+    return sorted(result)
+
+
+def dedupe(deps_path: Path = DEPS_PATH, manifest_path: Path = MANIFEST_PATH) -> typing.List[typing.Tuple[str, str]]:
+    paths = _files(deps_path)
+    groups: typing.Dict[typing.Tuple[str, int], typing.List[Path]] = {}
+
+    # Hard links share permissions, so only files with the same mode are merged
+    for path, digest in hash_files(paths).items():
+        groups.setdefault((digest, stat.S_IMODE(path.stat().st_mode)), []).append(path)
+
+    links = _load(manifest_path)
+    new_links = []
+
+    for group in groups.values():
+        original = group[0]
+
+        for path in group[1:]:
+            if os.path.samefile(original, path):
+                continue
+
+            _replace(path, lambda temp_path: os.link(original, temp_path))
+
+            link = (path.relative_to(deps_path).as_posix(), original.relative_to(deps_path).as_posix())
+            new_links.append(link)
+            links[link[0]] = link[1]
+
+    if new_links:
+        _save(manifest_path, links)
+
+    return new_links
+
+
+def restore(deps_path: Path = DEPS_PATH, manifest_path: Path = MANIFEST_PATH) -> typing.List[str]:
+    links = _load(manifest_path)
+    restored = []
+
+    for relpath, original_relpath in sorted(links.items()):
+        path = deps_path / relpath
+        original = deps_path / original_relpath
+
+        # Files could be replaced or removed since deduplication, e.g. by rebuilding of dependency
+        if path.exists() and original.exists() and os.path.samefile(path, original):
+            _replace(path, lambda temp_path: shutil.copy2(original, temp_path))
+            restored.append(relpath)
+
+    if manifest_path.exists():
+        os.unlink(manifest_path)
+
+    return restored
+
+
+def _replace(path: Path, create: typing.Callable[[str], None]):
+    # New file is created next to the old one, and moved over it, so there is no moment without it
+    # Hard link cannot be created over existing file, so it is created in new private directory
+    temp_dir = tempfile.mkdtemp(dir=path.parent, prefix=f'.{path.name}.')
+
+    try:
+        temp_path = os.path.join(temp_dir, path.name)
+        create(temp_path)
+        os.replace(temp_path, path)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _load(manifest_path: Path) -> typing.Dict[str, str]:
+    if not manifest_path.exists():
+        return {}
+
+    with open(manifest_path) as f:
+        return json.load(f)
+
+
+def _save(manifest_path: Path, links: typing.Dict[str, str]):
+    temp_path = manifest_path.with_suffix('.tmp')
+
+    with open(temp_path, 'w') as f:
+        json.dump(links, f, indent=4, sort_keys=True)
+
+    os.replace(temp_path, manifest_path)
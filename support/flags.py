@@ -0,0 +1,32 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import typing
+
+# Environment variables with compiler flags, linker flags are handled separately because not every feature needs them
+COMPILER_VARIABLES = ('CFLAGS', 'CXXFLAGS', 'OBJCFLAGS', 'OBJCXXFLAGS')
+
+
+def join(flags: typing.Optional[str], extra: str) -> str:
+    return f'{flags} {extra}' if flags else extra
+
+
+def append(environment: typing.MutableMapping[str, str], extra: str,
+           names: typing.Sequence[str] = COMPILER_VARIABLES):
+    for name in names:
+        environment[name] = join(environment.get(name), extra)
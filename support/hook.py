@@ -0,0 +1,35 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import typing
+
+import aedi.target.base as base
+from aedi.state import BuildState
+
+StageHandler = typing.Callable[[base.Target, BuildState, typing.Callable[[BuildState], typing.Any]], typing.Any]
+
+
+def around(target: base.Target, stage: str, handler: StageHandler):
+    # Replace build stage method of target instance, e.g. configure() or post_build(),
+    # with handler that receives the original method and decides when (and whether) to call it
+    original = getattr(target, stage)
+
+    def wrapper(state: BuildState):
+        return handler(target, state, original)
+
+    setattr(target, stage, wrapper)
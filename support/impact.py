@@ -0,0 +1,160 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import ast
+import re
+import subprocess
+import typing
+from pathlib import Path
+
+from .pkgconfig import DEPS_PATH, ROOT_PATH
+from .tests import Runner
+
+LIBRARY_TARGETS_PATH = ROOT_PATH / 'target' / 'library.py'
+PATCH_DIRECTORY = 'patch'
+
+
+class Change(typing.NamedTuple):
+    # Names of changed dependencies, and paths of changed files relative to repository root
+    dependencies: typing.Set[str]
+    paths: typing.Set[str]
+
+
+def from_git(since: str, root_path: Path = ROOT_PATH) -> Change:
+    # Working tree is compared with given revision, so uncommitted changes are included
+    paths = set(_git(root_path, 'diff', '--name-only', since, '--').split())
+    dependencies = set()
+
+    for path in paths:
+        parts = Path(path).parts
+
+        if parts[0] == DEPS_PATH.name and len(parts) > 1:
+            dependencies.add(parts[1])
+
+    library_path = LIBRARY_TARGETS_PATH.relative_to(root_path).as_posix()
+
+    if library_path in paths:
+        diff = _git(root_path, 'diff', '--unified=0', since, '--', library_path)
+        dependencies.update(_changed_targets(LIBRARY_TARGETS_PATH.read_text(), _changed_lines(diff)))
+
+    patches = {Path(path).parts[1].split('.')[0] for path in paths
+               if Path(path).parts[0] == PATCH_DIRECTORY and len(Path(path).parts) > 1}
+
+    if patches:
+        dependencies.update(_patched_targets(LIBRARY_TARGETS_PATH.read_text(), patches))
+
+    return Change(dependencies, paths)
+
+
+def dependencies(flags: typing.Sequence[str], deps_path: Path = DEPS_PATH) -> typing.Set[str]:
+    # Linked archives, and header-only dependencies like vulkan-headers found by include paths
+    paths = Runner.linked_archives(flags) + [Path(flag[2:]).resolve() for flag in flags if flag.startswith('-I')]
+    result = set()
+
+    for path in paths:
+        try:
+            result.add(path.relative_to(deps_path.resolve()).parts[0])
+        except ValueError:
+            pass
+
+    return result
+
+
+def select(names: typing.Sequence[str], source_path: Path, prelude_path: Path,
+           flags: typing.Callable[[str], typing.Sequence[str]], change: Change,
+           deps_path: Path = DEPS_PATH) -> typing.List[str]:
+    # Program is affected when its link closure or include paths have changed dependency, or when its own source changes,
+    # changes of shared files like prelude header affect all programs
+    relative_source_path = source_path.relative_to(ROOT_PATH).as_posix()
+    changed_sources = [path[len(relative_source_path) + 1:] for path in change.paths
+                       if path.startswith(relative_source_path + '/')]
+
+    if prelude_path.relative_to(ROOT_PATH).as_posix() in change.paths \
+            or any('/' not in path and not path.endswith('.cpp') for path in changed_sources):
+        return list(names)
+
+    changed_names = {path[:-4] for path in changed_sources if '/' not in path and path.endswith('.cpp')}
+
+    return [name for name in names
+            if name in changed_names or dependencies(flags(name), deps_path) & change.dependencies]
+
+
+def _git(root_path: Path, *args: str) -> str:
+    return subprocess.run(('git', *args), cwd=root_path, check=True, capture_output=True, text=True).stdout
+
+
+def _changed_lines(diff: str) -> typing.Set[int]:
+    # Line numbers of current file, deleted lines are attributed to line they were removed at
+    result = set()
+
+    for match in re.finditer(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@', diff, re.MULTILINE):
+        start, count = int(match.group(1)), int(match.group(2) or 1)
+        result.update(range(start, start + count) if count else (start,))
+
+    return result
+
+
+def target_classes(source: str) -> typing.Tuple[typing.Dict[str, ast.ClassDef], typing.Dict[str, str]]:
+    classes = {}
+    names = {}
+
+    for node in ast.parse(source).body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+
+        classes[node.name] = node
+
+        # Target name is the default value of name argument of constructor
+        for item in node.body:
+            if isinstance(item, ast.FunctionDef) and item.name == '__init__' and item.args.defaults:
+                default = item.args.defaults[-1]
+
+                if isinstance(default, ast.Constant) and isinstance(default.value, str):
+                    names[node.name] = default.value
+
+    return classes, names
+
+
+def _changed_targets(source: str, lines: typing.Set[int]) -> typing.Set[str]:
+    classes, names = target_classes(source)
+    changed = {name for name, node in classes.items() if any(node.lineno <= line <= node.end_lineno for line in lines)}
+
+    return _derived_targets(classes, names, changed)
+
+
+def _patched_targets(source: str, patches: typing.Set[str]) -> typing.Set[str]:
+    classes, names = target_classes(source)
+    changed = {name for name, node in classes.items()
+               if {child.value for child in ast.walk(node) if isinstance(child, ast.Constant)} & patches}
+
+    return _derived_targets(classes, names, changed)
+
+
+def _derived_targets(classes: typing.Dict[str, ast.ClassDef], names: typing.Dict[str, str],
+                     changed: typing.Set[str]) -> typing.Set[str]:
+    # Changes of base class affect all targets derived from it
+    while True:
+        derived = {name for name, node in classes.items() if name not in changed
+                   and any(isinstance(base, ast.Name) and base.id in changed for base in node.bases)}
+
+        if not derived:
+            break
+
+        changed |= derived
+
+    return {names[name] for name in changed if name in names}
@@ -0,0 +1,174 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import os
+import subprocess
+import typing
+from pathlib import Path
+
+from .digest import hash_files
+from .pkgconfig import DEPS_PATH, ROOT_PATH
+
+# Manifest with sizes and hashes is committed, so fresh clones have a reference to verify against,
+# modification times differ between checkouts, they are kept in local cache to skip hashing of intact files
+MANIFEST_PATH = ROOT_PATH / 'integrity.json'
+CACHE_PATH = ROOT_PATH / 'integrity-cache.json'
+
+Entries = typing.Dict[str, typing.Dict[str, typing.Any]]
+
+
+def _scan(deps_path: Path) -> typing.Dict[str, typing.Tuple[Path, os.stat_result]]:
+    result = {}
+
+    for relpath in _list(deps_path):
+        path = deps_path / relpath
+
+        # Tracked file may be deleted in working tree
+        if os.path.lexists(path):
+            result[relpath] = (path, path.lstat())
+
+    return result
+
+
+def _list(deps_path: Path) -> typing.List[str]:
+    # Files ignored by git, e.g. documentation or libtool archives installed by local build, are not part of dependencies
+    try:
+        args = ('git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard')
+        output = subprocess.run(args, cwd=deps_path, check=True, capture_output=True, text=True).stdout
+        return sorted(set(relpath for relpath in output.split('\0') if relpath))
+    except (OSError, subprocess.CalledProcessError):
+        pass
+
+    result = []
+
+    for directory, _, filenames in os.walk(deps_path):
+        for filename in filenames:
+            result.append((Path(directory) / filename).relative_to(deps_path).as_posix())
+
+    return sorted(result)
+
+
+def _entry(path: Path, path_stat: os.stat_result, digest: str) -> typing.Dict[str, typing.Any]:
+    if path.is_symlink():
+        return {'link': os.readlink(path)}
+
+    return {'size': path_stat.st_size, 'sha256': digest}
+
+
+def _cached_digest(cache: Entries, relpath: str, path_stat: os.stat_result) -> str:
+    entry = cache.get(relpath, {})
+    unchanged = entry.get('size') == path_stat.st_size and entry.get('mtime') == path_stat.st_mtime_ns
+    return entry.get('sha256', '') if unchanged else ''
+
+
+def _hash(files: typing.Dict[str, typing.Tuple[Path, os.stat_result]], relpaths: typing.Iterable[str],
+          cache_path: Path) -> typing.Tuple[typing.Dict[str, str], int]:
+    cache = _load(cache_path)
+    digests = {}
+    to_hash = []
+
+    # Only new files and files with different size or modification time are hashed
+    for relpath in relpaths:
+        path, path_stat = files[relpath]
+
+        if path.is_symlink():
+            continue
+
+        digest = _cached_digest(cache, relpath, path_stat)
+
+        if digest:
+            digests[relpath] = digest
+        else:
+            to_hash.append(relpath)
+
+    hashed = hash_files([files[relpath][0] for relpath in to_hash])
+
+    for relpath in to_hash:
+        path, path_stat = files[relpath]
+        digests[relpath] = hashed[path]
+        cache[relpath] = {'size': path_stat.st_size, 'mtime': path_stat.st_mtime_ns, 'sha256': hashed[path]}
+
+    if to_hash:
+        _save(cache_path, {relpath: entry for relpath, entry in cache.items() if relpath in files})
+
+    return digests, len(to_hash)
+
+
+def update(deps_path: Path = DEPS_PATH, manifest_path: Path = MANIFEST_PATH, cache_path: Path = CACHE_PATH) -> int:
+    files = _scan(deps_path)
+    digests, count = _hash(files, files.keys(), cache_path)
+    entries = {relpath: _entry(path, path_stat, digests.get(relpath, ''))
+               for relpath, (path, path_stat) in files.items()}
+
+    _save(manifest_path, entries)
+
+    return count
+
+
+def verify(deps_path: Path = DEPS_PATH, manifest_path: Path = MANIFEST_PATH,
+           cache_path: Path = CACHE_PATH) -> typing.List[str]:
+    entries = _load(manifest_path)
+    files = _scan(deps_path)
+    problems = []
+    to_check = []
+
+    for relpath in sorted(entries.keys() - files.keys()):
+        problems.append(f'Missing file {relpath}')
+
+    for relpath in sorted(files.keys() - entries.keys()):
+        problems.append(f'Unexpected file {relpath}')
+
+    for relpath in sorted(entries.keys() & files.keys()):
+        entry = entries[relpath]
+        path, path_stat = files[relpath]
+
+        if 'link' in entry or path.is_symlink():
+            if entry.get('link') != (os.readlink(path) if path.is_symlink() else None):
+                problems.append(f'Modified symbolic link {relpath}')
+        elif entry['size'] != path_stat.st_size:
+            problems.append(f'Modified file {relpath}, size is {path_stat.st_size} instead of {entry["size"]}')
+        else:
+            to_check.append(relpath)
+
+    # Hash from cache is reused only for file with the same size and modification time, it is compared with manifest too
+    digests, _ = _hash(files, to_check, cache_path)
+
+    for relpath in to_check:
+        if digests[relpath] != entries[relpath]['sha256']:
+            problems.append(f'Modified file {relpath}, content differs')
+
+    return problems
+
+
+def _load(path: Path) -> Entries:
+    if not path.exists():
+        return {}
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save(path: Path, entries: Entries):
+    temp_path = path.with_suffix('.tmp')
+
+    with open(temp_path, 'w') as f:
+        json.dump(entries, f, indent=1, sort_keys=True)
+        f.write('\n')
+
+    os.replace(temp_path, path)
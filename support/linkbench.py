@@ -0,0 +1,226 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import ast
+import json
+import os
+import platform
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+import typing
+from pathlib import Path
+
+from . import archive, impact, linkline, pkgconfig, symbols
+from .pkgconfig import DEPS_PATH, ROOT_PATH
+
+OUTPUT_PATH = ROOT_PATH / 'build' / 'link'
+HISTORY_PATH = ROOT_PATH / 'link-history.jsonl'
+
+MAIN_TARGETS_PATH = ROOT_PATH / 'target' / 'main.py'
+
+# Libraries found by build systems of engines themselves, packages that targets query with run_pkg_config()
+# in their configure() methods are added to them
+ENGINE_PACKAGES = {
+    'chocolate-doom': ('SDL2_net', 'samplerate', 'libpng16'),
+    'crispy-doom': ('SDL2_net', 'samplerate', 'libpng16'),
+    'devilutionx': ('sdl2', 'fmt', 'libsodium', 'bzip2', 'zlib', 'libpng16'),
+    'doom64ex': ('libpng16', 'zlib'),
+    'doomretro': ('sdl2', 'SDL2_mixer', 'SDL2_image'),
+    'dsda-doom': ('fluidsynth', 'mad', 'vorbisfile', 'libxmp', 'sndfile', 'zlib'),
+    'eduke32': ('sdl2', 'flac', 'vorbisfile'),
+    'nblood': ('sdl2', 'flac', 'vorbisfile'),
+    'prboom-plus': ('fluidsynth', 'mad', 'vorbisfile', 'zlib'),
+    'q2pro': ('sdl2', 'libpng16', 'zlib'),
+    'quakespasm': ('sdl2', 'flac', 'opusfile', 'vorbisfile', 'libmikmod', 'mad'),
+    'quakespasm-exp': ('vorbisfile', 'flac', 'opusfile', 'libxmp', 'mad'),
+    'rude': ('SDL2_net', 'samplerate', 'libpng16'),
+    'woof': ('sdl2', 'SDL2_net', 'sndfile', 'fluidsynth', 'libxmp'),
+}
+
+
+class LinkError(Exception):
+    pass
+
+
+class Result(typing.NamedTuple):
+    target: str
+    arch: str
+    # Median wall time and peak resident memory of linker invocations
+    seconds: float
+    peak_memory: int
+    size: int
+    sections: typing.Dict[str, int]
+    dylibs: typing.List[str]
+    referenced_symbols: int
+
+    def __str__(self):
+        text = self.sections.get('__TEXT,__text', 0)
+        return f'{self.target} ({self.arch}): {self.seconds:.2f} s, {self.peak_memory / 2 ** 20:.1f} MB peak, ' \
+            f'binary {self.size:,} bytes, text {text:,} bytes, {len(self.dylibs)} dylibs'
+
+
+class Harness:
+    def __init__(self, output_path: Path = OUTPUT_PATH, deps_path: Path = DEPS_PATH,
+                 compiler: typing.Optional[str] = None, arch: typing.Optional[str] = None, repetitions: int = 3):
+        self.output_path = output_path
+        self.deps_path = deps_path
+        self.compiler = compiler or os.environ.get('CXX', 'clang++')
+        self.arch = arch or platform.machine()
+        self.repetitions = repetitions
+        self.pkg_config = pkgconfig.instance(deps_path)
+        self._index: typing.Optional[symbols.Index] = None
+
+    def run(self, target: str) -> Result:
+        packages = link_sets()[target]
+        stub_path = self.output_path / target / 'stub.o'
+        referenced_symbols = self._compile_stub(packages, stub_path)
+
+        executable = stub_path.with_suffix('')
+        link_flags = shlex.split(self.pkg_config.run('--libs', '--static', *packages))
+        args = [self.compiler, '-arch', self.arch, str(stub_path), *link_flags, '-o', str(executable)]
+        timings = [_measure(args) for _ in range(self.repetitions)]
+
+        obj = archive.parse_object(archive.slices(executable.read_bytes())[self.arch])
+        sections = {}
+
+        for section in obj.sections:
+            key = f'{section.segment},{section.name}'
+            sections[key] = sections.get(key, 0) + section.size
+
+        return Result(target, self.arch, statistics.median(seconds for seconds, _ in timings),
+                      max(memory for _, memory in timings), executable.stat().st_size, sections, obj.dylibs,
+                      referenced_symbols)
+
+    def _compile_stub(self, packages: typing.Sequence[str], stub_path: Path) -> int:
+        # Engine may call any function of libraries it links directly, so stub references all their definitions,
+        # libraries of their dependencies are pulled in only as far as these definitions require
+        # Engine calls only some of these functions, hence link time, memory and binary size are upper bounds
+        if self._index is None:
+            self._index = symbols.load(self.deps_path)
+
+        libraries = set()
+
+        for flag in shlex.split(self.pkg_config.run('--libs', *packages)):
+            if flag.startswith('-l'):
+                library = linkline.find_library(flag, self.deps_path)
+
+                if library:
+                    libraries.add(library)
+
+        names = sorted(symbol for symbol, locations in self._index.definitions(self.arch).items()
+                       if any(location.library in libraries for location in locations))
+
+        if not names:
+            raise LinkError(f'No symbols to reference in libraries of {", ".join(packages)}')
+
+        lines = [f'extern char aedi_symbol_{i}[] __asm__("{name}");\n' for i, name in enumerate(names)]
+        lines.append('void* volatile aedi_symbols[] =\n{\n')
+        lines += [f'    aedi_symbol_{i},\n' for i in range(len(names))]
+        lines.append('};\n\nint main()\n{\n    return 0;\n}\n')
+
+        os.makedirs(stub_path.parent, exist_ok=True)
+        source_path = stub_path.with_suffix('.c')
+        source_path.write_text(''.join(lines))
+
+        args = [self.compiler, '-x', 'c', '-arch', self.arch, '-c', str(source_path), '-o', str(stub_path)]
+        process = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+        if process.returncode:
+            raise LinkError(process.stdout)
+
+        return len(names)
+
+
+def link_sets(source_path: Path = MAIN_TARGETS_PATH) -> typing.Dict[str, typing.Tuple[str, ...]]:
+    # Packages that main targets link are taken from their definitions, base classes included
+    classes, names = impact.target_classes(source_path.read_text())
+    queried = {name: [child.value for call in ast.walk(node) if _is_pkg_config_call(call)
+                      for child in call.args if isinstance(child, ast.Constant) and isinstance(child.value, str)
+                      and not child.value.startswith('-')]
+               for name, node in classes.items()}
+
+    def packages(class_name: str) -> typing.List[str]:
+        result = []
+
+        for base in classes[class_name].bases:
+            if isinstance(base, ast.Name) and base.id in classes:
+                result += packages(base.id)
+
+        return result + queried[class_name]
+
+    result = {}
+
+    for class_name, target in names.items():
+        target_packages = packages(class_name) + list(ENGINE_PACKAGES.get(target, ()))
+        result[target] = tuple(dict.fromkeys(target_packages))
+
+    return result
+
+
+def targets() -> typing.List[str]:
+    return sorted(link_sets())
+
+
+def load_history(history_path: Path = HISTORY_PATH) -> typing.List[typing.Dict[str, typing.Any]]:
+    if not history_path.exists():
+        return []
+
+    with open(history_path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def previous(history: typing.Sequence[typing.Dict[str, typing.Any]], result: Result) \
+        -> typing.Optional[typing.Dict[str, typing.Any]]:
+    return next((entry for entry in reversed(history)
+                 if entry['target'] == result.target and entry['arch'] == result.arch), None)
+
+
+def record(results: typing.Sequence[Result], history_path: Path = HISTORY_PATH):
+    # Every run appends its results, so trends are visible across dependency updates
+    timestamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+    commit = subprocess.run(('git', 'rev-parse', '--short', 'HEAD'), cwd=ROOT_PATH, capture_output=True,
+                            text=True).stdout.strip()
+
+    with open(history_path, 'a') as f:
+        for result in results:
+            f.write(json.dumps({'time': timestamp, 'commit': commit, **result._asdict()}, sort_keys=True) + '\n')
+
+
+def _is_pkg_config_call(node: ast.AST) -> bool:
+    return isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'run_pkg_config'
+
+
+def _measure(args: typing.Sequence[str]) -> typing.Tuple[float, int]:
+    # Resource usage of waited process includes linker launched by compiler driver
+    start = time.monotonic()
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = process.stdout.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    seconds = time.monotonic() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    if process.returncode:
+        raise LinkError(output.decode('utf-8', errors='replace'))
+
+    # Peak resident size is in bytes on macOS, and in kilobytes elsewhere
+    peak_memory = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+
+    return seconds, peak_memory
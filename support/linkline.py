@@ -0,0 +1,266 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import re
+import shlex
+import typing
+from pathlib import Path
+
+from . import pkgconfig, symbols
+from .symbols import Location
+
+# Symbols of system libraries and frameworks, which are not available for inspection in pure Python,
+# are recognized by their names, first matching pattern wins, everything else is assumed to come from libSystem
+SYSTEM_SYMBOLS = (
+    (r'___cxa_(atexit|finalize)$', ''),
+    (r'(__Z|___cxa_|___gxx_personality_)', '-lc++'),
+    (r'_(lib)?iconv', '-liconv'),
+    (r'_objc_', '-lobjc'),
+    (r'(_kCF|_CF|___CFConstantStringClassReference)', '-framework CoreFoundation'),
+    (r'_k?CGImageSource', '-framework ImageIO'),
+    (r'_k?CG', '-framework CoreGraphics'),
+    (r'_k?MIDI', '-framework CoreMIDI'),
+    (r'_Audio(Object|Device|Hardware|GetCurrentHostTime|GetHostClockFrequency|Convert)', '-framework CoreAudio'),
+    (r'_(Audio|AU|NewMusic|DisposeMusic|Music|kAudio|ExtAudio)', '-framework AudioToolbox'),
+    (r'_(k?UT|FS|UC|LS|kLS)', '-framework CoreServices'),
+    (r'_(k?IO|kIO)', '-framework IOKit'),
+    (r'_OBJC_(CLASS|METACLASS)_\$_NS(Application|Window|View|Event|Screen|Image|Color|Cursor|Menu|Alert|Workspace'
+     r'|OpenGL|Pasteboard|GraphicsContext|BitmapImageRep|Button|TextField|OpenPanel|SavePanel)', '-framework AppKit'),
+    (r'(_OBJC_(CLASS|METACLASS)_\$_NS|_NS)', '-framework Foundation'),
+)
+SYSTEM_PATTERNS = tuple((re.compile(pattern), flag) for pattern, flag in SYSTEM_SYMBOLS)
+
+
+class LinkLine:
+    def __init__(self):
+        # Archives paths relative to deps directory, every library precedes libraries it depends on
+        self.libraries: typing.List[str] = []
+        self.system: typing.List[str] = []
+        # Archives that depend on each other, order inside such group cannot satisfy single pass linkers
+        self.cycles: typing.List[typing.List[str]] = []
+        # Symbols not defined in dependencies, and assumed to be provided by libSystem
+        self.external: typing.Dict[str, typing.Set[str]] = {}
+
+    def flags(self) -> typing.List[str]:
+        return [library_flag(library) for library in self.libraries] + self.system
+
+
+def library_flag(library: str) -> str:
+    name = Path(library).name
+    return f'-l{name[3:-2]}' if name.startswith('lib') and name.endswith('.a') else library
+
+
+def find_library(name: str, deps_path: Path = pkgconfig.DEPS_PATH) -> typing.Optional[str]:
+    # Library can be given by its name like FLAC, -lFLAC, libFLAC.a, or by path relative to deps directory
+    if name.startswith('-l'):
+        name = name[2:]
+
+    candidates = [deps_path / name] if '/' in name else []
+    candidates += sorted(deps_path.glob(f'*/lib/{name}')) + sorted(deps_path.glob(f'*/lib/lib{name}.a'))
+
+    for path in candidates:
+        if path.is_file():
+            # Symbolic links like libpng.a -> libpng16.a are not indexed
+            return path.resolve().relative_to(deps_path.resolve()).as_posix()
+
+    return None
+
+
+def resolve(index: symbols.Index, roots: typing.Sequence[str], arch: typing.Optional[str] = None) -> LinkLine:
+    result = LinkLine()
+    edges: typing.Dict[str, typing.Set[str]] = {root: set() for root in roots}
+    system = {}
+
+    for current_arch in (arch,) if arch else index.architectures():
+        _resolve_arch(index, roots, current_arch, edges, system, result.external)
+
+    result.libraries, result.cycles = _order(roots, edges)
+    result.system = sorted(system, key=lambda flag: (flag.startswith('-framework'), flag))
+
+    return result
+
+
+def _resolve_arch(index: symbols.Index, roots: typing.Sequence[str], arch: str,
+                  edges: typing.Dict[str, typing.Set[str]], system: typing.Dict[str, None],
+                  external: typing.Dict[str, typing.Set[str]]):
+    members = dict(index.members(arch))
+    definitions = index.definitions(arch)
+    common = {}
+
+    for location, member_symbols in members.items():
+        for symbol in member_symbols['common']:
+            common.setdefault(symbol, []).append(location)
+
+    # All members of root libraries are linked, other members only when they define referenced symbols,
+    # like linker does when it searches static libraries
+    queue = [location for location in members if location.library in roots]
+    selected = set(queue)
+    provided = {}
+
+    for location in queue:
+        for symbol in members[location]['defined'] + members[location]['weak']:
+            provided.setdefault(symbol, location)
+
+    while queue:
+        location = queue.pop(0)
+        member_symbols = members[location]
+
+        for options in member_symbols['linker_options']:
+            system[' '.join(options)] = None
+
+        for symbol in member_symbols['undefined']:
+            candidates = definitions.get(symbol) or common.get(symbol)
+            provider = provided.get(symbol) or _choose(candidates, location, selected)
+
+            if not provider:
+                flag = _system_flag(symbol)
+
+                if flag:
+                    system[flag] = None
+                elif flag is None:
+                    external.setdefault(symbol, set()).add(location.library)
+
+                continue
+
+            if provider.library != location.library:
+                edges.setdefault(location.library, set()).add(provider.library)
+
+            if provider not in selected:
+                selected.add(provider)
+                queue.append(provider)
+                edges.setdefault(provider.library, set())
+
+                for defined in members[provider]['defined'] + members[provider]['weak']:
+                    provided.setdefault(defined, provider)
+
+
+def _choose(candidates: typing.Optional[typing.List[Location]], location: Location,
+            selected: typing.Set[Location]) -> typing.Optional[Location]:
+    if not candidates:
+        return None
+
+    # Prefer libraries that are linked already, then libraries of the same dependency
+    selected_libraries = {candidate.library for candidate in selected}
+
+    for candidate in candidates:
+        if candidate.library in selected_libraries:
+            return candidate
+
+    for candidate in candidates:
+        if candidate.dependency == location.dependency:
+            return candidate
+
+    return candidates[0]
+
+
+def _system_flag(symbol: str) -> typing.Optional[str]:
+    for pattern, flag in SYSTEM_PATTERNS:
+        if pattern.match(symbol):
+            return flag
+
+    return None
+
+
+def _order(roots: typing.Sequence[str], edges: typing.Dict[str, typing.Set[str]]) \
+        -> typing.Tuple[typing.List[str], typing.List[typing.List[str]]]:
+    # Tarjan's algorithm emits strongly connected components with dependencies first
+    indices, low_links, stack, on_stack = {}, {}, [], set()
+    components = []
+
+    def visit(node: str):
+        indices[node] = low_links[node] = len(indices)
+        stack.append(node)
+        on_stack.add(node)
+
+        for successor in sorted(edges.get(node, ())):
+            if successor not in indices:
+                visit(successor)
+                low_links[node] = min(low_links[node], low_links[successor])
+            elif successor in on_stack:
+                low_links[node] = min(low_links[node], indices[successor])
+
+        if low_links[node] == indices[node]:
+            component = []
+
+            while True:
+                member = stack.pop()
+                on_stack.remove(member)
+                component.append(member)
+
+                if member == node:
+                    break
+
+            components.append(sorted(component))
+
+    for node in list(roots) + sorted(edges):
+        if node not in indices:
+            visit(node)
+
+    components.reverse()
+    libraries = [library for component in components for library in component]
+    cycles = [component for component in components if len(component) > 1]
+
+    return libraries, cycles
+
+
+def libs_private(index: symbols.Index, package_name: str, pkg_config: typing.Optional[pkgconfig.PkgConfig] = None,
+                 arch: typing.Optional[str] = None) -> str:
+    # Private libraries are ones needed for static linking, except package's own libraries,
+    # and libraries provided by required packages
+    pkg_config = pkg_config or pkgconfig.instance()
+    package = pkg_config.package(package_name)
+    deps_path = package.path.parent.parent.parent.parent
+
+    own_flags = _split_flags(' '.join(str(fragment) for fragment in package.libs))
+    roots = [find_library(flag, deps_path) for flag in own_flags if flag.startswith('-l')]
+    roots = [root for root in roots if root]
+
+    required = [str(dependency.name) for dependency in package.requires + package.requires_private]
+    provided = set(own_flags)
+
+    if required:
+        provided.update(_split_flags(pkg_config.run('--static', '--libs', *required)))
+
+    line = resolve(index, roots, arch)
+    flags = [flag for flag in line.flags() if flag not in provided]
+
+    return ' '.join(flags)
+
+
+def _split_flags(flags: str) -> typing.List[str]:
+    # Normalize linker flags to -lname and '-framework Name' forms
+    result = []
+    tokens = shlex.split(flags)
+    i = 0
+
+    while i < len(tokens):
+        token = tokens[i]
+
+        if token.startswith('-Wl,'):
+            parts = token[4:].split(',')
+            result += [f'{parts[j]} {parts[j + 1]}' for j in range(0, len(parts) - 1, 2)
+                       if parts[j].endswith('framework')]
+        elif token in ('-framework', '-weak_framework') and i + 1 < len(tokens):
+            result.append(f'{token} {tokens[i + 1]}')
+            i += 1
+        else:
+            result.append(token)
+
+        i += 1
+
+    return [flag.replace('-weak_framework ', '-framework ') for flag in result]
@@ -0,0 +1,174 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import tempfile
+import typing
+from pathlib import Path
+
+import aedi.target.base as base
+from aedi.state import BuildState
+
+from . import archive, flags, hook, metadata
+
+LTO_FLAG = '-flto=thin'
+SUBDIRECTORY = 'thinlto'
+# Options that select target, slices of fat archives are compiled for their own architecture instead of them,
+# and other options that affect machine code generated from bitcode
+TARGET_OPTIONS = ('-arch', '-target')
+CODEGEN_FLAG_PATTERN = re.compile(r'(-m(?!llvm$)|-O[0-9gsz]?$|-f(no-)?(function-sections|data-sections|omit-frame-pointer)$)')
+
+
+def install(targets: typing.Sequence[base.Target]):
+    for target in targets:
+        if isinstance(target, (base.CMakeMainTarget, base.MakeMainTarget)):
+            hook.around(target, 'configure', _configure_main)
+        else:
+            hook.around(target, 'configure', _configure_dependency)
+            hook.around(target, 'post_build', _post_build_dependency)
+
+
+def _configure_dependency(target: base.Target, state: BuildState, original):
+    flags.append(state.environment, LTO_FLAG, (*flags.COMPILER_VARIABLES, 'LDFLAGS'))
+    original(state)
+
+
+def _configure_main(target: base.Target, state: BuildState, original):
+    # Put directory with bitcode archives in front of regular ones, linker performs LTO on them automatically
+    search_path = f'-L{state.lib_path / SUBDIRECTORY}'
+
+    if isinstance(target, base.CMakeMainTarget):
+        opts = state.options
+        linker_flags = opts.get('CMAKE_EXE_LINKER_FLAGS', '')
+        opts['CMAKE_EXE_LINKER_FLAGS'] = f'{search_path} {linker_flags}' if linker_flags else search_path
+    else:
+        env = state.environment
+        ldflags = env.get('LDFLAGS')
+        env['LDFLAGS'] = f'{search_path} {ldflags}' if ldflags else search_path
+
+    original(state)
+
+
+def _post_build_dependency(target: base.Target, state: BuildState, original):
+    original(state)
+
+    lib_path = state.install_path / 'lib'
+    archives = [path for path in lib_path.glob('*.a') if not path.is_symlink()] if lib_path.exists() else []
+
+    if not archives:
+        return
+
+    lto_path = lib_path / SUBDIRECTORY
+    os.makedirs(lto_path, exist_ok=True)
+
+    for path in archives:
+        lto_archive = lto_path / path.name
+        shutil.move(str(path), lto_archive)
+        _make_native_archive(state, lto_archive, path)
+
+    # Mirror symbolic links like libpng.a -> libpng16.a
+    for link in lib_path.glob('*.a'):
+        if link.is_symlink():
+            lto_link = lto_path / link.name
+
+            if not lto_link.exists():
+                os.symlink(os.readlink(link), lto_link)
+
+    metadata.update(state.install_path, thin_lto=sorted(path.name for path in archives))
+
+
+def _make_native_archive(state: BuildState, lto_archive: Path, native_archive: Path):
+    # Bitcode objects are compiled to machine code member by member,
+    # so both archives come from the same build and contain the same code
+    target_flags, codegen_flags = _codegen_flags(state.environment)
+    data = lto_archive.read_bytes()
+    fat = archive.fat_slices(data)
+
+    with tempfile.TemporaryDirectory() as temp_path:
+        if fat is None:
+            output = _native_members(state, memoryview(data), target_flags + codegen_flags, Path(temp_path))
+        else:
+            # Every slice is compiled for its own architecture
+            fat = [archive.FatSlice(fat_slice.cpu_type, fat_slice.cpu_subtype, fat_slice.align,
+                                    _native_members(state, fat_slice.data, ['-arch', fat_slice.arch] + codegen_flags,
+                                                    Path(temp_path)))
+                   for fat_slice in fat]
+            output = archive.write_fat(fat)
+
+    native_archive.write_bytes(output)
+
+
+def _codegen_flags(environment: typing.Mapping[str, str]) -> typing.Tuple[typing.List[str], typing.List[str]]:
+    # Lowering of bitcode does not depend on source language, members may come from C or C++ sources,
+    # so only options that affect code generation are taken from flags of both languages
+    target_options = []
+    codegen_flags = []
+
+    for name in ('CFLAGS', 'CXXFLAGS'):
+        args = iter(shlex.split(environment.get(name, '')))
+
+        for arg in args:
+            if arg in TARGET_OPTIONS or arg.startswith('--target='):
+                option = (arg, next(args, '')) if arg in TARGET_OPTIONS else (arg,)
+
+                if option not in target_options:
+                    target_options.append(option)
+            elif CODEGEN_FLAG_PATTERN.match(arg) and arg not in codegen_flags:
+                codegen_flags.append(arg)
+
+    return [arg for option in target_options for arg in option], codegen_flags
+
+
+def _native_members(state: BuildState, data: memoryview, compiler_flags: typing.List[str],
+                    temp_path: Path) -> bytes:
+    archive_members = []
+    symbols = {}
+
+    for member in archive.members(data):
+        if member.name in archive.SYMDEF_NAMES:
+            continue
+
+        member_data = bytes(member.data)
+
+        # Assembly and other native objects are not compiled with LTO, they are copied unchanged
+        if archive.is_bitcode(member.data):
+            # Members are not extracted by their names, archive may contain several members with the same name
+            bitcode_path = temp_path / f'{len(archive_members)}.bc'
+            object_path = bitcode_path.with_suffix('.o')
+            bitcode_path.write_bytes(member_data)
+
+            args = ['clang', '-c', '-x', 'ir'] + compiler_flags + [bitcode_path, '-o', object_path]
+            subprocess.run(args, check=True, env=state.environment)
+            member_data = object_path.read_bytes()
+
+        try:
+            obj = archive.parse_object(memoryview(member_data))
+        except archive.ArchiveError:
+            obj = None
+
+        if obj:
+            for symbol in obj.defined + obj.weak:
+                symbols.setdefault(symbol, len(archive_members))
+
+        archive_members.append((member.name, member_data))
+
+    return archive.write_archive(archive_members, list(symbols.items()))
@@ -0,0 +1,217 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import math
+import os
+import shutil
+import subprocess
+import sys
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import aedi.target.base as base
+from aedi.state import BuildState
+
+from . import bench, flags, hook, metadata, profile
+from .pkgconfig import DEPS_PATH, ROOT_PATH
+
+MATRIX_PATH = ROOT_PATH / 'build' / 'matrix'
+BUILD_SCRIPT = ROOT_PATH / 'build.py'
+DEFAULT_VARIANT = 'default'
+
+
+class Variant(typing.NamedTuple):
+    options: typing.Dict[str, str] = {}
+    cflags: str = ''
+    # Name of optimization profile, it sets build type of CMake and Meson targets in addition to compiler flags
+    profile: str = ''
+
+
+class Matrix(typing.NamedTuple):
+    benchmarks: typing.Tuple[str, ...]
+    variants: typing.Dict[str, Variant]
+
+
+class Ranking(typing.NamedTuple):
+    variant: str
+    # Geometric mean of throughput relative to default variant, higher is better
+    score: float
+    measurements: typing.List[bench.Measurement]
+
+
+# Optimization profiles are tried for every target, their flags are appended after flags of the target
+FLAG_VARIANTS = {
+    'profile-speed': Variant(profile='speed'),
+    'profile-size': Variant(profile='size'),
+}
+
+# Options pinned by targets that affect performance, values of default variant are the ones targets set
+MATRICES = {
+    'mad': Matrix(('mad',), {
+        'fpm-default': Variant({'--enable-fpm': 'default'}),
+        'speed': Variant({'--enable-speed': 'yes'}),
+        'accuracy': Variant({'--enable-accuracy': 'yes'}),
+    }),
+    'opus': Matrix(('opus',), {
+        'fixed-point': Variant({'OPUS_FIXED_POINT': 'YES'}),
+        'float-approx': Variant({'OPUS_FLOAT_APPROX': 'YES'}),
+        'no-intrinsics': Variant({'OPUS_DISABLE_INTRINSICS': 'YES'}),
+    }),
+    # Benchmark uses zlib API, so ZLIB_COMPAT cannot be disabled
+    'zlib-ng': Matrix(('zlib',), {
+        'no-optim': Variant({'WITH_OPTIM': 'NO'}),
+        'no-runtime-cpu-detection': Variant({'WITH_RUNTIME_CPU_DETECTION': 'NO'}),
+    }),
+    'bzip2': Matrix(('bzip2',), {}),
+    'flac': Matrix(('flac',), {}),
+    # Floating point decoder is selected by patch regardless of build machine, variants change options and flags only
+    'mpg123': Matrix(('libmpg123',), {}),
+    'png': Matrix(('libpng16',), {}),
+    'samplerate': Matrix(('samplerate',), {}),
+    'vorbis': Matrix(('vorbis',), {}),
+    'webp': Matrix(('libwebp',), {}),
+}
+
+
+def matrix(target_name: str) -> Matrix:
+    declared = MATRICES.get(target_name, Matrix((target_name,), {}))
+    variants = {DEFAULT_VARIANT: Variant(), **FLAG_VARIANTS, **declared.variants}
+
+    return Matrix(declared.benchmarks, variants)
+
+
+def install(targets: typing.Sequence[base.Target], target_name: str, variant_name: str):
+    variant = matrix(target_name).variants[variant_name]
+
+    def configure(target: base.Target, state: BuildState, original):
+        if variant.profile:
+            profile.PROFILES[variant.profile].apply(target, state)
+
+        if variant.cflags:
+            flags.append(state.environment, variant.cflags)
+
+        # Options are set before configure() of target, targets assign values that variants change with setdefault()
+        options = state.options
+        options.update(variant.options)
+        original(state)
+
+        overridden = [name for name, value in variant.options.items() if options.get(name) != value]
+
+        if overridden:
+            raise RuntimeError(f"Options {', '.join(overridden)} of variant {variant_name} were overridden "
+                               f"by target {target.name}")
+
+    def post_build(target: base.Target, state: BuildState, original):
+        original(state)
+
+        if state.install_path.exists():
+            metadata.update(state.install_path, matrix_variant=variant_name)
+
+    for target in targets:
+        if target.name == target_name:
+            hook.around(target, 'configure', configure)
+            hook.around(target, 'post_build', post_build)
+
+
+def explore(target_name: str, variant_names: typing.Sequence[str] = (), jobs: typing.Optional[int] = None,
+            rounds: int = 1, samples: typing.Optional[int] = None, matrix_path: Path = MATRIX_PATH,
+            deps_path: Path = DEPS_PATH) -> typing.Tuple[typing.List[Ranking], typing.Dict[str, str]]:
+    target_matrix = matrix(target_name)
+    variant_names = variant_names or list(target_matrix.variants)
+
+    for name in variant_names:
+        if name not in target_matrix.variants:
+            raise KeyError(f'Unknown variant {name} of target {target_name}')
+
+    target_path = matrix_path / target_name
+    os.makedirs(target_path, exist_ok=True)
+
+    # Variants are built concurrently in separate directories, like architectures of universal builds
+    with ThreadPoolExecutor(max_workers=jobs or len(variant_names)) as executor:
+        built = list(executor.map(lambda name: _build(target_name, name, target_path), variant_names))
+
+    failures = {name: error for name, error in built if error}
+    variant_names = [name for name in variant_names if name not in failures]
+
+    runners = [bench.Runner(output_path=target_path / name / 'bench',
+                            deps_path=_overlay(deps_path, target_path / name, target_name), samples=samples)
+               for name in variant_names]
+    results, bench_failures = bench.measure_interleaved(runners, list(target_matrix.benchmarks), rounds)
+    failures.update(bench_failures)
+
+    return _rank(dict(zip(variant_names, results))), failures
+
+
+def build_target(target_name: str, args: typing.Sequence[str], path: Path, log_path: Path) -> bool:
+    # Target is built from scratch by separate process of build script, its output goes to log file
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+    args = [sys.executable, str(BUILD_SCRIPT), f'--target={target_name}', *args,
+            '--build-path', str(path / 'build'),
+            '--output-path', str(path / 'output')]
+
+    with open(log_path, 'w') as log:
+        return subprocess.run(args, stdout=log, stderr=subprocess.STDOUT).returncode == 0
+
+
+def find_install_path(output_path: Path, key: str) -> Path:
+    # Installed files are marked with metadata file, the key is written to it by post_build() hook of build feature
+    for path in sorted(output_path.rglob(metadata.FILENAME)):
+        if key in metadata.load(path.parent):
+            return path.parent
+
+    return output_path
+
+
+def _build(target_name: str, variant_name: str, target_path: Path) -> typing.Tuple[str, str]:
+    log_path = target_path / f'{variant_name}.log'
+    built = build_target(target_name, [f'--matrix-variant={variant_name}'], target_path / variant_name, log_path)
+
+    return variant_name, '' if built else f'Build failed, see {log_path}'
+
+
+def _overlay(deps_path: Path, variant_path: Path, target_name: str) -> Path:
+    # Dependencies directory with built variant in place of target, all other dependencies are linked
+    install_path = find_install_path(variant_path / 'output', 'matrix_variant')
+    overlay_path = variant_path / 'deps'
+    shutil.rmtree(overlay_path, ignore_errors=True)
+    os.makedirs(overlay_path)
+
+    for path in deps_path.iterdir():
+        if path.is_dir() and path.name != target_name:
+            os.symlink(path.resolve(), overlay_path / path.name)
+
+    os.symlink(install_path.resolve(), overlay_path / target_name)
+
+    return overlay_path
+
+
+def _rank(results: typing.Dict[str, typing.List[bench.Measurement]]) -> typing.List[Ranking]:
+    baseline = {(measurement.benchmark, measurement.name): measurement.median
+                for measurement in results.get(DEFAULT_VARIANT, next(iter(results.values()), []))}
+    rankings = []
+
+    for variant_name, measurements in results.items():
+        ratios = [measurement.median / baseline[(measurement.benchmark, measurement.name)]
+                  for measurement in measurements if baseline.get((measurement.benchmark, measurement.name))]
+        score = math.exp(sum(math.log(ratio) for ratio in ratios) / len(ratios)) if ratios else 0.0
+        rankings.append(Ranking(variant_name, score, measurements))
+
+    return sorted(rankings, key=lambda ranking: ranking.score, reverse=True)
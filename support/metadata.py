@@ -0,0 +1,43 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import typing
+from pathlib import Path
+
+FILENAME = 'aedi.json'
+
+
+def load(install_path: Path) -> typing.Dict[str, typing.Any]:
+    path = install_path / FILENAME
+
+    if not path.exists():
+        return {}
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def update(install_path: Path, **values):
+    # Artifact metadata is shared between build features, keep values written by others
+    metadata = load(install_path)
+    metadata.update(values)
+
+    with open(install_path / FILENAME, 'w') as f:
+        json.dump(metadata, f, indent=4, sort_keys=True)
+        f.write('\n')
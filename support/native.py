@@ -0,0 +1,95 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import hashlib
+import os
+import shutil
+import subprocess
+import typing
+from pathlib import Path
+from platform import machine
+
+from aedi.state import BuildState
+
+from . import lock, source
+
+CACHE_PATH = Path(__file__).resolve().parent.parent / 'native'
+COMPLETE_MARKER = '.complete'
+LOCK_SUFFIX = '.lock'
+
+
+def tools_path(state: BuildState, src_root: str = '', tools: typing.Sequence[str] = (),
+               key_paths: typing.Sequence[str] = ('',)) -> Path:
+    # Native helper tools depend only on sources matching key paths, i.e. glob patterns relative to source root,
+    # so they are built once and shared between target architectures, repeated runs, and targets with the same code
+    key = _cache_key(state, src_root, tools, key_paths)
+
+    if not key:
+        return state.native_build_path
+
+    build_path = CACHE_PATH / key
+
+    # Other architectures or targets may need the same tools at the same time, only one process builds them
+    with lock.exclusive(CACHE_PATH / f'{key}{LOCK_SUFFIX}'):
+        if not (build_path / COMPLETE_MARKER).exists():
+            _build(state, src_root, tools, build_path)
+
+    return build_path
+
+
+def _build(state: BuildState, src_root: str, tools: typing.Sequence[str], build_path: Path):
+    # Files exported by CMake contain absolute paths, so tools must be built in their final location
+    shutil.rmtree(build_path, ignore_errors=True)
+    os.makedirs(build_path)
+
+    env = dict(os.environ)
+    args = [
+        'cmake',
+        '-S', state.source / src_root,
+        '-B', build_path,
+        '-DCMAKE_BUILD_TYPE=Release',
+        f'-DCMAKE_OSX_ARCHITECTURES={machine()}',
+        f'-DCMAKE_PREFIX_PATH={state.lib_path.parent}',
+    ]
+    subprocess.run(args, check=True, env=env)
+
+    args = ['cmake', '--build', build_path, '--parallel']
+    for tool in tools:
+        args += ['--target', tool]
+    subprocess.run(args, check=True, env=env)
+
+    (build_path / COMPLETE_MARKER).touch()
+
+
+def _cache_key(state: BuildState, src_root: str, tools: typing.Sequence[str],
+               key_paths: typing.Sequence[str]) -> typing.Optional[str]:
+    hasher = hashlib.sha256()
+    hasher.update(machine().encode())
+
+    for tool in tools:
+        hasher.update(tool.encode())
+
+    pathspecs = ['/'.join(part for part in (src_root, key_path) if part) or '**' for key_path in key_paths]
+    listing = source.files(state.source, *pathspecs)
+
+    if not listing:
+        return None
+
+    hasher.update(listing.encode())
+
+    return hasher.hexdigest()[:16]
@@ -0,0 +1,166 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import hashlib
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import typing
+from pathlib import Path
+
+import aedi.target.base as base
+from aedi.state import BuildState
+
+from . import flags, hook, source
+
+GENERATE_FLAG = '-fprofile-instr-generate'
+USE_FLAG = '-fprofile-instr-use'
+
+
+class ProfileGuidedOptimization:
+    def __init__(self, training_command: str, cache_path: Path):
+        self.training_command = training_command
+        self.cache_path = cache_path
+        # Profile depends on workload, so profiles collected with different training commands are cached separately
+        self.command_hash = hashlib.sha256(training_command.encode()).hexdigest()[:16]
+
+        self._environment = None
+        self._options = None
+        self._profile = None
+        self._instrumented = False
+
+    def install(self, target: base.Target):
+        hook.around(target, 'configure', self._configure)
+        hook.around(target, 'build', self._build)
+
+    def _configure(self, target: base.Target, state: BuildState, original):
+        if state.xcode:
+            original(state)
+            return
+
+        # Keep initial state in order to configure target again with collected profile
+        if self._environment is None:
+            self._environment = dict(state.environment)
+            self._options = dict(state.options)
+        else:
+            _restore(state.environment, self._environment)
+            _restore(state.options, self._options)
+
+        self._profile = self._profile_path(target, state)
+        self._instrumented = not self._profile.exists()
+
+        flag = GENERATE_FLAG if self._instrumented else f'{USE_FLAG}={self._profile}'
+        _add_flags(target, state, flag)
+
+        original(state)
+
+    def _build(self, target: base.Target, state: BuildState, original):
+        original(state)
+
+        if state.xcode or not self._instrumented:
+            return
+
+        self._train(state)
+
+        # Start from scratch because make-based targets do not track changes of compiler flags,
+        # profile of unversioned source is stored in build directory, so it must be kept
+        for path in state.build_path.iterdir():
+            if path == self._profile:
+                continue
+            elif path.is_dir() and not path.is_symlink():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+
+        target.configure(state)
+        original(state)
+
+    def _train(self, state: BuildState):
+        raw_path = state.build_path / 'pgo-raw'
+        shutil.rmtree(raw_path, ignore_errors=True)
+        os.makedirs(raw_path)
+
+        env = dict(state.environment)
+        env['LLVM_PROFILE_FILE'] = str(raw_path / '%p-%m.profraw')
+
+        # Placeholders are substituted after splitting, so paths with spaces or braces remain single arguments
+        placeholders = {'{build_path}': str(state.build_path), '{source}': str(state.source)}
+        args = [os.path.expanduser(_substitute(arg, placeholders)) for arg in shlex.split(self.training_command)]
+        subprocess.run(args, check=True, cwd=state.build_path, env=env)
+
+        raw_profiles = sorted(raw_path.glob('*.profraw'))
+
+        if not raw_profiles:
+            raise RuntimeError(f'No profile data was written by training command: {shlex.join(args)}')
+
+        os.makedirs(self._profile.parent, exist_ok=True)
+
+        # Merge to temporary file first, interrupted merge must not be picked from cache
+        merge_path = self._profile.with_suffix('.tmp')
+        args = _profdata_tool() + ['merge', f'-output={merge_path}'] + raw_profiles
+        subprocess.run(args, check=True, env=state.environment)
+        os.replace(merge_path, self._profile)
+
+    def _profile_path(self, target: base.Target, state: BuildState) -> Path:
+        commit = source.commit(state.source)
+        path = self.cache_path / target.name
+
+        if commit:
+            return path / f'{commit}-{state.architecture()}-{self.command_hash}.profdata'
+
+        # Profile from unversioned source cannot be reused, keep it in build directory only
+        return state.build_path / 'pgo.profdata'
+
+
+def install(targets: typing.Sequence[base.Target], training_command: str, cache_path: Path):
+    for target in targets:
+        if isinstance(target, (base.CMakeMainTarget, base.MakeMainTarget)):
+            ProfileGuidedOptimization(training_command, cache_path).install(target)
+
+
+def _add_flags(target: base.Target, state: BuildState, flag: str):
+    if isinstance(target, base.CMakeMainTarget):
+        # Main targets may set CMAKE_C_FLAGS explicitly, so compiler flags from environment cannot be used
+        # Instead, inject compile and link options right after project() command
+        script_path = state.build_path / 'pgo.cmake'
+        os.makedirs(state.build_path, exist_ok=True)
+
+        with open(script_path, 'w') as f:
+            f.write(f'add_compile_options({flag})\nadd_link_options({flag})\n')
+
+        state.options['CMAKE_PROJECT_INCLUDE'] = script_path
+    else:
+        flags.append(state.environment, flag, (*flags.COMPILER_VARIABLES, 'LDFLAGS'))
+
+
+def _profdata_tool() -> typing.List[str]:
+    return ['xcrun', 'llvm-profdata'] if sys.platform == 'darwin' else ['llvm-profdata']
+
+
+def _substitute(arg: str, placeholders: typing.Mapping[str, str]) -> str:
+    for placeholder, value in placeholders.items():
+        arg = arg.replace(placeholder, value)
+
+    return arg
+
+
+def _restore(values: typing.MutableMapping, saved: typing.Mapping):
+    values.clear()
+    values.update(saved)
@@ -0,0 +1,476 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import re
+import shlex
+import subprocess
+import typing
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parent.parent
+DEPS_PATH = ROOT_PATH / 'deps'
+
+# Resolution rules follow pkgconf 1.8 in order to produce the same output as pkg-config command
+
+_UNMERGEABLE_PREFIXES = (
+    '-framework', '-isystem', '-idirafter', '-pthread', '-Wa,', '-Wl,', '-Wp,', '-trigraphs', '-pedantic', '-ansi',
+    '-std=', '-stdlib=', '-include', '-nostdinc', '-nostdlibinc', '-nobuiltininc',
+)
+
+_GROUPABLE_FLAGS = ('-framework', '-isystem', '-idirafter', '-include')
+
+_SYSTEM_DIRECTORIES = {
+    'L': ('/usr/lib',),
+    'I': ('/usr/include',),
+}
+
+_OPERATORS = {
+    '<': lambda result: result < 0,
+    '<=': lambda result: result <= 0,
+    '=': lambda result: result == 0,
+    '!=': lambda result: result != 0,
+    '>=': lambda result: result >= 0,
+    '>': lambda result: result > 0,
+}
+
+
+class PkgConfigError(Exception):
+    pass
+
+
+class Fragment:
+    def __init__(self, kind: str, data: str):
+        self.kind = kind
+        self.data = data
+
+    def __str__(self):
+        return f'-{self.kind}{self.data}' if self.kind else self.data
+
+
+class Dependency:
+    def __init__(self, name: str, operator: typing.Optional[str] = None, version: typing.Optional[str] = None):
+        self.name = name
+        self.operator = operator
+        self.version = version
+
+    def __str__(self):
+        return f'{self.name} {self.operator} {self.version}' if self.operator else self.name
+
+
+class Package:
+    def __init__(self, path: Path, variables: typing.Dict[str, str]):
+        self.path = path
+        self.name = path.stem
+        self.variables = {'pcfiledir': str(path.parent)}
+        self.fields = {}
+
+        self._parse(variables)
+
+        self.version = self.fields.get('Version', '')
+        self.requires = _parse_dependencies(self.fields.get('Requires', ''))
+        self.requires_private = _parse_dependencies(self.fields.get('Requires.private', ''))
+        self.libs = _parse_fragments(self.fields.get('Libs', ''))
+        self.libs_private = _parse_fragments(self.fields.get('Libs.private', ''))
+        self.cflags = _parse_fragments(self.fields.get('Cflags', self.fields.get('CFlags', '')))
+        self.cflags_private = _parse_fragments(self.fields.get('Cflags.private', ''))
+
+    def _parse(self, global_variables: typing.Dict[str, str]):
+        with open(self.path) as f:
+            content = f.read()
+
+        for line in content.replace('\\\n', '').splitlines():
+            line = re.sub(r'(?<!\\)#.*', '', line).replace('\\#', '#').strip()
+            match = re.match(r'([A-Za-z0-9_.]+)\s*([:=])\s*(.*)', line)
+
+            if not match:
+                continue
+
+            key, operator, value = match.groups()
+
+            if operator == '=':
+                # Variables defined in command line take precedence over ones from file
+                self.variables[key] = global_variables[key] if key in global_variables \
+                    else self._expand(value, global_variables)
+            elif key not in self.fields:
+                self.fields[key] = self._expand(value, global_variables)
+
+    def _expand(self, value: str, global_variables: typing.Dict[str, str]) -> str:
+        def substitute(match: re.Match) -> str:
+            name = match.group(1)
+
+            if name is None:
+                return '$'
+
+            return global_variables.get(name, self.variables.get(name, ''))
+
+        return re.sub(r'\$\{([^}]*)\}|\$\$', substitute, value)
+
+
+class PkgConfig:
+    def __init__(self, search_paths: typing.Sequence[Path], variables: typing.Optional[typing.Dict[str, str]] = None,
+                 define_prefix: bool = False):
+        self.variables = variables or {}
+        self.define_prefix = define_prefix
+
+        # Index all .pc files once, the first one found wins like with PKG_CONFIG_PATH
+        self._paths: typing.Dict[str, Path] = {}
+
+        for search_path in search_paths:
+            for path in sorted(search_path.glob('*.pc')):
+                self._paths.setdefault(path.stem, path)
+
+        self._packages: typing.Dict[str, Package] = {}
+        self._results: typing.Dict[typing.Tuple[str, ...], str] = {}
+
+        # State of dependency graph traversal
+        self._private = False
+        self._ancestors = set()
+
+    def package_names(self) -> typing.List[str]:
+        return sorted(self._paths)
+
+    def package(self, name: str) -> Package:
+        package = self._packages.get(name)
+
+        if not package:
+            path = self._paths.get(name)
+
+            if not path:
+                # Lookup is not case-sensitive on macOS, e.g. SDL2 dependency is resolved to sdl2.pc
+                path = next((path for stem, path in self._paths.items() if stem.lower() == name.lower()), None)
+
+            if not path:
+                raise PkgConfigError(f"Package '{name}' was not found")
+
+            variables = dict(self.variables)
+
+            if self.define_prefix and path.parent.name == 'pkgconfig':
+                variables.setdefault('prefix', str(path.parent.parent.parent))
+
+            package = Package(path, variables)
+            self._packages[name] = package
+
+        return package
+
+    def run(self, *args: str) -> str:
+        # Results are memoized because the same queries are repeated by targets during one run
+        result = self._results.get(args)
+
+        if result is None:
+            result = self._run(args)
+            self._results[args] = result
+
+        return result
+
+    def _run(self, args: typing.Sequence[str]) -> str:
+        want_cflags = want_libs = want_version = static = False
+        names = []
+
+        for arg in args:
+            if arg == '--cflags':
+                want_cflags = True
+            elif arg == '--libs':
+                want_libs = True
+            elif arg == '--modversion':
+                want_version = True
+            elif arg == '--static':
+                static = True
+            elif arg.startswith('-'):
+                raise PkgConfigError(f'Unsupported option {arg}')
+            else:
+                names.append(arg)
+
+        dependencies = _parse_dependencies(' '.join(names))
+
+        if not dependencies:
+            raise PkgConfigError('Please specify at least one package name')
+
+        for dependency in dependencies:
+            self._verify(dependency)
+
+        if want_version:
+            return ''.join(self.package(dependency.name).version + '\n' for dependency in dependencies)
+
+        fragments = []
+
+        # Private dependencies are searched for compiler flags always, and for linker flags in static mode only
+        if want_cflags:
+            fragments += self._collect(dependencies, 'cflags', True, is_private=False)
+
+            if static:
+                fragments += self._collect(dependencies, 'cflags_private', True, is_private=True)
+
+        if want_libs:
+            private_field = 'libs_private' if static else None
+            fragments += self._collect(dependencies, 'libs', static, private_field)
+
+        fragments = [fragment for fragment in fragments
+                     if fragment.data not in _SYSTEM_DIRECTORIES.get(fragment.kind, ())]
+
+        return ''.join(_quote(fragment) + ' ' for fragment in fragments) + '\n' if fragments else '\n'
+
+    def _collect(self, dependencies: typing.Sequence[Dependency], field: str, search_private: bool,
+                 private_field: typing.Optional[str] = None,
+                 is_private: typing.Optional[bool] = None) -> typing.List[Fragment]:
+        # Unless specified explicitly, fragments are private when their package is reached via private dependency
+        result = []
+
+        def collect(package: Package):
+            for fragment in getattr(package, field):
+                _copy_fragment(result, fragment, self._private if is_private is None else is_private)
+
+            if private_field:
+                for fragment in getattr(package, private_field):
+                    _copy_fragment(result, fragment, True)
+
+        self._private = False
+        self._ancestors = set()
+        self._walk(dependencies, collect, search_private)
+
+        return result
+
+    def _traverse(self, package: Package, collect: typing.Callable[[Package], None], search_private: bool):
+        collect(package)
+        self._walk(package.requires, collect, search_private)
+
+        if search_private:
+            # Flag is cleared instead of restoring its previous value intentionally, pkgconf does the same
+            # As a result, only the first private dependency of package has its flags treated as private
+            self._private = True
+            self._walk(package.requires_private, collect, search_private)
+            self._private = False
+
+    def _walk(self, dependencies: typing.Sequence[Dependency], collect: typing.Callable[[Package], None],
+              search_private: bool):
+        for dependency in dependencies:
+            package = self._verify(dependency)
+
+            # Circular dependency
+            if package.name in self._ancestors:
+                continue
+
+            self._ancestors.add(package.name)
+            self._traverse(package, collect, search_private)
+            self._ancestors.remove(package.name)
+
+    def _verify(self, dependency: Dependency) -> Package:
+        package = self.package(dependency.name)
+
+        if dependency.operator and not _OPERATORS[dependency.operator](compare_versions(package.version,
+                                                                                        dependency.version)):
+            raise PkgConfigError(f"Package dependency requirement '{dependency}' could not be satisfied, "
+                                 f"package '{package.name}' has version {package.version}")
+
+        return package
+
+
+def compare_versions(first: str, second: str) -> int:
+    # Comparison of version strings like rpmvercmp() does
+    first_parts = re.findall(r'[0-9]+|[A-Za-z]+|~', first)
+    second_parts = re.findall(r'[0-9]+|[A-Za-z]+|~', second)
+
+    for first_part, second_part in zip(first_parts, second_parts):
+        if first_part == second_part:
+            continue
+
+        if first_part == '~' or second_part == '~':
+            return -1 if first_part == '~' else 1
+
+        first_numeric = first_part.isdigit()
+        second_numeric = second_part.isdigit()
+
+        if first_numeric != second_numeric:
+            return 1 if first_numeric else -1
+
+        if first_numeric:
+            first_number = int(first_part)
+            second_number = int(second_part)
+
+            if first_number != second_number:
+                return 1 if first_number > second_number else -1
+        else:
+            return 1 if first_part > second_part else -1
+
+    # Tilde sorts even before end of version, e.g. 2.0~rc1 is older than 2.0
+    common = min(len(first_parts), len(second_parts))
+
+    if first_parts[common:common + 1] == ['~']:
+        return -1
+    if second_parts[common:common + 1] == ['~']:
+        return 1
+
+    return (len(first_parts) > len(second_parts)) - (len(first_parts) < len(second_parts))
+
+
+def _parse_dependencies(value: str) -> typing.List[Dependency]:
+    result = []
+    tokens = re.findall(r'<=|>=|!=|[<>=]|[^\s,<>=!]+', value)
+    index = 0
+
+    while index < len(tokens):
+        dependency = Dependency(tokens[index])
+        index += 1
+
+        if index + 1 < len(tokens) and tokens[index] in _OPERATORS:
+            dependency.operator = tokens[index]
+            dependency.version = tokens[index + 1]
+            index += 2
+
+        result.append(dependency)
+
+    return result
+
+
+def _is_unmergeable(value: str) -> bool:
+    return not value.startswith('-') or value.startswith(_UNMERGEABLE_PREFIXES)
+
+
+def _is_special(value: str) -> bool:
+    return not value.startswith('-') or value.startswith('-lib:') or _is_unmergeable(value)
+
+
+def _parse_fragments(value: str) -> typing.List[Fragment]:
+    result = []
+
+    for token in shlex.split(value):
+        if len(token) > 1 and not _is_special(token):
+            result.append(Fragment(token[1], token[2:]))
+            continue
+
+        if result:
+            # Flags like -framework are grouped with their arguments
+            parent = result[-1]
+
+            if not parent.kind and _is_special(parent.data) and parent.data.startswith(_GROUPABLE_FLAGS) \
+                    and ' ' not in parent.data:
+                parent.data += ' ' + token
+                continue
+
+        result.append(Fragment('', token))
+
+    return result
+
+
+def _lookup_fragment(fragments: typing.List[Fragment], fragment: Fragment) -> typing.Optional[int]:
+    for index in range(len(fragments) - 1, -1, -1):
+        existing = fragments[index]
+
+        if existing.kind == fragment.kind and existing.data == fragment.data:
+            return index
+
+    return None
+
+
+def _can_merge_back(fragment: Fragment, is_private: bool) -> bool:
+    if fragment.kind == 'l':
+        return not is_private
+
+    return fragment.kind not in ('F', 'L', 'I')
+
+
+def _should_merge(fragments: typing.List[Fragment], index: int) -> bool:
+    if index == 0:
+        return True
+
+    parent = fragments[index - 1]
+
+    if parent.kind in ('l', 'L', 'I'):
+        return True
+
+    return not fragments[index].kind or parent.kind == fragments[index].kind
+
+
+def _copy_fragment(fragments: typing.List[Fragment], fragment: Fragment, is_private: bool):
+    can_merge_back = _can_merge_back(fragment, is_private)
+
+    if can_merge_back and not is_private and _is_unmergeable(fragment.data):
+        # Move already added fragment to the end, e.g. libraries must be listed after their dependents
+        index = _lookup_fragment(fragments, fragment)
+
+        if index is not None and _should_merge(fragments, index):
+            del fragments[index]
+    elif not is_private and not can_merge_back and _lookup_fragment(fragments, fragment) is not None:
+        # Keep the first occurrence of search paths
+        return
+
+    fragments.append(Fragment(fragment.kind, fragment.data))
+
+
+def _quote(fragment: Fragment) -> str:
+    text = str(fragment)
+
+    # Grouped flags are kept as is, spaces between them are significant
+    if not fragment.kind and ' ' in fragment.data and fragment.data.startswith(_GROUPABLE_FLAGS):
+        return text
+
+    return re.sub(r'([^A-Za-z0-9_=,./:+@%-])', r'\\\1', text)
+
+
+_instances: typing.Dict[Path, PkgConfig] = {}
+
+
+def instance(deps_path: Path = DEPS_PATH) -> PkgConfig:
+    # Index of packages is built once per process, commands that use it do not rebuild dependencies
+    pkg_config = _instances.get(deps_path)
+
+    if not pkg_config:
+        pkg_config = PkgConfig(sorted(deps_path.glob('*/lib/pkgconfig')), define_prefix=True)
+        _instances[deps_path] = pkg_config
+
+    return pkg_config
+
+
+def compare(executable: str = 'pkg-config', deps_path: Path = DEPS_PATH) -> typing.List[str]:
+    # Check that results are the same as ones from pkg-config command for all packages and query kinds
+    pkg_config = PkgConfig(sorted(deps_path.glob('*/lib/pkgconfig')), define_prefix=True)
+    env = dict(os.environ)
+    env['PKG_CONFIG_LIBDIR'] = ''
+    env['PKG_CONFIG_PATH'] = os.pathsep.join(str(path) for path in sorted(deps_path.glob('*/lib/pkgconfig')))
+
+    queries = (
+        ('--libs',),
+        ('--static', '--libs'),
+        ('--cflags',),
+        ('--static', '--cflags'),
+        ('--cflags', '--libs'),
+        ('--modversion',),
+    )
+    mismatches = []
+
+    for name in pkg_config.package_names():
+        for query in queries:
+            args = query + (name,)
+            result = subprocess.run((executable, '--define-prefix') + args, env=env, capture_output=True, text=True)
+
+            try:
+                output = pkg_config.run(*args)
+            except PkgConfigError as ex:
+                output = None
+
+                if result.returncode == 0:
+                    mismatches.append(f"{' '.join(args)}: {ex}")
+
+                continue
+
+            if result.returncode != 0:
+                mismatches.append(f"{' '.join(args)}: {executable} failed: {result.stderr.strip()}")
+            elif output != result.stdout:
+                mismatches.append(f"{' '.join(args)}:\n  {executable}: {result.stdout.strip()}\n  resolver: {output.strip()}")
+
+    return mismatches
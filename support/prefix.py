@@ -0,0 +1,202 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import os
+import tempfile
+import typing
+from pathlib import Path
+
+import aedi.target.base as base
+from aedi.state import BuildState
+
+from . import hook, lock
+
+MANIFEST_FILENAME = '.manifest.json'
+MANIFEST_VERSION = 1
+LOCK_FILENAME = '.manifest.lock'
+# Method of aedi.Builder that links files of all dependencies to prefix directory before build
+CORE_STEP = '_create_prefix_directory'
+
+
+class Delta:
+    def __init__(self):
+        self.added: typing.List[str] = []
+        self.removed: typing.List[str] = []
+        self.changed: typing.List[str] = []
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+def _scan(root: Path, relpath: str, old_directories: typing.Dict[str, typing.Any],
+          new_directories: typing.Dict[str, typing.Any]):
+    # Directory modification time changes when its entries are added, removed, or renamed
+    # Entries of unchanged directories are taken from manifest without listing them again
+    path = root / relpath if relpath else root
+    mtime = os.stat(path).st_mtime_ns
+    old_entry = old_directories.get(relpath)
+
+    if old_entry and old_entry['mtime'] == mtime:
+        entry = old_entry
+    else:
+        files, subdirs = [], []
+
+        with os.scandir(path) as it:
+            for dir_entry in it:
+                (subdirs if dir_entry.is_dir(follow_symlinks=False) else files).append(dir_entry.name)
+
+        entry = {'mtime': mtime, 'files': sorted(files), 'subdirs': sorted(subdirs)}
+
+    new_directories[relpath] = entry
+
+    for subdir in entry['subdirs']:
+        _scan(root, f'{relpath}/{subdir}' if relpath else subdir, old_directories, new_directories)
+
+
+def _files(directories: typing.Dict[str, typing.Any]) -> typing.Set[str]:
+    return {f'{relpath}/{name}' if relpath else name
+            for relpath, entry in directories.items() for name in entry['files']}
+
+
+def install(builder, deps_path: Path, prefix_path: Path):
+    # Core step that links every file of every dependency is private, it is replaced only if it still exists
+    if not callable(getattr(builder, CORE_STEP, None)):
+        raise RuntimeError(f'Builder has no {CORE_STEP}() method, incremental prefix update needs to be adapted')
+
+    def post_build(target: base.Target, state: BuildState, original):
+        original(state)
+
+        # Installed dependency is linked right away, so the next targets of the same run can use it
+        update(deps_path, prefix_path)
+
+    def configure(target: base.Target, state: BuildState, original):
+        # Public stage makes sure prefix is up to date even if core stops calling its step,
+        # nothing is touched when the step has already updated prefix
+        update(deps_path, prefix_path)
+        original(state)
+
+    for target in builder.targets:
+        is_main = isinstance(target, (base.CMakeMainTarget, base.MakeMainTarget))
+        hook.around(target, 'configure' if is_main else 'post_build', configure if is_main else post_build)
+
+    setattr(builder, CORE_STEP, lambda *args, **kwargs: update(deps_path, prefix_path))
+
+
+def update(deps_path: Path, prefix_path: Path) -> Delta:
+    # Concurrent builds share prefix directory, e.g. per-architecture or matrix builds, they update it one by one
+    with lock.exclusive(prefix_path / LOCK_FILENAME):
+        return _update(deps_path, prefix_path)
+
+
+def _update(deps_path: Path, prefix_path: Path) -> Delta:
+    manifest_path = prefix_path / MANIFEST_FILENAME
+    manifest = {}
+
+    if manifest_path.exists():
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    if manifest.get('version') != MANIFEST_VERSION:
+        manifest = {}
+
+    old_dependencies = manifest.get('dependencies', {})
+    old_links = manifest.get('links', {})
+
+    # Find files of every dependency, only changed directories are listed
+    new_dependencies = {}
+    dependency_files = {}
+
+    for dep_path in sorted(deps_path.iterdir()):
+        if not dep_path.is_dir() or dep_path.name.startswith('.'):
+            continue
+
+        name = dep_path.name
+        directories = {}
+        _scan(dep_path, '', old_dependencies.get(name, {}), directories)
+        new_dependencies[name] = directories
+        dependency_files[name] = _files(directories)
+
+    # Each file in prefix links to the first dependency providing it
+    new_links = {}
+
+    for name, files in dependency_files.items():
+        for relpath in files:
+            new_links.setdefault(relpath, name)
+
+    delta = Delta()
+
+    for relpath, name in old_links.items():
+        if relpath not in new_links:
+            delta.removed.append(relpath)
+        elif new_links[relpath] != name:
+            delta.changed.append(relpath)
+
+    delta.added = [relpath for relpath in new_links if relpath not in old_links]
+
+    for relpath in delta.removed + delta.changed:
+        link_path = prefix_path / relpath
+
+        if link_path.is_symlink():
+            _unlink(link_path)
+
+    for relpath in delta.removed:
+        _remove_empty_parents(prefix_path, prefix_path / relpath)
+
+    for relpath in delta.added + delta.changed:
+        link_path = prefix_path / relpath
+        target_path = deps_path / new_links[relpath] / relpath
+
+        os.makedirs(link_path.parent, exist_ok=True)
+
+        # Link is created under unique name, and renamed over existing file, if any, in one step
+        temp_path = link_path.parent / f'.{link_path.name}.{os.getpid()}.tmp'
+        _unlink(temp_path)
+        os.symlink(os.path.relpath(target_path, link_path.parent), temp_path)
+        os.replace(temp_path, link_path)
+
+    if delta or not manifest or old_dependencies != new_dependencies:
+        manifest = {'version': MANIFEST_VERSION, 'dependencies': new_dependencies, 'links': new_links}
+        fd, temp_path = tempfile.mkstemp(dir=prefix_path, prefix='.manifest.', suffix='.tmp')
+
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f, sort_keys=True)
+
+        os.replace(temp_path, manifest_path)
+
+    return delta
+
+
+def _remove_empty_parents(prefix_path: Path, path: Path):
+    parent = path.parent
+
+    while parent != prefix_path and parent.is_dir() and not any(parent.iterdir()):
+        try:
+            parent.rmdir()
+        except OSError:
+            # Directory got new entries in the meantime
+            break
+
+        parent = parent.parent
+
+
+def _unlink(path: Path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,84 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import typing
+
+import aedi.target.base as base
+from aedi.state import BuildState
+
+from . import flags, hook, metadata
+
+
+class Profile:
+    def __init__(self, name: str, cflags: str, ldflags: str = '',
+                 cmake_build_type: str = 'Release', meson_build_type: str = 'release', lto: bool = False):
+        self.name = name
+        self.cflags = cflags
+        self.ldflags = ldflags
+        self.cmake_build_type = cmake_build_type
+        self.meson_build_type = meson_build_type
+        self.lto = lto
+
+    def apply(self, target: base.Target, state: BuildState):
+        env = state.environment
+
+        flags.append(env, self.cflags)
+
+        if self.ldflags:
+            env['LDFLAGS'] = flags.join(env.get('LDFLAGS'), self.ldflags)
+
+        # Compiler flags from environment are not enough for CMake and Meson
+        # because their build types add optimization options after them
+        opts = state.options
+
+        if isinstance(target, base.CMakeTarget):
+            opts['CMAKE_BUILD_TYPE'] = self.cmake_build_type
+
+            if self.lto:
+                opts['CMAKE_INTERPROCEDURAL_OPTIMIZATION'] = 'YES'
+        elif isinstance(target, base.MesonStaticTarget):
+            opts['buildtype'] = self.meson_build_type
+
+            if self.lto:
+                opts['b_lto'] = 'true'
+                opts['b_lto_mode'] = 'thin'
+
+
+PROFILES = {
+    'speed': Profile('speed', cflags='-O3'),
+    'size': Profile('size', cflags='-Os', cmake_build_type='MinSizeRel', meson_build_type='minsize'),
+    'lto': Profile('lto', cflags='-O3 -flto=thin', ldflags='-flto=thin', lto=True),
+}
+
+
+def install(targets: typing.Sequence[base.Target], name: str):
+    profile = PROFILES[name]
+
+    def configure(target: base.Target, state: BuildState, original):
+        profile.apply(target, state)
+        original(state)
+
+    def post_build(target: base.Target, state: BuildState, original):
+        original(state)
+
+        if state.install_path.exists():
+            metadata.update(state.install_path, profile=profile.name)
+
+    for target in targets:
+        hook.around(target, 'configure', configure)
+        hook.around(target, 'post_build', post_build)
@@ -0,0 +1,107 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import difflib
+import os
+import re
+import sys
+import shutil
+import tempfile
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import aedi.target.base as base
+from aedi.state import BuildState
+
+from . import hook
+
+Replacement = typing.Union[str, typing.Callable[[re.Match], str]]
+
+
+class Rule:
+    def __init__(self, glob: str, pattern: str, replacement: Replacement):
+        # Glob is relative to install path, pattern is matched in multiline mode, i.e. ^ and $ match lines
+        self.glob = glob
+        self.pattern = re.compile(pattern, re.MULTILINE)
+        self.replacement = replacement
+
+
+def apply(root: Path, rules: typing.Sequence[Rule], dry_run: bool = False) -> typing.List[Path]:
+    # Collect rules per file first, so every file is read and written once regardless of number of rules
+    file_rules: typing.Dict[Path, typing.List[Rule]] = {}
+
+    for rule in rules:
+        for path in sorted(root.glob(rule.glob)):
+            if path.is_file() and not path.is_symlink():
+                file_rules.setdefault(path, []).append(rule)
+
+    if not file_rules:
+        return []
+
+    with ThreadPoolExecutor() as executor:
+        changed = executor.map(lambda item: _rewrite(*item, dry_run), file_rules.items())
+        return [path for path, is_changed in zip(file_rules, changed) if is_changed]
+
+
+def install(targets: typing.Sequence[base.Target]):
+    def post_build(target: base.Target, state: BuildState, original):
+        original(state)
+
+        if not state.xcode:
+            apply(state.install_path, target.rewrite_rules)
+
+    for target in targets:
+        if getattr(target, 'rewrite_rules', None):
+            hook.around(target, 'post_build', post_build)
+
+
+def _rewrite(path: Path, rules: typing.Sequence[Rule], dry_run: bool) -> bool:
+    with open(path, newline='') as f:
+        original = f.read()
+
+    content = original
+
+    for rule in rules:
+        content = rule.pattern.sub(rule.replacement, content)
+
+    # Unchanged files are not touched to keep their modification times, and not to trigger rebuilds
+    if content == original:
+        return False
+
+    if dry_run:
+        # Diff is printed at once, so diffs of files processed concurrently are not interleaved
+        diff = difflib.unified_diff(original.splitlines(keepends=True), content.splitlines(keepends=True),
+                                    str(path), str(path))
+        sys.stdout.write(''.join(line if line.endswith('\n') else line + '\n' for line in diff))
+        return True
+
+    # Write to temporary file next to the original one, and replace it atomically
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+
+    try:
+        with os.fdopen(fd, 'w', newline='') as f:
+            f.write(content)
+
+        shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    return True
@@ -0,0 +1,188 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import math
+import os
+import shlex
+import shutil
+import statistics
+import subprocess
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import aedi.target.base as base
+from aedi.state import BuildState
+
+from . import flags, hook, matrix, metadata, tests
+from .pkgconfig import DEPS_PATH, ROOT_PATH
+
+SANITIZE_PATH = ROOT_PATH / 'build' / 'sanitize'
+DEFAULT_SANITIZERS = ('address', 'undefined')
+PROFILE_VARIABLE = 'LLVM_PROFILE_FILE'
+
+
+class Sanitizer(typing.NamedTuple):
+    # Suffix of dependencies directory, compiler flags, and flags needed to link runtime of sanitizer
+    suffix: str
+    cflags: str
+    ldflags: str
+
+
+SANITIZERS = {
+    'address': Sanitizer('asan', '-fsanitize=address -fno-omit-frame-pointer', '-fsanitize=address'),
+    # Undefined behavior is only reported by default, abort on it to fail tests
+    'undefined': Sanitizer('ubsan', '-fsanitize=undefined -fno-sanitize-recover=undefined', '-fsanitize=undefined'),
+    'coverage': Sanitizer('cov', '-fprofile-instr-generate -fcoverage-mapping', '-fprofile-instr-generate'),
+}
+
+
+class Overhead(typing.NamedTuple):
+    test: str
+    # Median wall time of test executable linked with release and instrumented dependencies
+    release: float
+    instrumented: float
+
+    @property
+    def ratio(self) -> float:
+        return self.instrumented / self.release if self.release else 0.0
+
+    def __str__(self):
+        return f'{self.test}: {self.release * 1000:.1f} ms -> {self.instrumented * 1000:.1f} ms, {self.ratio:.2f}x'
+
+
+def prefix_path(sanitizer_names: typing.Sequence[str]) -> Path:
+    suffix = '-'.join(SANITIZERS[name].suffix for name in sanitizer_names)
+    return ROOT_PATH / f'deps-{suffix}'
+
+
+def install(targets: typing.Sequence[base.Target], sanitizer_names: typing.Sequence[str]):
+    sanitizers = [SANITIZERS[name] for name in sanitizer_names]
+    cflags = ' '.join(sanitizer.cflags for sanitizer in sanitizers)
+    ldflags = ' '.join(sanitizer.ldflags for sanitizer in sanitizers)
+
+    def configure(target: base.Target, state: BuildState, original):
+        env = state.environment
+
+        flags.append(env, cflags)
+        env['LDFLAGS'] = flags.join(env.get('LDFLAGS'), ldflags)
+        original(state)
+
+    def post_build(target: base.Target, state: BuildState, original):
+        original(state)
+
+        if state.install_path.exists():
+            metadata.update(state.install_path, sanitizers=list(sanitizer_names))
+
+    for target in targets:
+        hook.around(target, 'configure', configure)
+        hook.around(target, 'post_build', post_build)
+
+
+def build(dependencies: typing.Sequence[str], sanitizer_names: typing.Sequence[str] = DEFAULT_SANITIZERS,
+          jobs: typing.Optional[int] = None, deps_path: Path = DEPS_PATH) -> typing.Dict[str, str]:
+    target_prefix_path = prefix_path(sanitizer_names)
+    sanitize_path = SANITIZE_PATH / target_prefix_path.name
+    os.makedirs(sanitize_path, exist_ok=True)
+
+    args = [f'--sanitizer={name}' for name in sanitizer_names]
+
+    def build_dependency(name: str) -> typing.Tuple[str, str]:
+        log_path = sanitize_path / f'{name}.log'
+        built = matrix.build_target(name, args, sanitize_path / name, log_path)
+        return name, '' if built else f'Build failed, see {log_path}'
+
+    # Dependencies are built concurrently in separate directories, like variants of build options matrix
+    with ThreadPoolExecutor(max_workers=jobs or len(dependencies)) as executor:
+        built = list(executor.map(build_dependency, dependencies))
+
+    failures = {name: error for name, error in built if error}
+    os.makedirs(target_prefix_path, exist_ok=True)
+
+    for name in dependencies:
+        if name not in failures:
+            install_path = matrix.find_install_path(sanitize_path / name / 'output', 'sanitizers')
+            dependency_path = target_prefix_path / name
+
+            if dependency_path.is_symlink():
+                dependency_path.unlink()
+            else:
+                shutil.rmtree(dependency_path, ignore_errors=True)
+
+            shutil.copytree(install_path, dependency_path, symlinks=True)
+
+    # Dependencies that were not instrumented are linked, instrumented ones from previous runs are kept
+    for path in deps_path.iterdir():
+        dependency_path = target_prefix_path / path.name
+
+        if path.is_dir() and not os.path.lexists(dependency_path):
+            os.symlink(path.resolve(), dependency_path)
+
+    return failures
+
+
+def runners(sanitizer_names: typing.Sequence[str] = DEFAULT_SANITIZERS, jobs: typing.Optional[int] = None,
+            deps_path: Path = DEPS_PATH) -> typing.Tuple[tests.Runner, tests.Runner]:
+    target_prefix_path = prefix_path(sanitizer_names)
+    output_path = SANITIZE_PATH / target_prefix_path.name / 'test'
+    compiler_flags = []
+
+    # Static libraries do not bring runtime of sanitizers, so test executables link it themselves
+    for name in sanitizer_names:
+        for flag in shlex.split(f'{SANITIZERS[name].cflags} {SANITIZERS[name].ldflags}'):
+            if flag not in compiler_flags:
+                compiler_flags.append(flag)
+
+    environment = os.environ.copy()
+
+    if 'coverage' in sanitizer_names:
+        environment[PROFILE_VARIABLE] = str(output_path / 'profiles' / '%p.profraw')
+
+    release = tests.Runner(output_path=SANITIZE_PATH / 'release' / 'test', jobs=jobs, use_cache=False,
+                           deps_path=deps_path)
+    instrumented = tests.Runner(output_path=output_path, jobs=jobs, use_cache=False, deps_path=target_prefix_path,
+                                compiler_flags=compiler_flags, environment=environment)
+
+    return release, instrumented
+
+
+def measure(names: typing.Sequence[str], release: tests.Runner, instrumented: tests.Runner,
+            repetitions: int = 5) -> typing.List[Overhead]:
+    timings = {name: ([], []) for name in names}
+
+    # Executables linked with both dependencies directories are launched alternately, one at a time
+    for _ in range(repetitions):
+        for name in names:
+            for runner, seconds in zip((release, instrumented), timings[name]):
+                seconds.append(_launch(runner.output_path / name, runner.environment))
+
+    return [Overhead(name, statistics.median(release_seconds), statistics.median(instrumented_seconds))
+            for name, (release_seconds, instrumented_seconds) in timings.items()]
+
+
+def mean_ratio(overheads: typing.Sequence[Overhead]) -> float:
+    ratios = [overhead.ratio for overhead in overheads if overhead.ratio]
+    return math.exp(sum(math.log(ratio) for ratio in ratios) / len(ratios)) if ratios else 0.0
+
+
+def _launch(executable: Path, environment: typing.Optional[typing.Dict[str, str]]) -> float:
+    start = time.monotonic()
+    subprocess.run([str(executable)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=environment)
+
+    return time.monotonic() - start
@@ -0,0 +1,167 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import subprocess
+import tempfile
+import typing
+from pathlib import Path
+
+import aedi.target.base as base
+from aedi.state import BuildState
+
+from . import archive, hook, metadata
+
+DEBUG_SEGMENT = '__DWARF'
+# Members without global symbols are still loaded by -ObjC linker option, or may register static initializers
+LOADABLE_SECTIONS = ('__objc_catlist', '__objc_nlcatlist', '__objc_classlist', '__objc_nlclslist', '__mod_init_func')
+
+
+class Result(typing.NamedTuple):
+    path: Path
+    size_before: int
+    size_after: int
+    removed_members: typing.List[str]
+
+    def __str__(self):
+        saved = self.size_before - self.size_after
+        percent = saved * 100 / self.size_before if self.size_before else 0
+        return f'{self.path.name}: {self.size_before} -> {self.size_after} bytes, {percent:.1f}% smaller, ' \
+               f'{len(self.removed_members)} unused members removed'
+
+
+def slim(path: Path) -> Result:
+    size_before = path.stat().st_size
+
+    if _has_debug_info(path.read_bytes()):
+        subprocess.run(('strip', '-S', path), check=True)
+
+    data = path.read_bytes()
+    removed_members = []
+    fat = archive.fat_slices(data)
+
+    if fat is None:
+        output = _slim_archive(memoryview(data), removed_members)
+    else:
+        fat = [archive.FatSlice(fat_slice.cpu_type, fat_slice.cpu_subtype, fat_slice.align,
+                                _slim_archive(fat_slice.data, removed_members)) for fat_slice in fat]
+        output = archive.write_fat(fat)
+
+    if output != data:
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+            f.write(output)
+
+        os.chmod(f.name, path.stat().st_mode & 0o777)
+        os.replace(f.name, path)
+
+    return Result(path, size_before, len(output), sorted(set(removed_members)))
+
+
+def _has_debug_info(data: bytes) -> bool:
+    for slice_data in archive.slices(data).values():
+        for member in archive.members(slice_data):
+            if member.name in archive.SYMDEF_NAMES:
+                continue
+
+            # Archive with LTO bitcode is left to linker, strip cannot process such members
+            if archive.is_bitcode(member.data):
+                return False
+
+            if not archive.is_object(member.data):
+                continue
+
+            obj = archive.parse_object(member.data)
+
+            if obj.debug_symbols or any(section.segment == DEBUG_SEGMENT for section in obj.sections):
+                return True
+
+    return False
+
+
+def _slim_archive(data: memoryview, removed_members: typing.List[str]) -> bytes:
+    kept_members = []
+    removed = []
+    kept_indices = {}
+    symbols = {}
+    table_of_contents = None
+    has_opaque_members = False
+
+    for member in archive.members(data):
+        if member.name in archive.SYMDEF_NAMES:
+            table_of_contents = archive.table_of_contents(member)
+            continue
+
+        # LLVM bitcode and other non Mach-O members are copied unchanged, their symbols are known from table of contents
+        if not archive.is_object(member.data):
+            has_opaque_members = True
+            kept_indices[member.offset] = len(kept_members)
+            kept_members.append((member.name, bytes(member.data)))
+            continue
+
+        obj = archive.parse_object(member.data)
+        defined = obj.defined + obj.weak
+
+        # Linker never loads member that defines no global symbols
+        if not defined and not obj.common and not any(section.name in LOADABLE_SECTIONS for section in obj.sections):
+            removed.append(member.name)
+            continue
+
+        kept_indices[member.offset] = len(kept_members)
+
+        for symbol in defined:
+            symbols.setdefault(symbol, len(kept_members))
+
+        kept_members.append((member.name, bytes(member.data)))
+
+    if table_of_contents is None and has_opaque_members:
+        # Without table of contents symbols of such members are unknown, archive is kept as is
+        return bytes(data)
+
+    removed_members += removed
+
+    if table_of_contents is not None:
+        # Keep the same symbols in table of contents, e.g. common symbols are present there when ranlib -c was used
+        symbols = {symbol: kept_indices[offset] for symbol, offset in table_of_contents.items() if offset in kept_indices}
+
+    return archive.write_archive(kept_members, list(symbols.items()))
+
+
+def install(targets: typing.Sequence[base.Target]):
+    for target in targets:
+        if not isinstance(target, (base.CMakeMainTarget, base.MakeMainTarget)):
+            hook.around(target, 'post_build', _post_build)
+
+
+def _post_build(target: base.Target, state: BuildState, original):
+    original(state)
+
+    lib_path = state.install_path / 'lib'
+    archives = [path for path in sorted(lib_path.glob('*.a')) if not path.is_symlink()] if lib_path.exists() else []
+
+    if not archives:
+        return
+
+    report = {}
+
+    for path in archives:
+        result = slim(path)
+        report[path.name] = {'before': result.size_before, 'after': result.size_after,
+                             'removed_members': result.removed_members}
+        print(result)
+
+    metadata.update(state.install_path, slim=report)
@@ -0,0 +1,44 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import subprocess
+import typing
+from pathlib import Path
+
+
+def _git(source: Path, *args) -> typing.Optional[str]:
+    result = subprocess.run(('git',) + args, cwd=source, capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def is_clean(source: Path, *paths: str) -> bool:
+    # Uncommitted changes make commit or tree hash meaningless as cache key
+    status = _git(source, 'status', '--porcelain', '--untracked-files=no', '--', *paths)
+    return status == ''
+
+
+def commit(source: Path) -> typing.Optional[str]:
+    return _git(source, 'rev-parse', 'HEAD') if is_clean(source) else None
+
+
+def files(source: Path, *pathspecs: str) -> typing.Optional[str]:
+    # Object hashes of files depend on content only, so they are the same in repositories sharing code,
+    # pathspecs may be directories, files, or glob patterns
+    pathspecs = tuple(f':(glob){pathspec}' for pathspec in pathspecs)
+    listing = _git(source, 'ls-files', '--stage', '--', *pathspecs) if is_clean(source, *pathspecs) else None
+    return listing or None
@@ -0,0 +1,119 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import os
+import shlex
+import statistics
+import subprocess
+import time
+import typing
+from pathlib import Path
+
+from . import bench
+from .pkgconfig import DEPS_PATH
+
+STARTUP_PATH = bench.BENCH_PATH / 'startup'
+OUTPUT_PATH = bench.OUTPUT_PATH / 'startup'
+LOAD_VARIABLE = 'AEDI_STARTUP_LOAD'
+WARM_VARIABLE = 'AEDI_STARTUP_WARM'
+LOAD_NAME = 'load'
+
+
+class Latency(typing.NamedTuple):
+    benchmark: str
+    name: str
+    # Seconds taken by the first call in every process, and by subsequent calls
+    cold: typing.List[float]
+    warm: typing.List[float]
+
+    def __str__(self):
+        text = f'{self.benchmark}/{self.name}: cold {_milliseconds(self.cold)}'
+        return f'{text}, warm {_milliseconds(self.warm)}' if self.warm else text
+
+
+class Runner(bench.Runner):
+    def __init__(self, output_path: Path = OUTPUT_PATH, deps_path: Path = DEPS_PATH,
+                 compiler: typing.Optional[str] = None, jobs: typing.Optional[int] = None, processes: int = 20,
+                 warm: int = 10, purge_command: typing.Optional[str] = None):
+        super().__init__(STARTUP_PATH, output_path, deps_path, compiler, jobs,
+                         prelude_path=bench.BENCH_PATH / bench.PRELUDE)
+        self.processes = processes
+        self.warm = warm
+        self.purge_command = purge_command
+
+    def measure(self, names: typing.Sequence[str]) -> typing.Tuple[typing.List[Latency], typing.Dict[str, str]]:
+        latencies = []
+        failures = {}
+
+        for name in names:
+            try:
+                latencies += self._measure_startup(name)
+            except bench.BenchmarkError as ex:
+                failures[name] = str(ex)
+
+        return latencies, failures
+
+    def _measure_startup(self, name: str) -> typing.List[Latency]:
+        executable = str(self.output_path / name)
+        loads = []
+        latencies: typing.Dict[str, Latency] = {}
+
+        # Every process measures one cold call, so processes are launched many times,
+        # runs that exit right after loading of libraries alternate with complete ones
+        for _ in range(self.processes):
+            seconds, _ = self._launch(executable, {LOAD_VARIABLE: '1'})
+            loads.append(seconds)
+
+            _, output = self._launch(executable, {WARM_VARIABLE: str(self.warm)})
+
+            for line in output.splitlines():
+                if not line.startswith('{'):
+                    continue
+
+                values = json.loads(line)
+                latency = latencies.setdefault(values['name'], Latency(name, values['name'], [], []))
+                latency.cold.append(values['cold'])
+                latency.warm.extend(values['warm'])
+
+        return [Latency(name, LOAD_NAME, loads, []), *latencies.values()]
+
+    def _launch(self, executable: str, variables: typing.Dict[str, str]) -> typing.Tuple[float, str]:
+        # Caches of file system can be dropped before launch, e.g. with 'sudo purge' command on macOS
+        if self.purge_command:
+            subprocess.run(shlex.split(self.purge_command), check=True)
+
+        environment = os.environ.copy()
+        environment.update(variables)
+
+        start = time.monotonic()
+        process = subprocess.run([executable], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                                 env=environment)
+        seconds = time.monotonic() - start
+
+        if process.returncode:
+            raise bench.BenchmarkError(process.stdout)
+
+        return seconds, process.stdout
+
+
+def _milliseconds(values: typing.Sequence[float]) -> str:
+    median = statistics.median(values) * 1000
+    p90 = statistics.quantiles(values, n=10)[-1] * 1000 if len(values) > 1 else median
+
+    return f'{median:.3f} ms (p90 {p90:.3f} ms)'
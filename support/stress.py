@@ -0,0 +1,262 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import os
+import random
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from . import bench
+from .pkgconfig import DEPS_PATH
+
+STRESS_PATH = bench.BENCH_PATH / 'stress'
+OUTPUT_PATH = bench.OUTPUT_PATH / 'stress'
+CORPUS_PATH = bench.OUTPUT_PATH / 'corpus'
+CORPUS_NAME = 'corpus'
+# Exit code of decoding program that rejected its input, AEDI_DECODE_REJECTED in prelude header
+REJECTED_CODE = 2
+
+# Decoders with formats of files they are given, decoder name is the name of pkg-config package like in benchmarks
+DECODERS = {
+    'dumb': ('mod',),
+    'flac': ('flac',),
+    'libgme': ('vgm',),
+    'libmodplug': ('mod',),
+    'libmpg123': ('mp3',),
+    'libpng16': ('png',),
+    'libwebp': ('webp',),
+    'libxmp': ('mod',),
+    'mad': ('mp3',),
+    'sndfile': ('wav', 'flac', 'ogg'),
+    'vorbisfile': ('ogg',),
+}
+
+FORMATS = {extension for extensions in DECODERS.values() for extension in extensions}
+MUTATIONS = ('truncate', 'flip', 'zero', 'repeat', 'boundary')
+# Leading bytes with signature of format are not mutated, so files reach decoders instead of being rejected at detection
+SIGNATURE_SIZE = 16
+BOUNDARY_VALUES = (b'\x00\x00\x00\x00', b'\xff\xff\xff\xff', b'\xff\xff\xff\x7f', b'\x00\x00\x00\x80')
+
+# Rejection of damaged input is expected, other statuses are bugs of decoders
+FAILED_STATUSES = ('failed', 'crashed', 'timeout')
+
+
+class Decode(typing.NamedTuple):
+    decoder: str
+    path: str
+    # One of ok, rejected, failed, crashed, or timeout
+    status: str
+    seconds: float
+    peak_memory: int
+    output: str = ''
+
+    @property
+    def failed(self) -> bool:
+        return self.status in FAILED_STATUSES
+
+    def __str__(self):
+        return f'{self.decoder} {self.path}: {self.status}, {self.seconds * 1000:.1f} ms, ' \
+            f'{self.peak_memory / 2 ** 20:.1f} MB peak'
+
+
+class Summary(typing.NamedTuple):
+    decoder: str
+    files: int
+    rejected: int
+    failed: int
+    # Median, 90th and 99th percentiles, and maximum
+    seconds: typing.Tuple[float, ...]
+    peak_memory: typing.Tuple[float, ...]
+
+    def __str__(self):
+        seconds = '/'.join(f'{value * 1000:.1f}' for value in self.seconds)
+        memory = '/'.join(f'{value / 2 ** 20:.1f}' for value in self.peak_memory)
+        return f'{self.decoder}: {self.files} files, {self.rejected} rejected, {self.failed} failed, ' \
+            f'p50/p90/p99/max {seconds} ms, {memory} MB peak'
+
+
+class Runner(bench.Runner):
+    def __init__(self, output_path: Path = OUTPUT_PATH, deps_path: Path = DEPS_PATH,
+                 compiler: typing.Optional[str] = None, jobs: typing.Optional[int] = None,
+                 processes: typing.Optional[int] = None, timeout: float = 10.0):
+        super().__init__(STRESS_PATH, output_path, deps_path, compiler, jobs,
+                         prelude_path=bench.BENCH_PATH / bench.PRELUDE)
+        self.processes = processes or os.cpu_count()
+        self.timeout = timeout
+
+    def names(self) -> typing.List[str]:
+        return [name for name in super().names() if name != CORPUS_NAME]
+
+    def packages(self, name: str) -> typing.List[str]:
+        # Corpus generator is not named after package, it uses listed packages only
+        return self.directives(name).get('packages', []) if name == CORPUS_NAME else super().packages(name)
+
+    def generate(self, corpus_path: Path = CORPUS_PATH, seeds: int = 8, mutations: int = 16) -> typing.List[Path]:
+        failures = self.build([CORPUS_NAME])
+
+        if failures:
+            raise bench.BenchmarkError(failures[CORPUS_NAME])
+
+        seed_path = corpus_path / 'seed'
+        shutil.rmtree(corpus_path, ignore_errors=True)
+        os.makedirs(seed_path)
+
+        args = [str(self.output_path / CORPUS_NAME), str(seed_path), str(seeds)]
+        process = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+        if process.returncode:
+            raise bench.BenchmarkError(process.stdout)
+
+        mutate(seed_path, corpus_path / 'mutated', mutations)
+
+        return corpus_files(corpus_path)
+
+    def stress(self, names: typing.Sequence[str], files: typing.Sequence[Path]) \
+            -> typing.Tuple[typing.List[Decode], typing.Dict[str, str]]:
+        failures = self.build(names)
+        tasks = [(name, path) for name in names if name not in failures
+                 for path in files if path.suffix[1:].lower() in DECODERS.get(name, ())]
+
+        # Every file is decoded in its own process, so crashes, hangs and peak memory are attributed to it
+        with ThreadPoolExecutor(max_workers=self.processes) as executor:
+            decodes = list(executor.map(lambda task: self._decode(*task), tasks))
+
+        return decodes, failures
+
+    def _decode(self, name: str, path: Path) -> Decode:
+        start = time.monotonic()
+        process = subprocess.Popen([str(self.output_path / name), str(path)], stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT, start_new_session=True)
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+
+            # Whole process group is killed, so output pipe is not held open by processes it may have launched
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+        timer = threading.Timer(self.timeout, kill)
+        timer.start()
+
+        output = process.stdout.read().decode('utf-8', errors='replace')
+
+        # Program may close its output before exit, it is waited for without reaping, so it can still be killed,
+        # and timer is stopped before process is reaped, so its group id cannot be reused by the time of killing
+        os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+        timer.cancel()
+        timer.join()
+
+        _, status, usage = os.wait4(process.pid, 0)
+        seconds = time.monotonic() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+        # Peak resident size is in bytes on macOS, and in kilobytes elsewhere
+        peak_memory = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+
+        if os.WIFSIGNALED(status):
+            result = 'timeout' if timed_out.is_set() and os.WTERMSIG(status) == signal.SIGKILL else 'crashed'
+            output += f'Terminated by {signal.Signals(os.WTERMSIG(status)).name}\n'
+        else:
+            code = os.WEXITSTATUS(status)
+            result = 'ok' if code == 0 else 'rejected' if code == REJECTED_CODE else 'failed'
+
+        # Time of decoding itself is reported by program, launch and reading of file are excluded
+        for line in output.splitlines():
+            if line.startswith('{'):
+                seconds = json.loads(line)['seconds']
+
+        return Decode(name, str(path), result, seconds, peak_memory, output)
+
+
+def corpus_files(path: Path) -> typing.List[Path]:
+    return sorted(file for file in path.rglob('*') if file.is_file() and file.suffix[1:].lower() in FORMATS)
+
+
+def mutate(seed_path: Path, output_path: Path, count: int):
+    os.makedirs(output_path, exist_ok=True)
+
+    # Mutations depend on names of seed files only, so the same corpus is generated on every run
+    for path in corpus_files(seed_path):
+        data = path.read_bytes()
+
+        for index in range(count):
+            generator = random.Random(f'{path.name}-{index}')
+            mutation = generator.choice(MUTATIONS)
+            mutated = _mutate(data, mutation, generator)
+            (output_path / f'{path.stem}-{index:03d}-{mutation}{path.suffix}').write_bytes(mutated)
+
+
+def summarize(decodes: typing.Sequence[Decode]) -> typing.List[Summary]:
+    decoders: typing.Dict[str, typing.List[Decode]] = {}
+
+    for decode in decodes:
+        decoders.setdefault(decode.decoder, []).append(decode)
+
+    return [Summary(name, len(entries), sum(entry.status == 'rejected' for entry in entries),
+                    sum(entry.failed for entry in entries), _percentiles([entry.seconds for entry in entries]),
+                    _percentiles([entry.peak_memory for entry in entries]))
+            for name, entries in sorted(decoders.items())]
+
+
+def slowest(decodes: typing.Sequence[Decode], count: int) -> typing.List[Decode]:
+    return sorted(decodes, key=lambda decode: decode.seconds, reverse=True)[:count]
+
+
+def _mutate(data: bytes, mutation: str, generator: random.Random) -> bytes:
+    if len(data) <= SIGNATURE_SIZE:
+        return data
+
+    result = bytearray(data)
+    position = generator.randrange(SIGNATURE_SIZE, len(result))
+
+    if mutation == 'truncate':
+        del result[position:]
+    elif mutation == 'flip':
+        for _ in range(generator.randint(1, 16)):
+            result[generator.randrange(SIGNATURE_SIZE, len(result))] ^= 1 << generator.randrange(8)
+    elif mutation == 'zero':
+        size = generator.randint(1, min(4096, len(result) - position))
+        result[position:position + size] = bytes(size)
+    elif mutation == 'repeat':
+        size = generator.randint(1, min(65536, len(result) - position))
+        result[position:position] = result[position:position + size] * generator.randint(1, 16)
+    else:
+        # Sizes and counts in headers are likely to hold values that make decoders allocate or loop too much
+        result[position:position + 4] = generator.choice(BOUNDARY_VALUES)
+
+    return bytes(result)
+
+
+def _percentiles(values: typing.Sequence[float]) -> typing.Tuple[float, ...]:
+    if len(values) < 2:
+        return (values[0],) * 4 if values else (0.0,) * 4
+
+    quantiles = statistics.quantiles(values, n=100, method='inclusive')
+    return quantiles[49], quantiles[89], quantiles[98], max(values)
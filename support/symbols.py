@@ -0,0 +1,186 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import os
+import typing
+from pathlib import Path
+
+from . import archive
+from .pkgconfig import DEPS_PATH, ROOT_PATH
+
+INDEX_PATH = ROOT_PATH / 'symbols.json'
+INDEX_VERSION = 1
+ARCHIVE_PATTERN = '*/lib/*.a'
+
+
+class Location(typing.NamedTuple):
+    # Archive path relative to deps directory, and name of object file inside it
+    library: str
+    member: str
+
+    @property
+    def dependency(self) -> str:
+        return self.library.split('/', 1)[0]
+
+    def __str__(self):
+        return f'{self.library}({self.member})' if self.member else self.library
+
+
+class Index:
+    def __init__(self, archives: typing.Dict[str, typing.Any]):
+        self.archives = archives
+        self._definitions: typing.Dict[str, typing.Dict[str, typing.List[Location]]] = {}
+
+    def architectures(self) -> typing.List[str]:
+        return sorted({arch for entry in self.archives.values() for arch in entry['slices']})
+
+    def members(self, arch: str) -> typing.Iterator[typing.Tuple[Location, typing.Dict[str, typing.Any]]]:
+        for library, entry in sorted(self.archives.items()):
+            for member, symbols in entry['slices'].get(arch, {}).items():
+                yield Location(library, member), symbols
+
+    def definitions(self, arch: str) -> typing.Dict[str, typing.List[Location]]:
+        # Strong and weak definitions, i.e. symbols that pull archive member in when referenced
+        if arch not in self._definitions:
+            result = {}
+
+            for location, symbols in self.members(arch):
+                for kind in ('defined', 'weak'):
+                    for symbol in symbols[kind]:
+                        result.setdefault(symbol, []).append(location)
+
+            self._definitions[arch] = result
+
+        return self._definitions[arch]
+
+    def lookup(self, symbol: str, arch: typing.Optional[str] = None) -> typing.List[Location]:
+        result = []
+
+        for current_arch in (arch,) if arch else self.architectures():
+            for location in self.definitions(current_arch).get(symbol, ()):
+                if location not in result:
+                    result.append(location)
+
+        return result
+
+
+def load(deps_path: Path = DEPS_PATH, index_path: Path = INDEX_PATH) -> Index:
+    index = {}
+
+    if index_path.exists():
+        with open(index_path) as f:
+            index = json.load(f)
+
+    old_archives = index.get('archives', {}) if index.get('version') == INDEX_VERSION else {}
+    archives = {}
+    changed = False
+
+    # Archives are parsed again only when their size or modification time changes
+    for path in sorted(deps_path.glob(ARCHIVE_PATTERN)):
+        if path.is_symlink():
+            continue
+
+        library = path.relative_to(deps_path).as_posix()
+        stat = path.stat()
+        entry = old_archives.get(library)
+
+        if not entry or entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime_ns:
+            entry = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'slices': parse(path)}
+            changed = True
+
+        archives[library] = entry
+
+    if changed or archives.keys() != old_archives.keys():
+        temp_path = index_path.with_suffix('.tmp')
+
+        with open(temp_path, 'w') as f:
+            json.dump({'version': INDEX_VERSION, 'archives': archives}, f, sort_keys=True)
+
+        os.replace(temp_path, index_path)
+
+    return Index(archives)
+
+
+def parse(path: Path) -> typing.Dict[str, typing.Any]:
+    result = {}
+
+    for arch, data in archive.slices(path.read_bytes()).items():
+        if bytes(data[:len(archive.AR_MAGIC)]) != archive.AR_MAGIC:
+            # Object file is stored as the only member without name
+            obj = archive.parse_object(data)
+            result[arch] = {'': _member_symbols(obj, set(obj.defined))}
+            continue
+
+        members = list(archive.members(data))
+        table_of_contents = {}
+
+        for member in members:
+            if member.name in archive.SYMDEF_NAMES:
+                table_of_contents = archive.table_of_contents(member)
+
+        names = {member.offset: member_name for member, member_name in zip(members, _unique_names(members))}
+        toc_symbols = {}
+
+        # Definitions come from table of contents because linker searches only it
+        for symbol, offset in table_of_contents.items():
+            toc_symbols.setdefault(names.get(offset), set()).add(symbol)
+
+        slice_members = {}
+
+        for member in members:
+            if member.name in archive.SYMDEF_NAMES:
+                continue
+
+            member_name = names[member.offset]
+
+            obj = archive.parse_object(member.data)
+
+            if table_of_contents:
+                defined = toc_symbols.get(member_name, set()) - set(obj.weak)
+            else:
+                defined = set(obj.defined)
+
+            slice_members[member_name] = _member_symbols(obj, defined)
+
+        result[arch] = slice_members
+
+    return result
+
+
+def _member_symbols(obj: archive.Object, defined: typing.Set[str]) -> typing.Dict[str, typing.Any]:
+    return {
+        'defined': sorted(defined),
+        'weak': sorted(obj.weak),
+        'common': sorted(obj.common),
+        'undefined': sorted(obj.undefined),
+        'linker_options': obj.linker_options,
+    }
+
+
+def _unique_names(members: typing.List[archive.Member]) -> typing.List[str]:
+    # Archive may contain several objects with the same name, e.g. from different source directories,
+    # repeated names get ordinal suffix like name.o#2
+    counts = {}
+    result = []
+
+    for member in members:
+        count = counts[member.name] = counts.get(member.name, 0) + 1
+        result.append(member.name if count == 1 else f'{member.name}#{count}')
+
+    return result
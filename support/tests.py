@@ -0,0 +1,277 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import hashlib
+import json
+import os
+import re
+import shlex
+import subprocess
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from . import pkgconfig
+from .digest import hash_files
+from .pkgconfig import DEPS_PATH, ROOT_PATH
+
+TEST_PATH = ROOT_PATH / 'test'
+OUTPUT_PATH = ROOT_PATH / 'build' / 'test'
+PRELUDE = 'aedi.h'
+CACHE_FILENAME = 'results.json'
+COMPILER_FLAGS = ('-std=c++17',)
+DRIVER_SOURCE = TEST_PATH / 'driver' / 'main.cpp'
+DRIVER_NAME = 'aedi-tests'
+
+
+class TestResult(typing.NamedTuple):
+    name: str
+    passed: bool
+    cached: bool = False
+    output: str = ''
+
+    def __str__(self):
+        status = 'passed' if self.passed else 'FAILED'
+        return f"{self.name}: {status}{' (cached)' if self.cached else ''}"
+
+
+class Runner:
+    def __init__(self, test_path: Path = TEST_PATH, output_path: Path = OUTPUT_PATH,
+                 compiler: typing.Optional[str] = None, jobs: typing.Optional[int] = None, use_cache: bool = True,
+                 deps_path: Path = DEPS_PATH, compiler_flags: typing.Sequence[str] = (),
+                 environment: typing.Optional[typing.Dict[str, str]] = None):
+        self.test_path = test_path
+        self.output_path = output_path
+        self.compiler = compiler or os.environ.get('CXX', 'clang++')
+        self.jobs = jobs or os.cpu_count()
+        self.use_cache = use_cache
+        self.deps_path = deps_path
+        # Extra flags for compiling and linking of every test, e.g. to link runtime of sanitizers
+        self.compiler_flags = (*COMPILER_FLAGS, *compiler_flags)
+        self.environment = environment
+        self.pkg_config = pkgconfig.instance(deps_path)
+
+    def names(self) -> typing.List[str]:
+        # Test name is the name of pkg-config package it checks
+        return sorted(path.stem for path in self.test_path.glob('*.cpp'))
+
+    def flags(self, name: str) -> typing.List[str]:
+        return shlex.split(self.pkg_config.run('--cflags', '--libs', '--static', name))
+
+    @staticmethod
+    def linked_archives(flags: typing.Sequence[str]) -> typing.List[Path]:
+        search_paths = [Path(flag[2:]) for flag in flags if flag.startswith('-L')]
+        result = []
+
+        for flag in flags:
+            if not flag.startswith('-l'):
+                continue
+
+            for search_path in search_paths:
+                path = search_path / f'lib{flag[2:]}.a'
+
+                if path.exists():
+                    result.append(path.resolve())
+                    break
+
+        return sorted(set(result))
+
+    def run(self, names: typing.Sequence[str] = ()) -> typing.List[TestResult]:
+        names = names or self.names()
+        cache_path = self.output_path / CACHE_FILENAME
+        cache = {}
+
+        if self.use_cache and cache_path.exists():
+            with open(cache_path) as f:
+                cache = json.load(f)
+
+        flags = {name: self.flags(name) for name in names}
+        archives = {name: self.linked_archives(name_flags) for name, name_flags in flags.items()}
+        archive_hashes = self._hash_archives({path for paths in archives.values() for path in paths},
+                                             cache.get('archives', {}))
+
+        # Result stays valid while test, its flags, compiler, and every linked archive are the same
+        keys = {}
+        prelude = (self.test_path / PRELUDE).read_bytes()
+
+        for name in names:
+            key = hashlib.sha256()
+            key.update(self.compiler.encode('utf-8'))
+            key.update(prelude)
+            key.update((self.test_path / f'{name}.cpp').read_bytes())
+            key.update(' '.join((*self.compiler_flags, *flags[name])).encode('utf-8'))
+
+            for path in archives[name]:
+                key.update(archive_hashes[str(path)][2].encode('ascii'))
+
+            keys[name] = key.hexdigest()
+
+        passed = cache.get('passed', {})
+        cached_results = [TestResult(name, True, cached=True) for name in names if passed.get(name) == keys[name]]
+        cached_names = {result.name for result in cached_results}
+        to_run = [name for name in names if name not in cached_names]
+
+        os.makedirs(self.output_path, exist_ok=True)
+
+        results = self._run_tests(to_run, flags) if to_run else []
+
+        for result in results:
+            if result.passed:
+                passed[result.name] = keys[result.name]
+            else:
+                passed.pop(result.name, None)
+
+        with open(cache_path, 'w') as f:
+            json.dump({'archives': archive_hashes, 'passed': passed}, f, indent=4, sort_keys=True)
+
+        return sorted(cached_results + results)
+
+    @staticmethod
+    def _hash_archives(paths: typing.Set[Path], cache: typing.Dict[str, typing.List[typing.Any]]) \
+            -> typing.Dict[str, typing.List[typing.Any]]:
+        # Archives are hashed again only when their size or modification time changes
+        result = {}
+        to_hash = []
+
+        for path in paths:
+            path_stat = path.stat()
+            entry = cache.get(str(path))
+
+            if entry and entry[:2] == [path_stat.st_size, path_stat.st_mtime_ns]:
+                result[str(path)] = entry
+            else:
+                to_hash.append(path)
+
+        for path, digest in hash_files(to_hash).items():
+            path_stat = path.stat()
+            result[str(path)] = [path_stat.st_size, path_stat.st_mtime_ns, digest]
+
+        return result
+
+    def _run_tests(self, names: typing.Sequence[str], flags: typing.Dict[str, typing.List[str]]) \
+            -> typing.List[TestResult]:
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            return list(executor.map(lambda name: self._run_test(name, flags[name]), names))
+
+    def _run_test(self, name: str, flags: typing.Sequence[str]) -> TestResult:
+        executable = self.output_path / name
+        args = [self.compiler, *self.compiler_flags, '-include', str(self.test_path / PRELUDE),
+                str(self.test_path / f'{name}.cpp'), *flags, '-o', str(executable)]
+        process = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+        if process.returncode != 0:
+            return TestResult(name, False, output=process.stdout)
+
+        return self._execute(name, [str(executable)])
+
+    def _execute(self, name: str, args: typing.Sequence[str]) -> TestResult:
+        process = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                                 env=self.environment)
+        return TestResult(name, process.returncode == 0, output=process.stdout)
+
+
+class DriverRunner(Runner):
+    # All tests are linked into one executable that runs each of them in a forked process,
+    # test's main() function is renamed, and precompiled prelude is shared by all tests
+    def _run_tests(self, names: typing.Sequence[str], flags: typing.Dict[str, typing.List[str]]) \
+            -> typing.List[TestResult]:
+        driver_path = self.output_path / 'driver'
+        os.makedirs(driver_path, exist_ok=True)
+
+        prelude_flags = self._prelude_flags(driver_path)
+
+        def compile_test(name: str) -> typing.Tuple[str, subprocess.CompletedProcess]:
+            args = [self.compiler, *self.compiler_flags, *prelude_flags, f'-Dmain={_function(name)}',
+                    '-c', str(self.test_path / f'{name}.cpp'), *self._compiler_flags(flags[name]),
+                    '-o', str(driver_path / f'{name}.o')]
+            return name, subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            compiled = list(executor.map(compile_test, names))
+
+        results = [TestResult(name, False, output=process.stdout) for name, process in compiled if process.returncode]
+        names = [name for name, process in compiled if not process.returncode]
+
+        if not names:
+            return results
+
+        with open(driver_path / f'{DRIVER_NAME}.h', 'w') as f:
+            f.writelines(f'AEDI_TEST({_function(name)}, "{name}")\n' for name in names)
+
+        # Libraries are linked once, duplicates are removed by pkg-config resolver
+        link_flags = shlex.split(self.pkg_config.run('--libs', '--static', *names))
+        executable = self.output_path / DRIVER_NAME
+        args = [self.compiler, *self.compiler_flags, f'-I{driver_path}', str(DRIVER_SOURCE),
+                *(str(driver_path / f'{name}.o') for name in names), *link_flags, '-o', str(executable)]
+        process = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+        if process.returncode:
+            return results + [TestResult(name, False, output=process.stdout) for name in names]
+
+        process = subprocess.run([str(executable), *names], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                 text=True, env=self.environment)
+        return results + _parse_driver_output(process.stdout, names)
+
+    def _prelude_flags(self, driver_path: Path) -> typing.List[str]:
+        prelude_path = self.test_path / PRELUDE
+        version = subprocess.run([self.compiler, '--version'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                 text=True).stdout
+
+        # Precompiled header is used with clang only, other compilers include prelude as is
+        if 'clang' not in version:
+            return ['-include', str(prelude_path)]
+
+        # Precompiled header can be used only with the same compiler and flags, they are part of its file name
+        key = hashlib.sha256('\0'.join((self.compiler, version, *self.compiler_flags)).encode()).hexdigest()[:16]
+        pch_path = driver_path / f'{PRELUDE}.{key}.pch'
+
+        if not pch_path.exists() or pch_path.stat().st_mtime_ns < prelude_path.stat().st_mtime_ns:
+            temp_path = pch_path.with_suffix(f'.{os.getpid()}.tmp')
+            args = [self.compiler, *self.compiler_flags, '-x', 'c++-header', str(prelude_path), '-o', str(temp_path)]
+            subprocess.run(args, check=True)
+            os.replace(temp_path, pch_path)
+
+        return ['-include-pch', str(pch_path)]
+
+    @staticmethod
+    def _compiler_flags(flags: typing.Sequence[str]) -> typing.List[str]:
+        return [flag for flag in flags if flag.startswith(('-I', '-D', '-F', '-pthread'))]
+
+
+def _function(name: str) -> str:
+    return 'aedi_test_' + re.sub(r'\W', '_', name)
+
+
+def _parse_driver_output(output: str, names: typing.Sequence[str]) -> typing.List[TestResult]:
+    results = {}
+    name, passed, lines = None, False, []
+
+    for line in output.splitlines(keepends=True) + ['==> ']:
+        match = re.match(r'==> (.*): (passed|FAILED)$', line.rstrip('\n')) if line.startswith('==> ') else None
+
+        if match or line == '==> ':
+            if name:
+                results[name] = TestResult(name, passed, output=''.join(lines))
+
+            if match:
+                name, passed, lines = match.group(1), match.group(2) == 'passed', []
+        elif name:
+            lines.append(line)
+
+    # Test without result crashed the driver itself
+    return [results.get(name, TestResult(name, False, output=output)) for name in names]
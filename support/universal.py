@@ -0,0 +1,226 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import fnmatch
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Command line option that leaves only the given architecture enabled
+ARCHITECTURES = {
+    'x86_64': '--disable-arm',
+    'arm64': '--disable-x64',
+}
+
+MERGE_TOOL = 'lipo -create -output {output} {inputs}'
+
+_BINARY_MAGICS = (
+    b'\xcf\xfa\xed\xfe',  # 64-bit Mach-O
+    b'\xce\xfa\xed\xfe',  # 32-bit Mach-O
+    b'\xca\xfe\xba\xbe',  # universal binary
+    b'!<arch>\n',  # static library
+)
+
+# Property with quoted list value, e.g. INTERFACE_LINK_LIBRARIES "a;b" in exported targets
+_CMAKE_PROPERTY_PATTERN = re.compile(r'^(\s*[A-Z_]+ ")([^"]*)("\)?\s*)$')
+
+TextMerger = typing.Callable[[typing.Dict[str, str]], str]
+
+
+class MergeError(Exception):
+    pass
+
+
+def merge_pkg_config(contents: typing.Dict[str, str]) -> str:
+    # Flags may differ between architectures, e.g. because of SIMD code or frameworks, combine them all
+    flag_fields = ('Cflags:', 'Libs:', 'Libs.private:')
+    texts = tuple(contents.values())
+    lines = [text.splitlines(keepends=True) for text in texts]
+
+    if len(set(len(text_lines) for text_lines in lines)) != 1:
+        raise MergeError('pkg-config files have different number of lines')
+
+    result = []
+
+    for variants in zip(*lines):
+        first = variants[0]
+
+        if all(line == first for line in variants):
+            result.append(first)
+            continue
+
+        field = next((field for field in flag_fields if all(line.startswith(field) for line in variants)), None)
+
+        if not field:
+            raise MergeError(f'pkg-config files have conflicting lines: {variants}')
+
+        flags = []
+
+        for line in variants:
+            for flag in line[len(field):].split():
+                if flag not in flags:
+                    flags.append(flag)
+
+        result.append(f"{field} {' '.join(flags)}\n")
+
+    return ''.join(result)
+
+
+def merge_cmake(contents: typing.Dict[str, str]) -> str:
+    # Per-architecture roots are already replaced with destination, so modules point at merged binaries,
+    # and only lists in values of properties may remain different, e.g. libraries or compile options
+    texts = tuple(contents.values())
+    lines = [text.splitlines(keepends=True) for text in texts]
+
+    if len(set(len(text_lines) for text_lines in lines)) != 1:
+        raise MergeError('CMake files have different number of lines')
+
+    result = []
+
+    for variants in zip(*lines):
+        first = variants[0]
+
+        if all(line == first for line in variants):
+            result.append(first)
+            continue
+
+        matches = [_CMAKE_PROPERTY_PATTERN.match(line) for line in variants]
+
+        if not all(match and match.group(1, 3) == matches[0].group(1, 3) for match in matches):
+            raise MergeError(f'CMake files have conflicting lines: {variants}')
+
+        items = []
+
+        for match in matches:
+            for item in match.group(2).split(';'):
+                if item not in items:
+                    items.append(item)
+
+        result.append(f"{matches[0].group(1)}{';'.join(items)}{matches[0].group(3)}")
+
+    return ''.join(result)
+
+
+class Merger:
+    def __init__(self, tool_command: str = MERGE_TOOL):
+        self.tool_command = tool_command
+        # Handlers for text files that differ between architectures, matched by file name
+        self.text_mergers: typing.List[typing.Tuple[str, TextMerger]] = [
+            ('*.pc', merge_pkg_config),
+            ('*.cmake', merge_cmake),
+        ]
+
+    def merge(self, sources: typing.Dict[str, Path], destination: Path):
+        paths = set()
+
+        for root in sources.values():
+            for dirpath, _, filenames in os.walk(root):
+                relpath = Path(dirpath).relative_to(root)
+                paths.update(relpath / filename for filename in filenames)
+
+        for relpath in sorted(paths):
+            inputs = {arch: root / relpath for arch, root in sources.items() if os.path.lexists(root / relpath)}
+            output = destination / relpath
+            os.makedirs(output.parent, exist_ok=True)
+
+            if os.path.lexists(output):
+                os.unlink(output)
+
+            self._merge_file(inputs, sources, destination, output)
+
+    def _merge_file(self, inputs: typing.Dict[str, Path], sources: typing.Dict[str, Path], destination: Path,
+                    output: Path):
+        first = next(iter(inputs.values()))
+
+        if first.is_symlink():
+            os.symlink(os.readlink(first), output)
+            return
+
+        contents = {arch: path.read_bytes() for arch, path in inputs.items()}
+
+        if len(set(contents.values())) == 1:
+            shutil.copy2(first, output)
+            return
+
+        if all(content.startswith(_BINARY_MAGICS) for content in contents.values()):
+            inputs_string = ' '.join(shlex.quote(str(path)) for path in inputs.values())
+            command = self.tool_command.format(output=shlex.quote(str(output)), inputs=inputs_string)
+            subprocess.run(shlex.split(command), check=True)
+            shutil.copymode(first, output)
+            return
+
+        try:
+            # Per-architecture roots may appear in text files, e.g. in CMake modules
+            texts = {arch: content.decode().replace(str(sources[arch]), str(destination))
+                     for arch, content in contents.items()}
+        except UnicodeDecodeError:
+            raise MergeError(f'Cannot merge binary file {output}')
+
+        if len(set(texts.values())) == 1:
+            merged = next(iter(texts.values()))
+        else:
+            text_merger = next((merger for pattern, merger in self.text_mergers
+                                if fnmatch.fnmatch(output.name, pattern)), None)
+
+            if not text_merger:
+                raise MergeError(f'No merger for file {output}')
+
+            merged = text_merger(texts)
+
+        output.write_text(merged)
+        shutil.copymode(first, output)
+
+
+def build(script: str, args: typing.Sequence[str], build_path: Path, output_path: Path, merger: Merger):
+    universal_path = build_path / 'universal'
+    arch_paths = {arch: universal_path / arch for arch in ARCHITECTURES}
+
+    def build_architecture(arch: str):
+        arch_path = arch_paths[arch]
+        shutil.rmtree(arch_path, ignore_errors=True)
+        os.makedirs(arch_path)
+
+        arch_args = [sys.executable, script] + list(args) + [
+            ARCHITECTURES[arch],
+            '--build-path', str(build_path / arch),
+            '--output-path', str(arch_path / 'output'),
+        ]
+
+        # Output of concurrent builds is kept separately, it would be interleaved otherwise
+        log_path = universal_path / f'{arch}.log'
+
+        with open(log_path, 'w') as log:
+            result = subprocess.run(arch_args, stdout=log, stderr=subprocess.STDOUT)
+
+        if result.returncode != 0:
+            raise RuntimeError(f'Build for {arch} failed, see {log_path}')
+
+    os.makedirs(universal_path, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=len(arch_paths)) as executor:
+        # Collect results to propagate exceptions from worker threads
+        tuple(executor.map(build_architecture, arch_paths))
+
+    sources = {arch: path / 'output' for arch, path in arch_paths.items()}
+    merger.merge(sources, output_path)
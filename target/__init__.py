@@ -16,13 +16,15 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
+from support import rewrite
+
 from .library import *
 from .main import *
 from .tool import *
 
 
 def targets():
-    return (
+    result = (
         PrBoomPlusTarget(),
         DsdaDoom(),
         ChocolateDoomTarget(),
@@ -87,3 +89,8 @@ def targets():
         GlslangTarget(),
         QPakManTarget(),
     )
+
+    # Installed files of targets are rewritten by their own rules regardless of build features in use
+    rewrite.install(result)
+
+    return result
@@ -19,11 +19,12 @@
 import os
 import shutil
 import subprocess
-from pathlib import Path
 
 import aedi.target.base as base
 from aedi.state import BuildState
 
+from support.rewrite import Rule
+
 
 class Bzip2Target(base.MakeTarget):
     def __init__(self, name='bzip2'):
@@ -46,7 +47,11 @@ class Bzip2Target(base.MakeTarget):
         opts['bzip2recover'] = None
         # Copy compiler flags from environment to command line argument, they would be overridden by Makefile otherwise
         cflags = 'CFLAGS'
-        opts[cflags] = state.environment[cflags] + ' -D_FILE_OFFSET_BITS=64 -O2'
+        env_cflags = state.environment[cflags]
+        opts[cflags] = env_cflags + ' -D_FILE_OFFSET_BITS=64'
+        # Keep Makefile's optimization level unless it was set by optimization profile
+        if not any(flag.startswith('-O') for flag in env_cflags.split()):
+            opts[cflags] += ' -O2'
 
     def post_build(self, state: BuildState):
         opts = state.options
@@ -76,9 +81,9 @@ class DumbTarget(base.CMakeStaticDependencyTarget):
 
         super().configure(state)
 
-    @staticmethod
-    def _process_pkg_config(pcfile: Path, line: str) -> str:
-        return 'Libs: -L${libdir} -ldumb\n' if line.startswith('Libs:') else line
+    rewrite_rules = (
+        Rule('lib/pkgconfig/*.pc', r'^Libs:.*$', 'Libs: -L${libdir} -ldumb'),
+    )
 
 
 class FlacTarget(base.CMakeStaticDependencyTarget):
@@ -158,14 +163,10 @@ class FreeTypeTarget(base.CMakeStaticDependencyTarget):
         os.makedirs(bin_path)
         shutil.copy(state.patch_path / 'freetype-config', bin_path)
 
-        def update_linker_flags(line: str):
-            link_flags = '-lbz2 -lpng16 -lz'
-            link_var = '  INTERFACE_LINK_LIBRARIES '
-
-            return f'{link_var}"{link_flags}"\n' if line.startswith(link_var) else line
-
-        cmake_module = state.install_path / 'lib/cmake/freetype/freetype-config.cmake'
-        self.update_text_file(cmake_module, update_linker_flags)
+    rewrite_rules = (
+        Rule('lib/cmake/freetype/freetype-config.cmake',
+             r'^  INTERFACE_LINK_LIBRARIES .*$', '  INTERFACE_LINK_LIBRARIES "-lbz2 -lpng16 -lz"'),
+    )
 
 
 class FtglTarget(base.ConfigureMakeStaticDependencyTarget):
@@ -205,28 +206,11 @@ class GlewTarget(base.CMakeStaticDependencyTarget):
 
     LINKER_FLAGS = '-framework OpenGL'
 
-    def post_build(self, state: BuildState):
-        super().post_build(state)
-
-        def update_linker_flags(line: str):
-            link_var = '  INTERFACE_LINK_LIBRARIES '
-
-            if line.startswith(link_var):
-                return f'{link_var}"{GlewTarget.LINKER_FLAGS}"\n'
-
-            return line
-
-        cmake_module = state.install_path / 'lib/cmake/glew/glew-targets.cmake'
-        self.update_text_file(cmake_module, update_linker_flags)
-
-    @staticmethod
-    def _process_pkg_config(pcfile: Path, line: str) -> str:
-        libs = 'Libs:'
-
-        if line.startswith(libs):
-            return libs + ' -L${libdir} -lGLEW ' + GlewTarget.LINKER_FLAGS + os.linesep
-
-        return line
+    rewrite_rules = (
+        Rule('lib/cmake/glew/glew-targets.cmake',
+             r'^  INTERFACE_LINK_LIBRARIES .*$', f'  INTERFACE_LINK_LIBRARIES "{LINKER_FLAGS}"'),
+        Rule('lib/pkgconfig/*.pc', r'^Libs:.*$', 'Libs: -L${libdir} -lGLEW ' + LINKER_FLAGS),
+    )
 
 
 class GlibTarget(base.MesonStaticTarget):
@@ -255,9 +239,10 @@ class GlibTarget(base.MesonStaticTarget):
         super().post_build(state)
         self.make_platform_header(state, '../lib/glib-2.0/include/glibconfig.h')
 
-    @staticmethod
-    def _process_pkg_config(pcfile: Path, line: str) -> str:
-        return 'exec_prefix=${prefix}\n' + line if line.startswith('libdir=') else line
+    rewrite_rules = (
+        # Lookahead from the beginning of file skips files that already have the variable
+        Rule('lib/pkgconfig/*.pc', r'\A(?![\s\S]*^exec_prefix=)([\s\S]*?^)(libdir=)', r'\1exec_prefix=${prefix}\n\2'),
+    )
 
 
 class GmeTarget(base.CMakeStaticDependencyTarget):
@@ -287,23 +272,15 @@ class HarfBuzzTarget(base.CMakeStaticDependencyTarget):
         state.options['HB_HAVE_FREETYPE'] = 'ON'
         super().configure(state)
 
+    rewrite_rules = (
+        Rule('lib/cmake/harfbuzz/harfbuzzConfig.cmake',
+             r'^  INTERFACE_INCLUDE_DIRECTORIES .*$', '  INTERFACE_INCLUDE_DIRECTORIES "${_IMPORT_PREFIX}/include/harfbuzz"'),
+        Rule('lib/cmake/harfbuzz/harfbuzzConfig.cmake',
+             r'^  INTERFACE_LINK_LIBRARIES .*$', '  INTERFACE_LINK_LIBRARIES "-framework ApplicationServices"'),
+    )
+
     def post_build(self, state: BuildState):
         super().post_build(state)
-
-        def update_config_cmake(line: str):
-            include_var = '  INTERFACE_INCLUDE_DIRECTORIES '
-            link_var = '  INTERFACE_LINK_LIBRARIES '
-
-            if line.startswith(include_var):
-                return include_var + '"${_IMPORT_PREFIX}/include/harfbuzz"\n'
-            elif line.startswith(link_var):
-                return link_var + '"-framework ApplicationServices"\n'
-
-            return line
-
-        config_path = state.install_path / 'lib/cmake/harfbuzz/harfbuzzConfig.cmake'
-        self.update_text_file(config_path, update_config_cmake)
-
         self.write_pc_file(state, description='HarfBuzz text shaping library', version='2.8.2', libs='-lharfbuzz',
                            libs_private='-lc++ -framework CoreFoundation -framework CoreGraphics -framework CoreText')
 
@@ -359,7 +336,8 @@ class MadTarget(base.ConfigureMakeStaticDependencyTarget):
         return state.has_source_file('mad.h')
 
     def configure(self, state: BuildState):
-        state.options['--enable-fpm'] = '64bit'
+        # Fixed-point math implementation can be changed by variant of build options matrix
+        state.options.setdefault('--enable-fpm', '64bit')
         super().configure(state)
 
     def post_build(self, state: BuildState):
@@ -396,14 +374,9 @@ class ModPlugTarget(base.ConfigureMakeStaticDependencyTarget):
     def detect(self, state: BuildState) -> bool:
         return state.has_source_file('libmodplug.pc.in')
 
-    @staticmethod
-    def _process_pkg_config(pcfile: Path, line: str) -> str:
-        libs_private = 'Libs.private:'
-
-        if line.startswith(libs_private):
-            return libs_private + ' -lc++\n'
-
-        return line
+    rewrite_rules = (
+        Rule('lib/pkgconfig/*.pc', r'^Libs\.private:.*$', 'Libs.private: -lc++'),
+    )
 
 
 class MoltenVKTarget(base.MakeTarget):
@@ -506,17 +479,10 @@ class OpusTarget(base.CMakeStaticDependencyTarget):
         state.options['PC_BUILD'] = 'floating-point'
         super().configure(state)
 
-    @staticmethod
-    def _process_pkg_config(pcfile: Path, line: str) -> str:
-        cflags = 'Cflags:'
-        libs = 'Libs:'
-
-        if line.startswith(cflags):
-            return cflags + ' -I${includedir}/opus\n'
-        elif line.startswith(libs):
-            return libs + ' -L${libdir} -lopus\n'
-
-        return line
+    rewrite_rules = (
+        Rule('lib/pkgconfig/*.pc', r'^Cflags:.*$', 'Cflags: -I${includedir}/opus'),
+        Rule('lib/pkgconfig/*.pc', r'^Libs:.*$', 'Libs: -L${libdir} -lopus'),
+    )
 
 
 class OpusFileTarget(base.ConfigureMakeStaticDependencyTarget):
@@ -603,15 +569,9 @@ class SamplerateTarget(base.CMakeStaticDependencyTarget):
             'https://github.com/libsndfile/libsamplerate/releases/download/0.2.1/libsamplerate-0.2.1.tar.bz2',
             'f6323b5e234753579d70a0af27796dde4ebeddf58aae4be598e39b3cee00c90a')
 
-    def post_build(self, state: BuildState):
-        super().post_build(state)
-
-        def update_linker_flags(line: str):
-            link_var = '  INTERFACE_LINK_LIBRARIES '
-            return None if line.startswith(link_var) else line
-
-        cmake_module = state.install_path / 'lib/cmake/SampleRate/SampleRateTargets.cmake'
-        self.update_text_file(cmake_module, update_linker_flags)
+    rewrite_rules = (
+        Rule('lib/cmake/SampleRate/SampleRateTargets.cmake', r'^  INTERFACE_LINK_LIBRARIES .*\n', ''),
+    )
 
 
 class Sdl2Target(base.CMakeStaticDependencyTarget):
@@ -711,9 +671,10 @@ class Sdl2TtfTarget(base.CMakeStaticDependencyTarget):
         super().post_build(state)
         shutil.move(state.install_path / 'SDL2_ttf.framework/Resources', state.install_path / 'lib/cmake/SDL2_ttf')
 
-    @staticmethod
-    def _process_pkg_config(pcfile: Path, line: str) -> str:
-        return line + 'Requires.private: freetype2\n' if line.startswith('Requires:') else line
+    rewrite_rules = (
+        Rule('lib/pkgconfig/*.pc', r'\A(?![\s\S]*^Requires\.private:.*\bfreetype2\b)([\s\S]*?^Requires:.*)$',
+             r'\1\nRequires.private: freetype2'),
+    )
 
 
 class SfmlTarget(base.CMakeStaticDependencyTarget):
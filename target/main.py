@@ -22,6 +22,12 @@ from platform import machine
 from aedi.state import BuildState
 from aedi.target.base import CMakeMainTarget, MakeMainTarget, MesonStaticTarget
 
+from support import native
+
+# Sources of WAD generator tool, its build rules in data/CMakeLists.txt are not included,
+# because this file also lists WAD lumps that are different in every port
+RDATAWAD_SOURCES = ('data/rd_*',)
+
 
 class PrBoomPlusTarget(CMakeMainTarget):
     def __init__(self, name='prboom-plus'):
@@ -40,7 +46,9 @@ class PrBoomPlusTarget(CMakeMainTarget):
 
         if state.architecture() != machine():
             opts['FORCE_CROSSCOMPILE'] = 'YES'
-            opts['IMPORT_EXECUTABLES'] = state.native_build_path / 'ImportExecutables.cmake'
+            # Helper tool is the same in prboom-plus and dsda-doom, cached native build can be shared by them
+            tools_path = native.tools_path(state, self.src_root, ('rdatawad',), RDATAWAD_SOURCES)
+            opts['IMPORT_EXECUTABLES'] = tools_path / 'ImportExecutables.cmake'
 
         super().configure(state)
 
@@ -228,8 +236,11 @@ class QuakespasmExpTarget(CMakeMainTarget):
             opts['QUAKE_LTO'] = 'ON'
 
             if state.architecture() != machine():
-                opts['MakeQuakePak_DIR'] = state.native_build_path
-                opts['EntFixesGenerator_DIR'] = state.native_build_path
+                # Only helper tools are built natively, and they depend on top-level project and their own sources
+                tools_path = native.tools_path(state, tools=('MakeQuakePak', 'EntFixesGenerator'),
+                                               key_paths=('CMakeLists.txt', 'Tools'))
+                opts['MakeQuakePak_DIR'] = tools_path
+                opts['EntFixesGenerator_DIR'] = tools_path
 
         super().configure(state)
 
@@ -0,0 +1,136 @@
+#include <stdio.h>
+#include <string.h>
+#include <unistd.h>
+#include <sys/wait.h>
+
+// List of tests is generated, every line is AEDI_TEST(function, "name")
+#define AEDI_TEST(FUNCTION, NAME) int FUNCTION();
+#include "aedi-tests.h"
+#undef AEDI_TEST
+
+struct Test
+{
+    const char* name;
+    int (*function)();
+};
+
+static const Test tests[] =
+{
+#define AEDI_TEST(FUNCTION, NAME) { NAME, FUNCTION },
+#include "aedi-tests.h"
+#undef AEDI_TEST
+};
+
+static bool RunTest(const Test& test)
+{
+    int output[2];
+
+    if (pipe(output) != 0)
+    {
+        perror("pipe");
+        return false;
+    }
+
+    fflush(stdout);
+
+    // Every test runs in its own process, so crash or global state of one test cannot affect others
+    const pid_t pid = fork();
+
+    if (pid == 0)
+    {
+        close(output[0]);
+        dup2(output[1], STDOUT_FILENO);
+        dup2(output[1], STDERR_FILENO);
+        close(output[1]);
+
+        const int result = test.function();
+        fflush(stdout);
+        _exit(result);
+    }
+
+    close(output[1]);
+
+    if (pid < 0)
+    {
+        perror("fork");
+        close(output[0]);
+        return false;
+    }
+
+    char buffer[4096];
+    size_t length = 0;
+
+    while (true)
+    {
+        const ssize_t count = read(output[0], buffer + length, sizeof buffer - length - 1);
+
+        if (count <= 0)
+        {
+            break;
+        }
+
+        length += count;
+
+        if (length == sizeof buffer - 1)
+        {
+            // Keep the beginning of output, and drain the rest
+            char drain[4096];
+            while (read(output[0], drain, sizeof drain) > 0) {}
+            break;
+        }
+    }
+
+    close(output[0]);
+    buffer[length] = '\0';
+
+    int status = 0;
+    waitpid(pid, &status, 0);
+
+    const bool passed = WIFEXITED(status) && WEXITSTATUS(status) == 0;
+    printf("==> %s: %s\n%s", test.name, passed ? "passed" : "FAILED", buffer);
+
+    if (length > 0 && buffer[length - 1] != '\n')
+    {
+        puts("");
+    }
+
+    return passed;
+}
+
+int main(int argc, char** argv)
+{
+    int failed = 0;
+
+    for (int i = 1; i < argc; ++i)
+    {
+        bool found = false;
+
+        for (const Test& test : tests)
+        {
+            found = found || strcmp(argv[i], test.name) == 0;
+        }
+
+        if (!found)
+        {
+            printf("==> %s: FAILED\nUnknown test\n", argv[i]);
+            ++failed;
+        }
+    }
+
+    for (const Test& test : tests)
+    {
+        bool selected = argc < 2;
+
+        for (int i = 1; i < argc && !selected; ++i)
+        {
+            selected = strcmp(argv[i], test.name) == 0;
+        }
+
+        if (selected && !RunTest(test))
+        {
+            ++failed;
+        }
+    }
+
+    return failed == 0 ? 0 : 1;
+}
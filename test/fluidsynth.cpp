@@ -14,4 +14,6 @@ int main()
 
     delete_fluid_synth(synth);
     delete_fluid_settings(settings);
+
+    return 0;
 }
@@ -0,0 +1,82 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_PATH))
+
+from support import archive  # noqa: E402
+
+MEMBERS = [
+    ('a.o', b'\x01' * 16),
+    ('very_long_member_name_of_object.o', b'\x02' * 24),
+    # Static libraries may contain several members with the same name
+    ('a.o', b'\x03' * 8),
+]
+SYMBOLS = [('_b', 1), ('_a', 0), ('_c', 2)]
+
+
+class TestArchive(unittest.TestCase):
+    def test_round_trip(self):
+        data = archive.write_archive(MEMBERS, SYMBOLS)
+        members = list(archive.members(memoryview(data)))
+
+        self.assertEqual(members[0].name, '__.SYMDEF SORTED')
+        self.assertEqual([(member.name, bytes(member.data)) for member in members[1:]], MEMBERS)
+
+        # Table of contents points at headers of members that define symbols
+        offsets = archive.table_of_contents(members[0])
+        self.assertEqual(offsets, {symbol: members[index + 1].offset for symbol, index in SYMBOLS})
+
+        # Archive is written deterministically, without dates, user and group ids
+        for member in members:
+            self.assertEqual((member.date, member.uid, member.gid), (0, 0, 0))
+
+        self.assertEqual(archive.write_archive(MEMBERS, SYMBOLS), data)
+
+    def test_padding(self):
+        data = archive.write_archive([('odd.o', b'\x01' * 5)], [])
+        member = list(archive.members(memoryview(data)))[1]
+
+        # Member data starts and ends at 8 bytes boundary
+        self.assertEqual(bytes(member.data), b'\x01' * 5 + b'\0' * 3)
+        self.assertEqual(len(data) % 8, 0)
+
+    def test_fat_round_trip(self):
+        first = archive.write_archive(MEMBERS[:1], [])
+        second = archive.write_archive(MEMBERS[1:], [])
+        fat = [archive.FatSlice(0x01000007, 3, 14, memoryview(first)),
+               archive.FatSlice(0x0100000c, 0, 14, memoryview(second))]
+
+        data = archive.write_fat(fat)
+        slices = archive.slices(data)
+
+        self.assertEqual(list(slices), ['x86_64', 'arm64'])
+        self.assertEqual(bytes(slices['x86_64']), first)
+        self.assertEqual(bytes(slices['arm64']), second)
+
+    def test_not_archive(self):
+        with self.assertRaises(archive.ArchiveError):
+            list(archive.members(memoryview(b'not an archive')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_PATH))
+
+from support import bench  # noqa: E402
+
+
+def _measurement(samples, name='decode'):
+    return bench.Measurement('libpng16', name, 'MB/s', 1, samples)
+
+
+class BootstrapIntervalTest(unittest.TestCase):
+    def test_identical(self):
+        samples = [100.0, 101.0, 99.0, 100.5, 99.5]
+        low, high = bench._bootstrap_interval(samples, samples, 0.95, random.Random(0))
+
+        self.assertLessEqual(low, 0.0)
+        self.assertGreaterEqual(high, 0.0)
+
+    def test_slowdown(self):
+        baseline = [100.0, 101.0, 99.0, 100.5, 99.5]
+        candidate = [80.0, 81.0, 79.0, 80.5, 79.5]
+        low, high = bench._bootstrap_interval(baseline, candidate, 0.95, random.Random(0))
+
+        self.assertLessEqual(low, high)
+        self.assertLess(high, 0.0)
+        self.assertGreater(low, -0.3)
+
+    def test_deterministic(self):
+        baseline = [100.0, 90.0, 110.0, 95.0]
+        candidate = [105.0, 85.0, 115.0, 100.0]
+
+        self.assertEqual(bench._bootstrap_interval(baseline, candidate, 0.9, random.Random(1)),
+                         bench._bootstrap_interval(baseline, candidate, 0.9, random.Random(1)))
+
+
+class CompareTest(unittest.TestCase):
+    def test_regression(self):
+        comparisons = bench.compare([_measurement([100.0, 101.0, 99.0])], [_measurement([80.0, 81.0, 79.0])])
+
+        self.assertEqual(len(comparisons), 1)
+        self.assertAlmostEqual(comparisons[0].change, -0.2)
+        self.assertTrue(comparisons[0].regressed)
+
+    def test_below_threshold(self):
+        comparisons = bench.compare([_measurement([100.0, 100.0, 100.0])], [_measurement([98.0, 98.0, 98.0])])
+        self.assertFalse(comparisons[0].regressed)
+
+    def test_noise(self):
+        # Slowdown of medians is larger than threshold, but samples overlap too much to call it regression
+        baseline = [100.0, 60.0, 140.0, 70.0, 130.0]
+        candidate = [90.0, 55.0, 135.0, 65.0, 125.0]
+        comparisons = bench.compare([_measurement(baseline)], [_measurement(candidate)])
+
+        self.assertLess(comparisons[0].change, -0.05)
+        self.assertFalse(comparisons[0].regressed)
+
+    def test_improvement(self):
+        comparisons = bench.compare([_measurement([100.0, 101.0, 99.0])], [_measurement([120.0, 121.0, 119.0])])
+        self.assertFalse(comparisons[0].regressed)
+
+    def test_merge(self):
+        baseline = [_measurement([100.0]), _measurement([101.0])]
+        comparisons = bench.compare(baseline, [_measurement([80.0, 81.0])])
+
+        self.assertEqual([comparison.name for comparison in comparisons], ['decode'])
+        self.assertAlmostEqual(comparisons[0].baseline, 100.5)
+
+    def test_missing(self):
+        # Benchmark that failed to build or run in candidate must not pass the gate
+        baseline = [_measurement([100.0]), _measurement([50.0], 'encode')]
+        comparisons = bench.compare(baseline, [_measurement([100.0, 101.0])])
+
+        self.assertEqual([(comparison.name, comparison.missing) for comparison in comparisons],
+                         [('decode', False), ('encode', True)])
+        self.assertFalse(comparisons[0].failed)
+        self.assertTrue(comparisons[1].failed)
+        self.assertIn('MISSING', str(comparisons[1]))
+
+    def test_missing_samples(self):
+        comparisons = bench.compare([_measurement([100.0])], [_measurement([])])
+        self.assertTrue(comparisons[0].missing)
+
+
+if __name__ == '__main__':
+    unittest.main()
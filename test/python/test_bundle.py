@@ -0,0 +1,95 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_PATH))
+
+from support import bundle  # noqa: E402
+
+
+class ExtractTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.source = self.root / 'source'
+        self.destination = self.root / 'destination'
+        self.bundle_path = self.root / 'test.bundle'
+        os.makedirs(self.source / 'lib')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _pack(self) -> bundle.Bundle:
+        bundle.pack(self.source, self.bundle_path, 'xz')
+        return bundle.Bundle(self.bundle_path)
+
+    def test_round_trip(self):
+        (self.source / 'lib' / 'libfoo.a').write_bytes(b'archive')
+        os.symlink('libfoo.a', self.source / 'lib' / 'libbar.a')
+
+        self._pack().extract(self.destination)
+
+        self.assertEqual((self.destination / 'lib' / 'libfoo.a').read_bytes(), b'archive')
+        self.assertEqual(os.readlink(self.destination / 'lib' / 'libbar.a'), 'libfoo.a')
+
+    def test_link_outside(self):
+        os.symlink('../../outside', self.source / 'lib' / 'escape')
+
+        with self.assertRaises(bundle.BundleError):
+            self._pack().extract(self.destination)
+
+        self.assertFalse(os.path.lexists(self.destination / 'lib' / 'escape'))
+
+    def test_absolute_link(self):
+        os.symlink(str(self.root), self.source / 'lib' / 'escape')
+
+        with self.assertRaises(bundle.BundleError):
+            self._pack().extract(self.destination)
+
+    def test_link_chain_outside(self):
+        # Both link targets look harmless alone, but the second one leaves destination through the first one
+        os.symlink('.', self.source / 'here')
+        os.symlink('here/..', self.source / 'parent')
+
+        with self.assertRaises(bundle.BundleError):
+            self._pack().extract(self.destination)
+
+        self.assertFalse(os.path.lexists(self.destination / 'parent'))
+
+    def test_existing_link(self):
+        (self.source / 'lib' / 'libfoo.a').write_bytes(b'archive')
+        outside = self.root / 'outside'
+        outside.write_bytes(b'original')
+
+        os.makedirs(self.destination / 'lib')
+        os.symlink(outside, self.destination / 'lib' / 'libfoo.a')
+
+        self._pack().extract(self.destination)
+
+        self.assertEqual(outside.read_bytes(), b'original')
+        self.assertFalse((self.destination / 'lib' / 'libfoo.a').is_symlink())
+
+
+if __name__ == '__main__':
+    unittest.main()
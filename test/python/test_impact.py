@@ -0,0 +1,77 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_PATH))
+
+from support import impact  # noqa: E402
+
+SOURCE = '''class BaseTarget(base.CMakeStaticDependencyTarget):
+    def __init__(self, name=None):
+        super().__init__(name)
+
+
+class FirstTarget(BaseTarget):
+    def __init__(self, name='first'):
+        super().__init__(name)
+
+    def prepare_source(self, state: BuildState):
+        state.download_source('https://example.com/first.tar.gz', '0', patches='first-fix-build')
+
+
+class SecondTarget(BaseTarget):
+    def __init__(self, name='second'):
+        super().__init__(name)
+
+
+class ThirdTarget(base.MakeTarget):
+    def __init__(self, name='third'):
+        super().__init__(name)
+'''
+
+
+class TestImpact(unittest.TestCase):
+    def test_changed_lines(self):
+        diff = '''--- a/target/library.py
++++ b/target/library.py
+@@ -10 +10 @@ class FirstTarget(BaseTarget):
+@@ -20,0 +21,3 @@ class SecondTarget(BaseTarget):
+@@ -30,2 +33,0 @@ class ThirdTarget(base.MakeTarget):
+'''
+        # Removed lines are attributed to the line they were removed at
+        self.assertEqual(impact._changed_lines(diff), {10, 21, 22, 23, 33})
+
+    def test_changed_target(self):
+        self.assertEqual(impact._changed_targets(SOURCE, {11}), {'first'})
+        self.assertEqual(impact._changed_targets(SOURCE, {20}), {'third'})
+        self.assertEqual(impact._changed_targets(SOURCE, {5}), set())
+
+    def test_changed_base_class(self):
+        self.assertEqual(impact._changed_targets(SOURCE, {2}), {'first', 'second'})
+
+    def test_patched_target(self):
+        self.assertEqual(impact._patched_targets(SOURCE, {'first-fix-build'}), {'first'})
+        self.assertEqual(impact._patched_targets(SOURCE, {'unknown'}), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_PATH))
+
+from support import integrity  # noqa: E402
+
+
+class VerifyTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.deps_path = root / 'deps'
+        self.manifest_path = root / 'integrity.json'
+        self.cache_path = root / 'integrity-cache.json'
+
+        os.makedirs(self.deps_path / 'zlib' / 'lib')
+        self.library_path = self.deps_path / 'zlib' / 'lib' / 'libz.a'
+        self.library_path.write_bytes(b'archive')
+        os.symlink('libz.a', self.deps_path / 'zlib' / 'lib' / 'libzlib.a')
+
+        integrity.update(self.deps_path, self.manifest_path, self.cache_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _verify(self):
+        return integrity.verify(self.deps_path, self.manifest_path, self.cache_path)
+
+    def test_intact(self):
+        self.assertEqual(self._verify(), [])
+
+    def test_fresh_checkout(self):
+        # Manifest comes from repository, cache of modification times does not exist yet
+        self.cache_path.unlink()
+        os.utime(self.library_path, ns=(0, 0))
+
+        self.assertEqual(self._verify(), [])
+        self.assertTrue(self.cache_path.exists())
+
+    def test_modified_content(self):
+        self.cache_path.unlink()
+        self.library_path.write_bytes(b'ARCHIVE')
+
+        self.assertEqual(self._verify(), ['Modified file zlib/lib/libz.a, content differs'])
+
+    def test_added_and_removed(self):
+        (self.deps_path / 'zlib' / 'lib' / 'libzlib.a').unlink()
+        (self.deps_path / 'zlib' / 'extra.h').write_bytes(b'')
+
+        self.assertEqual(self._verify(), ['Missing file zlib/lib/libzlib.a', 'Unexpected file zlib/extra.h'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_PATH))
+sys.path.append(str(ROOT_PATH / 'core'))
+
+from support import lto  # noqa: E402
+
+
+class TestCodegenFlags(unittest.TestCase):
+    def test_languages(self):
+        environment = {
+            'CFLAGS': '-arch arm64 -O2 -flto=thin -mmacosx-version-min=10.15 -I/deps/include -DNDEBUG',
+            'CXXFLAGS': '-arch arm64 -O2 -flto=thin -mmacosx-version-min=10.15 -stdlib=libc++ -std=c++17 '
+                        '-ffunction-sections -mllvm -inline-threshold=100',
+        }
+
+        # C++ only options are included, language, preprocessor and LTO options are not
+        self.assertEqual(lto._codegen_flags(environment),
+                         (['-arch', 'arm64'], ['-O2', '-mmacosx-version-min=10.15', '-ffunction-sections']))
+
+    def test_architectures(self):
+        environment = {'CFLAGS': '-arch x86_64 -arch arm64', 'CXXFLAGS': '-arch arm64 --target=arm64-apple-macos11'}
+
+        self.assertEqual(lto._codegen_flags(environment),
+                         (['-arch', 'x86_64', '-arch', 'arm64', '--target=arm64-apple-macos11'], []))
+
+    def test_empty(self):
+        self.assertEqual(lto._codegen_flags({}), ([], []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import subprocess
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_PATH))
+sys.path.append(str(ROOT_PATH / 'core'))
+
+from support import native  # noqa: E402
+from target import main  # noqa: E402
+
+TOOL_SOURCES = {
+    'data/rd_main.c': 'int main() { return 0; }\n',
+    'data/rd_util.h': 'void die(const char *message);\n',
+}
+
+
+class TestNative(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_path = Path(temp_dir.name)
+
+    def _repository(self, name: str, files: dict) -> types.SimpleNamespace:
+        path = self.temp_path / name
+
+        for relpath, content in files.items():
+            file_path = path / relpath
+            os.makedirs(file_path.parent, exist_ok=True)
+            file_path.write_text(content)
+
+        subprocess.run(('git', 'init', '-q'), cwd=path, check=True)
+        subprocess.run(('git', 'add', '.'), cwd=path, check=True)
+        subprocess.run(('git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', 'commit', '-q', '-m', name),
+                       cwd=path, check=True)
+
+        return types.SimpleNamespace(source=path)
+
+    def _key(self, target, state) -> str:
+        return native._cache_key(state, target.src_root, ('rdatawad',), main.RDATAWAD_SOURCES)
+
+    def test_shared_key(self):
+        prboom = {f'prboom2/{relpath}': content for relpath, content in TOOL_SOURCES.items()}
+        prboom['prboom2/CMakeLists.txt'] = 'project(prboom-plus)\n'
+        prboom['prboom2/data/CMakeLists.txt'] = 'set(WAD_DATA lumps/prboom.lmp)\n'
+        prboom['prboom2/data/lumps/prboom.lmp'] = 'prboom'
+
+        dsda = {f'prboom2/{relpath}': content for relpath, content in TOOL_SOURCES.items()}
+        dsda['prboom2/CMakeLists.txt'] = 'project(dsda-doom)\n'
+        dsda['prboom2/data/CMakeLists.txt'] = 'set(WAD_DATA lumps/dsda.lmp)\n'
+        dsda['prboom2/data/lumps/dsda.lmp'] = 'dsda'
+
+        prboom_key = self._key(main.PrBoomPlusTarget(), self._repository('prboom-plus', prboom))
+        dsda_key = self._key(main.DsdaDoom(), self._repository('dsda-doom', dsda))
+
+        self.assertTrue(prboom_key)
+        self.assertEqual(prboom_key, dsda_key)
+
+    def test_changed_tool(self):
+        first = {f'prboom2/{relpath}': content for relpath, content in TOOL_SOURCES.items()}
+        second = dict(first, **{'prboom2/data/rd_main.c': 'int main() { return 1; }\n'})
+
+        self.assertNotEqual(self._key(main.PrBoomPlusTarget(), self._repository('first', first)),
+                            self._key(main.DsdaDoom(), self._repository('second', second)))
+
+    def test_dirty_source(self):
+        files = {f'prboom2/{relpath}': content for relpath, content in TOOL_SOURCES.items()}
+        state = self._repository('dirty', files)
+        (state.source / 'prboom2' / 'data' / 'rd_main.c').write_text('')
+
+        self.assertIsNone(self._key(main.PrBoomPlusTarget(), state))
+
+
+if __name__ == '__main__':
+    unittest.main()
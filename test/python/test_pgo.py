@@ -0,0 +1,155 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import typing
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT_PATH = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_PATH))
+sys.path.append(str(ROOT_PATH / 'core'))
+
+from support import pgo  # noqa: E402
+
+# Compiler writes program that saves its arguments as raw profile when it was built with instrumentation
+STUB_COMPILER = '''
+import os
+import sys
+
+flags, output = sys.argv[1:-2], sys.argv[-1]
+
+with open(output, 'w') as f:
+    f.write(f"""#!{sys.executable}
+import json, os, sys
+if {'-fprofile-instr-generate' in flags}:
+    with open(os.environ['LLVM_PROFILE_FILE'].replace('%p', str(os.getpid())).replace('%m', '0'), 'w') as f:
+        json.dump(sys.argv[1:], f)
+""")
+
+os.chmod(output, 0o755)
+'''
+
+# Profile data tool concatenates raw profiles into JSON list
+STUB_PROFDATA = '''
+import json
+import sys
+
+output = sys.argv[2][len('-output='):]
+profiles = [json.load(open(path)) for path in sys.argv[3:]]
+json.dump(profiles, open(output, 'w'))
+'''
+
+
+class StubState:
+    def __init__(self, build_path: Path, source: Path):
+        self.environment = {'CFLAGS': '-O2'}
+        self.options = {}
+        self.xcode = False
+        self.build_path = build_path
+        self.source = source
+
+    @staticmethod
+    def architecture() -> str:
+        return 'x86_64'
+
+
+class StubTarget:
+    name = 'stub'
+
+    def __init__(self, compiler_path: Path):
+        self.compiler_path = compiler_path
+        self.builds: typing.List[typing.List[str]] = []
+
+    def configure(self, state: StubState):
+        os.makedirs(state.build_path, exist_ok=True)
+
+    def build(self, state: StubState):
+        flags = state.environment['CFLAGS'].split()
+        self.builds.append(flags)
+
+        args = [sys.executable, str(self.compiler_path), *flags, '-o', str(state.build_path / 'program')]
+        subprocess.run(args, check=True)
+
+
+class TestProfileGuidedOptimization(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_path = Path(temp_dir.name)
+
+        self.compiler_path = self.temp_path / 'compiler.py'
+        self.compiler_path.write_text(STUB_COMPILER)
+        profdata_path = self.temp_path / 'profdata.py'
+        profdata_path.write_text(STUB_PROFDATA)
+
+        patcher = mock.patch.object(pgo, '_profdata_tool', lambda: [sys.executable, str(profdata_path)])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.source_path = self.temp_path / 'source {x}'
+        os.makedirs(self.source_path)
+
+    def _run(self, training_command: str) -> StubTarget:
+        target = StubTarget(self.compiler_path)
+        pgo.ProfileGuidedOptimization(training_command, self.temp_path / 'cache').install(target)
+
+        state = StubState(self.temp_path / 'build', self.source_path)
+        target.configure(state)
+        target.build(state)
+
+        return target
+
+    def test_unversioned_source(self):
+        with mock.patch.object(pgo.source, 'commit', return_value=None):
+            target = self._run('{build_path}/program "{source}/demo" ~/quake')
+
+        profile_path = self.temp_path / 'build' / 'pgo.profdata'
+        self.assertEqual(target.builds, [['-O2', pgo.GENERATE_FLAG], ['-O2', f'{pgo.USE_FLAG}={profile_path}']])
+
+        # Braces and spaces of source path are kept, and home directory is expanded
+        arguments = [f'{self.source_path}/demo', os.path.expanduser('~/quake')]
+        self.assertEqual(json.loads(profile_path.read_text()), [arguments])
+
+    def test_cached_profile(self):
+        with mock.patch.object(pgo.source, 'commit', return_value='1234abcd'):
+            first = self._run('{build_path}/program first')
+            second = self._run('{build_path}/program first')
+            third = self._run('{build_path}/program third')
+
+        profiles = sorted((self.temp_path / 'cache' / 'stub').glob('*.profdata'))
+        self.assertEqual(len(profiles), 2)
+
+        for profile_path in profiles:
+            self.assertTrue(profile_path.name.startswith('1234abcd-x86_64-'))
+
+        self.assertEqual(len(first.builds), 2)
+        self.assertEqual(len(third.builds), 2)
+
+        # Profile collected with the same training command is reused without instrumented build
+        self.assertEqual(len(second.builds), 1)
+        self.assertEqual(second.builds[0][-1], first.builds[1][-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_PATH))
+
+from support import pkgconfig  # noqa: E402
+
+PACKAGES = {
+    'sdl2': '''prefix=/usr/local
+libdir=${prefix}/lib
+includedir=${prefix}/include
+
+Name: SDL2
+Version: 2.30.1
+Cflags: -I${includedir}/SDL2 -D_THREAD_SAFE
+Libs: -L${libdir} -lSDL2
+Libs.private: -lm -Wl,-framework,CoreVideo
+''',
+    'ogg': '''prefix=/usr/local
+libdir=${prefix}/lib
+includedir=${prefix}/include
+
+Name: ogg
+Version: 1.3.5
+Cflags: -I${includedir}
+Libs: -L${libdir} -logg
+''',
+    'vorbis': '''prefix=/usr/local
+libdir=${prefix}/lib
+includedir=${prefix}/include
+
+Name: vorbis
+Version: 1.3.7
+Requires.private: ogg
+Cflags: -I${includedir}
+Libs: -L${libdir} -lvorbis
+''',
+    'SDL2_mixer': '''prefix=/usr/local
+libdir=${prefix}/lib
+includedir=${prefix}/include
+
+Name: SDL2_mixer
+Version: 2.8.0
+Requires: sdl2 >= 2.0.9
+Requires.private: vorbis
+Cflags: -I${includedir}/SDL2
+Libs: -L${libdir} -lSDL2_mixer
+''',
+}
+
+
+class TestPkgConfig(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.deps_path = Path(temp_dir.name)
+
+        # Every package is installed to its own dependency directory like in deps
+        for name, content in PACKAGES.items():
+            pc_path = self.deps_path / name.lower() / 'lib' / 'pkgconfig'
+            os.makedirs(pc_path)
+            (pc_path / f'{name}.pc').write_text(content)
+
+        self.pkg_config = pkgconfig.PkgConfig(sorted(self.deps_path.glob('*/lib/pkgconfig')), define_prefix=True)
+
+    def _path(self, name: str) -> str:
+        return str(self.deps_path / name)
+
+    def test_libs(self):
+        self.assertEqual(self.pkg_config.run('--libs', 'SDL2_mixer').split(),
+                         [f"-L{self._path('sdl2_mixer')}/lib", '-lSDL2_mixer', f"-L{self._path('sdl2')}/lib", '-lSDL2'])
+
+    def test_static_libs(self):
+        libs = self.pkg_config.run('--libs', '--static', 'SDL2_mixer').split()
+
+        # Private dependencies and their libraries follow libraries that use them
+        for library in ('-lSDL2_mixer', '-lSDL2', '-lvorbis', '-logg', '-lm', '-Wl,-framework,CoreVideo'):
+            self.assertIn(library, libs)
+
+        self.assertLess(libs.index('-lSDL2_mixer'), libs.index('-lSDL2'))
+        self.assertLess(libs.index('-lvorbis'), libs.index('-logg'))
+
+    def test_cflags(self):
+        cflags = self.pkg_config.run('--cflags', 'SDL2_mixer').split()
+
+        self.assertIn(f"-I{self._path('sdl2_mixer')}/include/SDL2", cflags)
+        self.assertIn(f"-I{self._path('sdl2')}/include/SDL2", cflags)
+        self.assertIn('-D_THREAD_SAFE', cflags)
+
+    def test_prefix_variable(self):
+        pkg_config = pkgconfig.PkgConfig(sorted(self.deps_path.glob('*/lib/pkgconfig')),
+                                         variables={'prefix': '/prefix'})
+        self.assertEqual(pkg_config.run('--libs', 'ogg'), '-L/prefix/lib -logg \n')
+
+    def test_case_insensitive_lookup(self):
+        self.assertEqual(self.pkg_config.run('--modversion', 'SDL2'), '2.30.1\n')
+
+    def test_version_requirement(self):
+        self.assertEqual(self.pkg_config.run('--modversion', 'ogg >= 1.3'), '1.3.5\n')
+
+        with self.assertRaises(pkgconfig.PkgConfigError):
+            self.pkg_config.run('--modversion', 'ogg >= 1.4')
+
+    def test_missing_package(self):
+        with self.assertRaises(pkgconfig.PkgConfigError):
+            self.pkg_config.run('--libs', 'missing')
+
+    def test_compare_versions(self):
+        self.assertEqual(pkgconfig.compare_versions('1.3.5', '1.3.5'), 0)
+        self.assertEqual(pkgconfig.compare_versions('1.10', '1.9'), 1)
+        self.assertEqual(pkgconfig.compare_versions('2.0~rc1', '2.0'), -1)
+        self.assertEqual(pkgconfig.compare_versions('1.0a', '1.0'), 1)
+
+
+class ExecutableTest(unittest.TestCase):
+    # Resolver output must be identical to output of pkg-config executable for checked-in dependencies
+    EXECUTABLE = shutil.which('pkgconf') or shutil.which('pkg-config')
+
+    @unittest.skipUnless(EXECUTABLE, 'pkg-config executable is not available')
+    def test_dependencies(self):
+        self.assertEqual(pkgconfig.compare(self.EXECUTABLE), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_PATH))
+sys.path.append(str(ROOT_PATH / 'core'))
+
+from support import prefix  # noqa: E402
+
+
+class TestPrefix(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.deps_path = Path(temp_dir.name) / 'deps'
+        self.prefix_path = Path(temp_dir.name) / 'prefix'
+
+        self._write('a/include/a.h')
+        self._write('a/lib/libshared.a')
+        self._write('b/include/b/b.h')
+        self._write('b/lib/libshared.a')
+
+    def _write(self, relpath: str):
+        path = self.deps_path / relpath
+        os.makedirs(path.parent, exist_ok=True)
+        path.write_text(relpath)
+
+    def _update(self) -> prefix.Delta:
+        return prefix.update(self.deps_path, self.prefix_path)
+
+    def _target(self, relpath: str) -> str:
+        return (self.prefix_path / relpath).read_text()
+
+    def test_initial(self):
+        delta = self._update()
+
+        self.assertEqual(sorted(delta.added), ['include/a.h', 'include/b/b.h', 'lib/libshared.a'])
+        self.assertEqual((delta.removed, delta.changed), ([], []))
+
+        # The first dependency in alphabetical order provides file
+        self.assertEqual(self._target('lib/libshared.a'), 'a/lib/libshared.a')
+        self.assertTrue((self.prefix_path / 'include/a.h').is_symlink())
+
+        self.assertFalse(self._update())
+
+    def test_added_file(self):
+        self._update()
+        self._write('b/include/b/c.h')
+        delta = self._update()
+
+        self.assertEqual((delta.added, delta.removed, delta.changed), (['include/b/c.h'], [], []))
+        self.assertEqual(self._target('include/b/c.h'), 'b/include/b/c.h')
+
+    def test_removed_file(self):
+        self._update()
+        os.unlink(self.deps_path / 'b/include/b/b.h')
+        delta = self._update()
+
+        self.assertEqual((delta.added, delta.removed, delta.changed), ([], ['include/b/b.h'], []))
+        self.assertFalse(os.path.lexists(self.prefix_path / 'include/b'))
+
+    def test_changed_provider(self):
+        self._update()
+        os.unlink(self.deps_path / 'a/lib/libshared.a')
+        delta = self._update()
+
+        self.assertEqual((delta.added, delta.removed, delta.changed), ([], [], ['lib/libshared.a']))
+        self.assertEqual(self._target('lib/libshared.a'), 'b/lib/libshared.a')
+
+    def test_removed_dependency(self):
+        self._update()
+        os.unlink(self.deps_path / 'b/include/b/b.h')
+        os.unlink(self.deps_path / 'b/lib/libshared.a')
+        delta = self._update()
+
+        self.assertEqual((delta.added, delta.removed, delta.changed), ([], ['include/b/b.h'], []))
+        self.assertEqual(sorted(path.name for path in self.prefix_path.rglob('*') if path.is_symlink()),
+                         ['a.h', 'libshared.a'])
+
+    def test_install_without_core_step(self):
+        class Builder:
+            targets = []
+
+        with self.assertRaises(RuntimeError):
+            prefix.install(Builder(), self.deps_path, self.prefix_path)
+
+    def test_install(self):
+        class Builder:
+            targets = []
+
+            def _create_prefix_directory(self):
+                raise AssertionError('Core step was not replaced')
+
+        builder = Builder()
+        prefix.install(builder, self.deps_path, self.prefix_path)
+        getattr(builder, prefix.CORE_STEP)()
+
+        self.assertEqual(self._target('include/a.h'), 'a/include/a.h')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_PATH))
+sys.path.append(str(ROOT_PATH / 'core'))
+
+from support import rewrite  # noqa: E402
+from target import library  # noqa: E402
+
+GLIB_PC = 'prefix=/usr/local\nlibdir=${prefix}/lib\nincludedir=${prefix}/include\n\nName: GLib\n'
+SDL2_TTF_PC = 'prefix=/usr/local\n\nName: SDL2_ttf\nRequires: sdl2 >= 2.0.8\nLibs: -L${libdir} -lSDL2_ttf'
+
+
+class TestRewrite(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        (self.root / 'lib' / 'pkgconfig').mkdir(parents=True)
+
+    def _apply_twice(self, name: str, content: str, rules) -> str:
+        path = self.root / 'lib' / 'pkgconfig' / name
+        path.write_text(content)
+
+        self.assertEqual(rewrite.apply(self.root, rules), [path])
+        rewritten = path.read_text()
+
+        # Rules applied to already rewritten files change nothing
+        self.assertEqual(rewrite.apply(self.root, rules), [])
+        self.assertEqual(path.read_text(), rewritten)
+
+        return rewritten
+
+    def test_glib_exec_prefix(self):
+        content = self._apply_twice('glib-2.0.pc', GLIB_PC, library.GlibTarget.rewrite_rules)
+        self.assertEqual(content, GLIB_PC.replace('libdir=', 'exec_prefix=${prefix}\nlibdir='))
+
+    def test_sdl2_ttf_requires_without_final_newline(self):
+        text = SDL2_TTF_PC[:SDL2_TTF_PC.index('\nLibs:')]
+        content = self._apply_twice('SDL2_ttf.pc', text, library.Sdl2TtfTarget.rewrite_rules)
+        self.assertTrue(content.endswith('Requires: sdl2 >= 2.0.8\nRequires.private: freetype2'))
+
+    def test_sdl2_ttf_requires(self):
+        content = self._apply_twice('SDL2_ttf.pc', SDL2_TTF_PC, library.Sdl2TtfTarget.rewrite_rules)
+        self.assertIn('Requires: sdl2 >= 2.0.8\nRequires.private: freetype2\nLibs:', content)
+
+    def test_dry_run(self):
+        path = self.root / 'lib' / 'pkgconfig' / 'glib-2.0.pc'
+        path.write_text(GLIB_PC)
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(rewrite.apply(self.root, library.GlibTarget.rewrite_rules, dry_run=True), [path])
+
+        self.assertEqual(path.read_text(), GLIB_PC)
+        self.assertIn('+exec_prefix=${prefix}\n', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
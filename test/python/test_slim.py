@@ -0,0 +1,71 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import struct
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_PATH))
+sys.path.append(str(ROOT_PATH / 'core'))
+
+from support import archive, slim  # noqa: E402
+
+BITCODE = b'BC\xc0\xde' + b'\x01' * 28
+WRAPPED_BITCODE = b'\xde\xc0\x17\x0b' + b'\x02' * 28
+# Mach-O object without load commands defines no symbols
+EMPTY_OBJECT = struct.pack('<IIIIIIII', archive.MH_MAGIC_64, 0x0100000c, 0, 1, 0, 0, 0, 0)
+
+
+class TestSlim(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = Path(temp_dir.name) / 'libtest.a'
+
+    def _members(self):
+        return [(member.name, bytes(member.data)) for member in archive.members(memoryview(self.path.read_bytes()))]
+
+    def test_bitcode(self):
+        members = [('a.o', BITCODE), ('empty.o', EMPTY_OBJECT), ('b.o', WRAPPED_BITCODE)]
+        self.path.write_bytes(archive.write_archive(members, [('_a', 0), ('_b', 2)]))
+
+        result = slim.slim(self.path)
+
+        self.assertEqual(result.removed_members, ['empty.o'])
+        self.assertEqual(self._members()[1:], [('a.o', BITCODE), ('b.o', WRAPPED_BITCODE)])
+
+        offsets = archive.table_of_contents(list(archive.members(memoryview(self.path.read_bytes())))[0])
+        self.assertEqual(sorted(offsets), ['_a', '_b'])
+
+    def test_bitcode_without_table_of_contents(self):
+        data = bytearray(archive.AR_MAGIC)
+        archive._write_member(data, 'a.o', BITCODE)
+        archive._write_member(data, 'empty.o', EMPTY_OBJECT)
+        self.path.write_bytes(data)
+
+        result = slim.slim(self.path)
+
+        self.assertEqual(result.removed_members, [])
+        self.assertEqual(self.path.read_bytes(), data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+#
+#    Helper module to build macOS version of various source ports
+#    Copyright (C) 2020-2025 Alexey Lysiuk
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_PATH))
+sys.path.append(str(ROOT_PATH / 'core'))
+
+from support import tests  # noqa: E402
+
+
+class TestDriverOutput(unittest.TestCase):
+    def test_results(self):
+        output = '==> ogg: passed\n==> zlib: FAILED\nexpected 1\ngot 2\n==> flac: passed\nversion 1.4.3\n'
+        results = tests._parse_driver_output(output, ['flac', 'ogg', 'zlib'])
+
+        self.assertEqual([(result.name, result.passed) for result in results],
+                         [('flac', True), ('ogg', True), ('zlib', False)])
+        self.assertEqual(results[0].output, 'version 1.4.3\n')
+        self.assertEqual(results[2].output, 'expected 1\ngot 2\n')
+
+    def test_missing_result(self):
+        # Driver crashed before reporting the last test, all its output is attached to the test
+        output = '==> ogg: passed\nSegmentation fault\n'
+        results = tests._parse_driver_output(output, ['ogg', 'zlib'])
+
+        self.assertTrue(results[0].passed)
+        self.assertFalse(results[1].passed)
+        self.assertEqual(results[1].output, output)
+
+    def test_unknown_test(self):
+        results = tests._parse_driver_output('==> foo: FAILED\nUnknown test\n', ['foo'])
+
+        self.assertEqual(results, [tests.TestResult('foo', False, output='Unknown test\n')])
+
+
+if __name__ == '__main__':
+    unittest.main()